@@ -0,0 +1,122 @@
+"""
+Times the phases of the FB, LB and MB experiments on a synthetic network,
+e.g. `python -m benchmarks.engines --preset national --engines fb`.
+
+Each engine runs in its own process so the peak memory of one does not
+include the others. With --baseline, the phase times are compared to an
+earlier --output file and the exit code is 1 if a phase got slower than the
+tolerance.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+from benchmarks.synthetic import (
+    add_parameter_arguments,
+    experiment_config,
+    generate,
+    parameters_from_args,
+)
+from experiment import FBExperiment, LBExperiment, MBExperiment
+from pytrainsim.simulation import Simulation
+
+EXPERIMENTS = {"fb": FBExperiment, "lb": LBExperiment, "mb": MBExperiment}
+
+
+def run_engine(simulation_type: str, config: Dict) -> Dict:
+    # loading the experiment records the load_data and load_network phases
+    experiment = EXPERIMENTS[simulation_type](config)
+    profiler = experiment.profiler
+
+    sim = Simulation(experiment.delay, experiment.network)
+    with profiler.phase("schedule_trains"):
+        trains = experiment.schedule_trains(sim)
+    with profiler.phase("link_trains"):
+        experiment.link_trains(trains, experiment.train_meta_data)
+    tasks = sum(len(train.tasklist) for train in trains.values())
+
+    with profiler.phase("run"):
+        sim.run()
+
+    with profiler.phase("process_results"):
+        experiment.process_results(trains, experiment.result_folder)
+    with profiler.phase("process_reservations"):
+        experiment.process_track_reservations(
+            experiment.network, experiment.result_folder
+        )
+
+    phases = profiler.stats()
+    for phase in ["schedule_trains", "run"]:
+        phases[phase]["tasks_per_second"] = tasks / phases[phase]["wall_seconds"]
+    return {
+        "trains": len(trains),
+        "tasks": tasks,
+        "tracks": len(experiment.network.tracks),
+        "phases": phases,
+    }
+
+
+def _run_in_folder(folder: str, simulation_type: str, config: Dict) -> Dict:
+    # experiments write their results relative to the working directory
+    os.chdir(folder)
+    return run_engine(simulation_type, config)
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    """Prints the phases slower than the baseline; returns True if there are none."""
+    ok = True
+    for engine, result in results.items():
+        for phase, stats in result["phases"].items():
+            before = baseline.get(engine, {}).get("phases", {}).get(phase)
+            if before is None:
+                continue
+            ratio = stats["wall_seconds"] / before["wall_seconds"]
+            if ratio > 1 + tolerance:
+                print(f"{engine} {phase}: {ratio:.2f}x slower than the baseline")
+                ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--engines", nargs="+", default=["fb", "lb", "mb"])
+    add_parameter_arguments(parser)
+    parser.add_argument("--output", type=str, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=str, help="Results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="Record allocations per phase"
+    )
+    args = parser.parse_args()
+
+    params = parameters_from_args(args)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate(os.path.join(folder, "input"), params)
+        for simulation_type in args.engines:
+            config = experiment_config(paths, simulation_type, params)
+            config["logging"]["trace_memory"] = args.trace_memory
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results[simulation_type] = executor.submit(
+                    _run_in_folder, folder, simulation_type, config
+                ).result()
+
+    print(json.dumps(results, indent=4))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Measures the memory used per track section and per task of the moving block
+model.
+
+Without arguments a synthetic line is used. With --config, the network,
+schedule and train behaviour of an MB experiment configuration are loaded,
+e.g. `python -m benchmarks.memory --config experiments/MB-whole.toml`.
+"""
+
+import argparse
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple, TypeVar
+
+import pandas as pd
+import toml
+
+from pytrainsim.MBSim.MBDriveTask import MBDriveTask
+from pytrainsim.MBSim.MBNetworkParser import MBTrackFactory
+from pytrainsim.MBSim.MBScheduleTransformer import MBScheduleTransformer
+from pytrainsim.MBSim.MBTrain import MBTrain
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.OCPSim.NetworkParser import network_from_xml
+from pytrainsim.infrastructure import OCP, Network
+from pytrainsim.schedule import OCPEntry, Schedule, ScheduleBuilder, TrackEntry
+
+R = TypeVar("R")
+
+
+def measure(fn: Callable[[], R]) -> Tuple[R, int]:
+    """Returns the result of fn and the bytes it allocated and kept alive."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def line_network(
+    n_tracks: int, track_length: int, section_length: float
+) -> Network[MBTrack]:
+    network = Network[MBTrack]()
+    ocps = [OCP(f"OCP{i}") for i in range(n_tracks + 1)]
+    network.add_ocps(ocps)
+    network.add_tracks(
+        [
+            MBTrack(track_length, ocps[i], ocps[i + 1], 1, section_length, 40)
+            for i in range(n_tracks)
+        ]
+    )
+    return network
+
+
+def line_schedules(n_trains: int, n_tracks: int) -> List[Tuple[str, Schedule]]:
+    schedules = []
+    start = datetime(2024, 1, 1)
+    for t in range(n_trains):
+        name = f"Train{t}"
+        time = start + timedelta(minutes=5 * t)
+        builder = ScheduleBuilder().add_ocp(
+            OCPEntry("OCP0", time, timedelta(0), f"{name}_s0")
+        )
+        for i in range(n_tracks):
+            time += timedelta(minutes=2)
+            builder.add_track(
+                TrackEntry(
+                    f"OCP{i}", f"OCP{i + 1}", time, f"{name}_d{i}", timedelta(minutes=2)
+                )
+            ).add_ocp(OCPEntry(f"OCP{i + 1}", time, timedelta(0), f"{name}_s{i + 1}"))
+        schedules.append((name, builder.build()))
+    return schedules
+
+
+def config_network(config: dict) -> Network[MBTrack]:
+    with open(config["paths"]["network"], "r") as f:
+        factory = MBTrackFactory(config["mb"]["section_length"])
+        return network_from_xml(f.read(), factory)
+
+
+def config_schedules(config: dict) -> List[Tuple[str, Schedule]]:
+    df = pd.read_csv(
+        config["paths"]["train_schedule"],
+        parse_dates=["scheduled_arrival", "scheduled_departure"],
+    )
+    schedules = []
+    for trainpart_id, relevant_data in df.groupby("trainpart_id"):
+        schedules.append(
+            (str(trainpart_id), ScheduleBuilder().from_df(relevant_data).build())
+        )
+    return schedules
+
+
+def build_trains(
+    schedules: List[Tuple[str, Schedule]], network: Network[MBTrack], lazy: bool
+) -> List[MBTrain]:
+    trains = []
+    for name, schedule in schedules:
+        train = MBTrain(name, "category", 1.0, -1.0, 1.0)
+        try:
+            MBScheduleTransformer.assign_to_train(schedule, train, network, lazy)
+        except ValueError:
+            continue
+        trains.append(train)
+    return trains
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", type=str, help="MB experiment configuration")
+    parser.add_argument("--tracks", type=int, default=200)
+    parser.add_argument("--track-length", type=int, default=5000)
+    parser.add_argument("--section-length", type=float, default=256)
+    parser.add_argument("--trains", type=int, default=100)
+    parser.add_argument(
+        "--lazy", action="store_true", help="Create tasks while trains advance"
+    )
+    args = parser.parse_args()
+
+    if args.config:
+        config = toml.load(args.config)
+        network, network_bytes = measure(lambda: config_network(config))
+        schedules = config_schedules(config)
+    else:
+        network, network_bytes = measure(
+            lambda: line_network(args.tracks, args.track_length, args.section_length)
+        )
+        schedules = line_schedules(args.trains, args.tracks)
+
+    trains, task_bytes = measure(lambda: build_trains(schedules, network, args.lazy))
+
+    sections = sum(len(track.track_sections) for track in network.tracks.values())
+    # counted after measuring, as iterating a lazy tasklist creates its tasks
+    tasks = sum(len(train.tasklist) for train in trains)
+    drive_tasks = sum(
+        isinstance(task, MBDriveTask) for train in trains for task in train.tasklist
+    )
+
+    print(
+        json.dumps(
+            {
+                "tracks": len(network.tracks),
+                "sections": sections,
+                "network_bytes": network_bytes,
+                "bytes_per_section": network_bytes / max(sections, 1),
+                "trains": len(trains),
+                "tasks": tasks,
+                "drive_tasks": drive_tasks,
+                "task_bytes": task_bytes,
+                "bytes_per_task": task_bytes / max(tasks, 1),
+            },
+            indent=4,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Measures the setup phase (schedule building, path search and task assignment)
+serially and with pytrainsim.parallelSchedule for an increasing number of
+workers, e.g. `python -m benchmarks.setup_phase --trains 5000 --workers 1 2 4 8 16`.
+
+Only schedule building and path search run in the workers; the tasks are
+assigned in the main process. The time of this serial part is reported as
+`assign_seconds`, and `max_speedup` is the speedup if the workers took no
+time at all.
+
+The synthetic network is a grid and the trains only stop at every few OCPs, so
+each leg of a schedule needs a path search as in timetables that skip OCPs.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+import pandas as pd
+
+from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.parallelSchedule import build_schedules
+from pytrainsim.resources.train import Train
+from pytrainsim.schedule import ScheduleBuilder
+
+
+def grid_network(size: int, seed: int = 0) -> Network[Track]:
+    rng = random.Random(seed)
+    network = Network[Track]()
+    ocps = {(x, y): OCP(f"G{x}_{y}") for x in range(size) for y in range(size)}
+    network.add_ocps(list(ocps.values()))
+
+    tracks = []
+    for (x, y), ocp in ocps.items():
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            neighbour = ocps.get((x + dx, y + dy))
+            if neighbour is not None:
+                tracks.append(Track(rng.randint(900, 1100), ocp, neighbour, 1))
+    network.add_tracks(tracks)
+    return network
+
+
+def grid_timetable(
+    size: int, n_trains: int, stop_every: int, seed: int = 0
+) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    start = datetime(2024, 1, 1)
+    for t in range(n_trains):
+        trainpart_id = f"T{t}"
+        current = start + timedelta(seconds=rng.randint(0, 24 * 3600))
+        y = rng.randrange(size)
+        previous_time = None
+        for i, x in enumerate(range(0, size, stop_every)):
+            y = min(size - 1, max(0, y + rng.randint(-2, 2)))
+            rows.append(
+                [
+                    trainpart_id,
+                    f"{trainpart_id}_a{i}",
+                    f"{trainpart_id}_s{i}",
+                    f"G{x}_{y}",
+                    current,
+                    current + timedelta(minutes=1),
+                    60.0,
+                    None if previous_time is None else 300.0,
+                ]
+            )
+            previous_time = current
+            current += timedelta(minutes=6)
+
+    df = pd.DataFrame(
+        rows,
+        columns=[
+            "trainpart_id",
+            "arrival_id",
+            "stop_id",
+            "db640_code",
+            "scheduled_arrival",
+            "scheduled_departure",
+            "stop_duration",
+            "run_duration",
+        ],
+    )
+    return df
+
+
+def setup_serial(df: pd.DataFrame, network: Network[Track]) -> List[Train]:
+    trains = []
+    for trainpart_id, relevant_data in df.groupby("trainpart_id"):
+        train = Train(str(trainpart_id), "category")
+        schedule = ScheduleBuilder().from_df(relevant_data).build()
+        ScheduleTransformer.assign_to_train(schedule, train, network)
+        trains.append(train)
+    return trains
+
+
+def setup_parallel(
+    df: pd.DataFrame, network: Network[Track], workers: int
+) -> Tuple[List[Train], float]:
+    """Returns the trains and the seconds spent assigning their tasks."""
+    trains = []
+    assign_seconds = 0.0
+    trainpart_ids = [
+        str(trainpart_id) for trainpart_id in sorted(df["trainpart_id"].unique())
+    ]
+    for trainpart_id, schedule, paths, error in build_schedules(
+        df, trainpart_ids, network, workers, direct_tracks_first=True
+    ):
+        if schedule is None:
+            raise ValueError(error)
+        start = time.perf_counter()
+        train = Train(trainpart_id, "category")
+        ScheduleTransformer.assign_to_train(schedule, train, network, paths=paths)
+        assign_seconds += time.perf_counter() - start
+        trains.append(train)
+    return trains, assign_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", type=int, default=40, help="OCPs per grid side")
+    parser.add_argument("--trains", type=int, default=2000)
+    parser.add_argument("--stop-every", type=int, default=5)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[w for w in [1, 2, 4, 8, 16] if w <= (os.cpu_count() or 1)],
+    )
+    args = parser.parse_args()
+
+    network = grid_network(args.size)
+    df = grid_timetable(args.size, args.trains, args.stop_every)
+
+    start = time.perf_counter()
+    serial_trains = setup_serial(df, network)
+    serial = time.perf_counter() - start
+    tasks = sum(len(train.tasklist) for train in serial_trains)
+
+    results = {}
+    for workers in args.workers:
+        start = time.perf_counter()
+        trains, assign_seconds = setup_parallel(df, network, workers)
+        duration = time.perf_counter() - start
+        assert sum(len(train.tasklist) for train in trains) == tasks
+        results[workers] = {
+            "seconds": duration,
+            "speedup": serial / duration,
+            "assign_seconds": assign_seconds,
+            "max_speedup": serial / assign_seconds,
+        }
+
+    print(
+        json.dumps(
+            {
+                "cpus": os.cpu_count(),
+                "trains": len(serial_trains),
+                "tasks": tasks,
+                "serial_seconds": serial,
+                "workers": results,
+            },
+            indent=4,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+Deterministic synthetic networks and timetables in the input formats of the
+experiments (see docs/data-format.md), e.g.
+`python -m benchmarks.synthetic data/synthetic --preset national`.
+
+The OCPs are placed on a jittered grid. A path through all OCPs keeps the
+network connected and further tracks between neighbouring OCPs are added
+until the requested track density is reached. Trains run on random walks
+through the network and stop at some of the OCPs on their way.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from pytrainsim.OCPSim.NetworkParser import TrackFactory, network_from_xml
+from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
+from pytrainsim.resources.train import Train
+from pytrainsim.schedule import ScheduleBuilder
+
+RAILML_NAMESPACE = "https://www.railml.org/schemas/2021"
+
+TRAIN_BEHAVIOUR = {
+    "RJ": {"acc": 0.5, "dec": -0.5, "rel_max_speed": 1.0},
+    "REX": {"acc": 0.6, "dec": -0.6, "rel_max_speed": 0.8},
+    "S": {"acc": 0.8, "dec": -0.8, "rel_max_speed": 0.6},
+    "G": {"acc": 0.2, "dec": -0.3, "rel_max_speed": 0.6},
+}
+
+
+@dataclass
+class SyntheticParameters:
+    n_ocps: int = 100
+    # tracks per OCP, at most about 2 on the grid
+    track_density: float = 1.4
+    trains_per_hour: int = 30
+    hours: int = 4
+    # OCPs passed by a train
+    route_length: int = 15
+    stop_probability: float = 0.4
+    # OCP distance in km
+    spacing: float = 4.0
+    section_length: float = 500
+    # probability that a train continues as a second trainpart
+    turnaround_probability: float = 0.3
+    seed: int = 0
+
+
+# about the size of a national network with a full day of trains, and
+# multiples of it for load testing
+PRESETS = {
+    "small": SyntheticParameters(),
+    "national": SyntheticParameters(n_ocps=2000, trains_per_hour=300, hours=24),
+    "10x": SyntheticParameters(n_ocps=20000, trains_per_hour=3000, hours=24),
+    "100x": SyntheticParameters(n_ocps=200000, trains_per_hour=30000, hours=24),
+}
+
+TIMETABLE_COLUMNS = [
+    "trainpart_id",
+    "arrival_id",
+    "stop_id",
+    "db640_code",
+    "scheduled_arrival",
+    "scheduled_departure",
+    "stop_duration",
+    "run_duration",
+]
+
+
+@dataclass
+class SyntheticNetwork:
+    # OCP name -> (x, y) in km
+    positions: Dict[str, Tuple[float, float]]
+    # (OCP name, OCP name) -> (length in km, vMax in km/h, double track)
+    tracks: Dict[Tuple[str, str], Tuple[float, int, bool]]
+
+    def neighbours(self) -> Dict[str, List[str]]:
+        result: Dict[str, List[str]] = {name: [] for name in self.positions}
+        for a, b in self.tracks:
+            result[a].append(b)
+            result[b].append(a)
+        return result
+
+    def track(self, a: str, b: str) -> Tuple[float, int, bool]:
+        return self.tracks[(a, b)] if (a, b) in self.tracks else self.tracks[(b, a)]
+
+
+def ocp_name(idx: int) -> str:
+    return f"S{idx:06d}"
+
+
+def generate_network(params: SyntheticParameters) -> SyntheticNetwork:
+    rng = random.Random(params.seed)
+    cols = math.ceil(math.sqrt(params.n_ocps))
+
+    positions = {}
+    for idx in range(params.n_ocps):
+        row, col = divmod(idx, cols)
+        positions[ocp_name(idx)] = (
+            (col + rng.uniform(-0.2, 0.2)) * params.spacing,
+            (row + rng.uniform(-0.2, 0.2)) * params.spacing,
+        )
+
+    # snake through the grid rows so consecutive OCPs are neighbours
+    order = []
+    for row in range(math.ceil(params.n_ocps / cols)):
+        cells = [row * cols + col for col in range(cols)]
+        if row % 2:
+            cells.reverse()
+        order.extend(idx for idx in cells if idx < params.n_ocps)
+    edges = list(zip(order, order[1:]))
+
+    candidates = []
+    for idx in range(params.n_ocps):
+        row, col = divmod(idx, cols)
+        for neighbour in [idx + 1 if col + 1 < cols else -1, idx + cols]:
+            if 0 <= neighbour < params.n_ocps:
+                candidates.append((idx, neighbour))
+    existing = set(edges) | {(b, a) for a, b in edges}
+    candidates = [edge for edge in candidates if edge not in existing]
+    rng.shuffle(candidates)
+    n_extra = max(0, round(params.track_density * params.n_ocps) - len(edges))
+    edges.extend(candidates[:n_extra])
+
+    tracks = {}
+    for a, b in edges:
+        name_a, name_b = ocp_name(a), ocp_name(b)
+        (xa, ya), (xb, yb) = positions[name_a], positions[name_b]
+        length = max(math.hypot(xa - xb, ya - yb), 0.5)
+        v_max = rng.choice([80, 100, 120, 160])
+        tracks[(name_a, name_b)] = (round(length, 3), v_max, rng.random() < 0.3)
+
+    return SyntheticNetwork(positions, tracks)
+
+
+def write_railml(network: SyntheticNetwork, path: str):
+    """Writes the network as RailML; tracks are written as they are generated."""
+    with open(path, "w") as f:
+        f.write(
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<railml xmlns="{RAILML_NAMESPACE}" version="2.5">\n'
+            "  <infrastructure>\n    <operationControlPoints>\n"
+        )
+        for name, (x, y) in network.positions.items():
+            # km to degrees around 47N 13E, only used for plots and checks
+            lat = 47 + y / 111.0
+            lon = 13 + x / 75.0
+            f.write(
+                f'      <ocp id="ocp_{name}">'
+                f'<designator register="DB640" entry="{name}"/>'
+                f'<geoCoord coord="{lat:.6f} {lon:.6f}"/></ocp>\n'
+            )
+        f.write("    </operationControlPoints>\n    <tracks>\n")
+        track_idx = 0
+        for (a, b), (length, v_max, double) in network.tracks.items():
+            directions = ["up", "down"] if double else ["none"]
+            for direction in directions:
+                f.write(
+                    f'      <track id="track_{track_idx}" mainDir="{direction}">'
+                    "<trackTopology>"
+                    f'<trackBegin pos="0"><macroscopicNode ocpRef="ocp_{a}"/></trackBegin>'
+                    f'<trackEnd pos="{length}"><macroscopicNode ocpRef="ocp_{b}"/></trackEnd>'
+                    "</trackTopology>"
+                    "<trackElements><speedChanges>"
+                    f'<speedChange vMax="{v_max}"/>'
+                    "</speedChanges></trackElements></track>\n"
+                )
+                track_idx += 1
+        f.write("    </tracks>\n  </infrastructure>\n</railml>\n")
+
+
+def _route(
+    rng: random.Random, neighbours: Dict[str, List[str]], start: str, length: int
+) -> List[str]:
+    route = [start]
+    visited = {start}
+    while len(route) < length:
+        options = [n for n in neighbours[route[-1]] if n not in visited]
+        if not options:
+            break
+        route.append(rng.choice(options))
+        visited.add(route[-1])
+    return route
+
+
+def iter_timetable(
+    network: SyntheticNetwork, params: SyntheticParameters, chunk_trains: int = 10000
+) -> Iterator[Tuple[pd.DataFrame, Dict]]:
+    """
+    Yields the train schedule and the train meta data in chunks of about
+    `chunk_trains` trains, so large timetables are not held in memory.
+
+    With `turnaround_probability`, a train continues as a second trainpart
+    from its last OCP, which lists the first one in `previous_trainparts`.
+    """
+    rng = random.Random(params.seed + 1)
+    neighbours = network.neighbours()
+    names = list(network.positions)
+    start = datetime(2024, 1, 1, 6)
+
+    columns: Dict[str, List] = {column: [] for column in TIMETABLE_COLUMNS}
+    meta: Dict[str, Dict] = {}
+
+    def add_trainpart(
+        trainpart_id: str, category: str, route: List[str], time: datetime
+    ) -> datetime:
+        rel_max_speed = TRAIN_BEHAVIOUR[category]["rel_max_speed"]
+        for idx, ocp in enumerate(route):
+            if idx == 0:
+                run_duration = None
+                arrival = time
+            else:
+                length, v_max, _ = network.track(route[idx - 1], ocp)
+                run_duration = math.ceil(length * 3600 / (v_max * rel_max_speed))
+                arrival = time + timedelta(seconds=run_duration)
+
+            is_last = idx == len(route) - 1
+            stop = idx == 0 or is_last or rng.random() < params.stop_probability
+            stop_duration = 60.0 if stop else 0.0
+            time = arrival + timedelta(seconds=stop_duration)
+
+            columns["trainpart_id"].append(trainpart_id)
+            columns["arrival_id"].append(f"{trainpart_id}_a{idx}")
+            columns["stop_id"].append(f"{trainpart_id}_s{idx}")
+            columns["db640_code"].append(ocp)
+            columns["scheduled_arrival"].append(arrival)
+            columns["scheduled_departure"].append(time)
+            columns["stop_duration"].append(stop_duration)
+            columns["run_duration"].append(run_duration)
+        return time
+
+    n_trains = params.trains_per_hour * params.hours
+    for train_idx in range(n_trains):
+        category = rng.choice(list(TRAIN_BEHAVIOUR))
+        route = _route(rng, neighbours, rng.choice(names), params.route_length)
+        time = start + timedelta(seconds=rng.randrange(params.hours * 3600))
+
+        trainpart_id = f"{train_idx}_0"
+        meta[trainpart_id] = {"category": category, "previous_trainparts": []}
+        time = add_trainpart(trainpart_id, category, route, time)
+
+        if len(route) > 1 and rng.random() < params.turnaround_probability:
+            next_route = _route(rng, neighbours, route[-1], params.route_length)
+            if len(next_route) > 1:
+                next_id = f"{train_idx}_1"
+                meta[next_id] = {
+                    "category": category,
+                    "previous_trainparts": [trainpart_id],
+                }
+                add_trainpart(next_id, category, next_route, time + timedelta(minutes=10))
+
+        if (train_idx + 1) % chunk_trains == 0 or train_idx == n_trains - 1:
+            yield pd.DataFrame(columns), meta
+            columns = {column: [] for column in TIMETABLE_COLUMNS}
+            meta = {}
+
+
+def generate(folder: str, params: SyntheticParameters) -> Dict[str, str]:
+    """
+    Writes the network, train schedule, train meta data and train behaviour
+    to folder and returns their paths for the `[paths]` of a configuration.
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = {
+        "network": os.path.join(folder, "network.xml"),
+        "train_schedule": os.path.join(folder, "train_schedule.csv"),
+        "train_meta_data": os.path.join(folder, "train_meta_data.json"),
+        "train_behaviour": os.path.join(folder, "train_behaviour.json"),
+    }
+
+    network = generate_network(params)
+    write_railml(network, paths["network"])
+
+    meta = {}
+    header = True
+    for df, chunk_meta in iter_timetable(network, params):
+        df.to_csv(
+            paths["train_schedule"],
+            mode="w" if header else "a",
+            header=header,
+            index=False,
+        )
+        header = False
+        meta.update(chunk_meta)
+    with open(paths["train_meta_data"], "w") as f:
+        json.dump(meta, f)
+    with open(paths["train_behaviour"], "w") as f:
+        json.dump(TRAIN_BEHAVIOUR, f, indent=4)
+
+    return paths
+
+
+def validate(paths: Dict[str, str], n_trains: int = 100) -> None:
+    """
+    Loads the generated network with the RailML parser and checks that the
+    schedules of the first `n_trains` trains run on existing tracks.
+    """
+    with open(paths["network"], "r") as f:
+        network = network_from_xml(f.read(), TrackFactory())
+
+    df = pd.read_csv(
+        paths["train_schedule"],
+        parse_dates=["scheduled_arrival", "scheduled_departure"],
+        nrows=n_trains * 100,
+    )
+    for trainpart_id, rows in list(df.groupby("trainpart_id", sort=False))[:n_trains]:
+        schedule = ScheduleBuilder().from_df(rows).build()
+        ScheduleTransformer.assign_to_train(
+            schedule, Train(str(trainpart_id), "category"), network, True
+        )
+
+
+def experiment_config(
+    paths: Dict[str, str], simulation_type: str, params: SyntheticParameters
+) -> Dict:
+    return {
+        "general": {
+            "name": f"benchmark/{simulation_type}",
+            "simulation_type": simulation_type,
+        },
+        "paths": dict(paths),
+        "mb": {"section_length": params.section_length},
+        "delay": {"type": "normal", "mean": 0, "std": 0, "probability": 0},
+        "logging": {"console_log_level": "WARNING"},
+    }
+
+
+def add_parameter_arguments(parser: argparse.ArgumentParser):
+    """Adds a preset and options overriding its parameters."""
+    parser.add_argument("--preset", choices=list(PRESETS), default="small")
+    parser.add_argument("--ocps", type=int)
+    parser.add_argument("--track-density", type=float)
+    parser.add_argument("--trains-per-hour", type=int)
+    parser.add_argument("--hours", type=int)
+    parser.add_argument("--route-length", type=int)
+    parser.add_argument("--section-length", type=float)
+    parser.add_argument("--seed", type=int)
+
+
+def parameters_from_args(args: argparse.Namespace) -> SyntheticParameters:
+    overrides = {
+        "n_ocps": args.ocps,
+        "track_density": args.track_density,
+        "trains_per_hour": args.trains_per_hour,
+        "hours": args.hours,
+        "route_length": args.route_length,
+        "section_length": args.section_length,
+        "seed": args.seed,
+    }
+    return replace(
+        PRESETS[args.preset],
+        **{key: value for key, value in overrides.items() if value is not None},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("folder", type=str, help="Output folder")
+    add_parameter_arguments(parser)
+    parser.add_argument(
+        "--validate", action="store_true", help="Load the generated files"
+    )
+    args = parser.parse_args()
+
+    paths = generate(args.folder, parameters_from_args(args))
+    if args.validate:
+        validate(paths)
+    print(json.dumps(paths, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 import glob
-from multiprocessing import Pool, cpu_count
+import hashlib
+from multiprocessing import cpu_count
 import os
 import json
 import logging
 import subprocess
-from datetime import datetime
+from datetime import datetime, timedelta
 import traceback
-from typing import Dict, TypeVar, Union, cast
+from typing import Dict, Optional, TypeVar, Union, cast
 
 from pytrainsim.LBSim.LBScheduleTransformer import LBScheduleTransformer
 from pytrainsim.MBSim.MBNetworkParser import MBTrackFactory
@@ -18,7 +19,7 @@ from pytrainsim.MBSim.MBScheduleTransformer import MBScheduleTransformer
 from pytrainsim.MBSim.MBTrain import MBTrain
 from pytrainsim.MBSim.trackSection import MBTrack
 from pytrainsim.delay.delayFactory import DelayFactory
-from pytrainsim.infrastructure import InfrastructureElement, Network
+from pytrainsim.infrastructure import InfrastructureElement, Network, PathMap
 from pytrainsim.OCPSim.NetworkParser import TrackFactory, network_from_xml
 from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
 from pytrainsim.resources.train import Train
@@ -26,8 +27,26 @@ from pytrainsim.delay.primaryDelay import (
     PrimaryDelayInjector,
     SaveablePrimaryDelayInjector,
 )
+from pytrainsim.parallelSchedule import build_schedules
+from pytrainsim.profiling import PhaseProfiler, ResourceSampler
+from pytrainsim.resultCache import (
+    ResultCache,
+    cache_key,
+    cache_key_inputs,
+    unseeded_random_delay,
+)
 from pytrainsim.schedule import Schedule, ScheduleBuilder
+from pytrainsim.scheduleLoader import load_schedule
 from pytrainsim.simulation import Simulation
+from pytrainsim.sweep import SharedInputs, expand_grid, run_sweep
+from pytrainsim.trace import BinaryTraceWriter
+from pytrainsim.resultWriter import (
+    RESULT_COLUMNS,
+    TRACK_RESERVATION_COLUMNS,
+    ResultWriter,
+    create_result_writer,
+)
+from pytrainsim.windowedScheduler import WindowedScheduler
 from pytrainsim.logging import setup_logging
 import argparse
 
@@ -37,13 +56,25 @@ T = TypeVar("T", bound=Train)
 
 
 class BaseExperiment(ABC):
+    # whether assign_to_train uses a direct track before searching a path
+    direct_tracks_first = False
 
-    def __init__(self, config: Union[str, Dict]):
+    def __init__(
+        self, config: Union[str, Dict], inputs: Optional[SharedInputs] = None
+    ):
         self.config = self.load_configuration(config)
+        self.inputs = inputs if inputs is not None else SharedInputs()
         self.result_folder = self.create_result_folder()
         self.logger = self.setup_logging(self.result_folder)
         self.save_config(self.result_folder)
-        self.load_experiment_data()
+        self.setup_profiling()
+        try:
+            self.setup_result_cache()
+            if self.cached_result is None:
+                self.load_experiment_data()
+        except BaseException:
+            self.stop_profiling()
+            raise
 
     def load_configuration(self, config: Union[str, Dict]) -> Dict:
         if isinstance(config, str):
@@ -66,6 +97,15 @@ class BaseExperiment(ABC):
         except subprocess.CalledProcessError:
             return "Git commit information not available"
 
+    @staticmethod
+    def get_git_diff_digest() -> Optional[str]:
+        """Returns a digest of the uncommitted changes to tracked files."""
+        try:
+            diff = subprocess.check_output(["git", "diff", "HEAD"])
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        return hashlib.sha256(diff).hexdigest()
+
     def create_result_folder(self) -> str:
         experiment_name = self.config["general"]["name"]
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -96,7 +136,7 @@ class BaseExperiment(ABC):
             logging, log_config.get("console_log_level", "INFO").upper()
         )
         file_log_level = getattr(
-            logging, log_config.get("file_log_level", "DEBUG").upper()
+            logging, log_config.get("file_log_level", "INFO").upper()
         )
 
         setup_logging(log_file, console_log_level, file_log_level)
@@ -107,33 +147,137 @@ class BaseExperiment(ABC):
 
         return self.logger
 
+    def setup_profiling(self):
+        """
+        Records the time and memory of each phase of the experiment. With
+        `resource_sample_interval` in the `[logging]` section, the memory is
+        also written to resources.csv during the whole experiment.
+        """
+        log_config = self.config.get("logging", {})
+        self.profiler = PhaseProfiler(log_config.get("trace_memory", False))
+        self.sampler = None
+        interval = log_config.get("resource_sample_interval")
+        if interval is not None:
+            self.sampler = ResourceSampler(
+                os.path.join(self.result_folder, "resources.csv"),
+                interval,
+                self.profiler,
+            )
+            self.sampler.start()
+
+    def stop_profiling(self):
+        """Stops the resource sampler and memory tracing; safe to call twice."""
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+        self.profiler.close()
+
+    def setup_result_cache(self):
+        """
+        With `enabled = true` in the `[cache]` section, the results are stored
+        in `dir` (default data/cache) under a hash of the config, the input
+        files it references and the code version. An experiment whose hash
+        is already stored copies those results instead of simulating.
+        Experiments with unseeded random delays bypass the cache.
+        """
+        self.result_cache = None
+        self.cached_result = None
+        cache_config = self.config.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return
+        if unseeded_random_delay(self.config.get("delay", {})):
+            self.logger.warning(
+                "Result cache bypassed: the delays are random without a seed"
+            )
+            return
+
+        commit = self.get_git_commit_info()
+        diff = self.get_git_diff_digest()
+        if diff is None or commit == "Git commit information not available":
+            self.logger.warning(
+                "Result cache disabled: the code version is not available"
+            )
+            return
+
+        self.result_cache = ResultCache(cache_config.get("dir", "data/cache"))
+        self.cache_key_inputs = cache_key_inputs(self.config, f"{commit}+{diff}")
+        self.cache_key = cache_key(self.cache_key_inputs)
+        self.cached_result = self.result_cache.get(self.cache_key)
+
     def load_experiment_data(self):
         self.logger.info("Loading experiment data")
-        self.df = pd.read_csv(
-            self.config["paths"]["train_schedule"],
-            parse_dates=["scheduled_arrival", "scheduled_departure"],
-        )
-        with open(self.config["paths"]["train_meta_data"], "r") as file:
-            self.train_meta_data = json.load(file)
-        if "train_behaviour" in self.config["paths"]:
-            with open(self.config["paths"]["train_behaviour"], "r") as file:
-                self.train_behaviour_data = json.load(file)
+        paths = self.config["paths"]
+        with self.profiler.phase("load_data"):
+            input_config = json.dumps(self.config.get("input", {}), sort_keys=True)
+            self.df = self.inputs.get(
+                ("train_schedule", paths["train_schedule"], input_config),
+                lambda: self.load_schedule(paths["train_schedule"]),
+            )
+            self.train_meta_data = self.inputs.get(
+                ("train_meta_data", paths["train_meta_data"]),
+                lambda: self.load_json(paths["train_meta_data"]),
+            )
+            if "train_behaviour" in paths:
+                self.train_behaviour_data = self.inputs.get(
+                    ("train_behaviour", paths["train_behaviour"]),
+                    lambda: self.load_json(paths["train_behaviour"]),
+                )
+            self.delay = self.initialize_delay()
 
         trd = self.config.get("logging", {}).get("record_reservations", True)
         InfrastructureElement.record_reservations_default = trd
-        self.network = self.load_network()
-        self.delay = self.initialize_delay()
+        with self.profiler.phase("load_network"):
+            # experiments loading their network the same way can share it
+            network_key = (type(self).load_network, paths["network"], trd)
+            self.network = self.inputs.get(network_key, self.load_network)
+            self.prepare_network(self.network)
+
+    @staticmethod
+    def load_json(path: str) -> Dict:
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def prepare_network(self, network: Network):
+        """Resets the state a previous experiment left in a shared network."""
+        network.reset()
+
+    def load_schedule(self, path: str) -> pd.DataFrame:
+        """
+        Loads the train schedule. With `typed = true` in the `[input]`
+        section, it is read with declared dtypes and, with `cache = true`,
+        from a Parquet copy of the CSV.
+        """
+        input_config = self.config.get("input", {})
+        if not input_config.get("typed", False):
+            return pd.read_csv(
+                path, parse_dates=["scheduled_arrival", "scheduled_departure"]
+            )
+        return load_schedule(
+            path,
+            cache=input_config.get("cache", False),
+            timestamp_format=input_config.get("timestamp_format", "%Y-%m-%d %H:%M:%S"),
+            chunk_size=input_config.get("chunk_size", 500_000),
+        )
 
     def initialize_delay(self) -> PrimaryDelayInjector:
         delay_configuration = self.config.get("delay", {})
         delay_configuration["simulation_type"] = self.config["general"][
             "simulation_type"
         ]
+        if delay_configuration.get("log", False):
+            if delay_configuration.get("log_format", "csv") == "parquet":
+                delay_configuration["log_file"] = os.path.join(
+                    self.result_folder, "delay.parquet"
+                )
         return DelayFactory.create_delay(delay_configuration)
 
     def schedule_trains(self, sim: Simulation) -> Dict[str, Train]:
+        workers = self.config.get("scheduling", {}).get("workers", 1)
+        if workers > 1:
+            return self.schedule_trains_parallel(sim, workers)
+
         trains = {}
-        grouped_df = self.df.groupby("trainpart_id")
+        grouped_df = self.df.groupby("trainpart_id", observed=True)
 
         for trainpart_id, relevant_data in grouped_df:
             trainpart_id = str(trainpart_id)
@@ -153,6 +297,87 @@ class BaseExperiment(ABC):
 
         return trains
 
+    def schedule_trains_parallel(
+        self, sim: Simulation, workers: int
+    ) -> Dict[str, Train]:
+        """
+        Builds the schedules and searches their paths in `workers` processes;
+        the tasks are created here against this experiment's network.
+        """
+        trains = {}
+        trainpart_ids = [
+            str(trainpart_id)
+            for trainpart_id in sorted(self.df["trainpart_id"].unique())
+            if str(trainpart_id) in self.train_meta_data
+        ]
+
+        for trainpart_id, schedule, paths, error in build_schedules(
+            self.df, trainpart_ids, self.network, workers, self.direct_tracks_first
+        ):
+            category = self.train_meta_data[trainpart_id]["category"]
+            train = self.create_train(trainpart_id, category)
+
+            try:
+                if schedule is None:
+                    raise ValueError(error)
+                self.assign_to_train(schedule, train, paths)
+                sim.schedule_train(train)
+                trains[trainpart_id] = train
+            except Exception as e:
+                self.logger.error(f"Error while scheduling train {trainpart_id}: {e}")
+
+        return trains
+
+    def create_windowed_scheduler(
+        self, sim: Simulation, window: timedelta
+    ) -> WindowedScheduler:
+        """
+        Creates a scheduler that admits trains `window` before their start and
+        streams the results of finished trains to the results file.
+        """
+        trainpart_ids = self.df["trainpart_id"].astype(str)
+        rows = trainpart_ids.groupby(trainpart_ids).indices
+        # earliest time any task of the train may start, including the stop
+        # duration at the first OCP
+        earliest = pd.concat(
+            [
+                self.df["scheduled_arrival"],
+                self.df["scheduled_departure"],
+                self.df["scheduled_departure"]
+                - pd.to_timedelta(self.df["stop_duration"], unit="s"),
+            ],
+            axis=1,
+        ).min(axis=1)
+        start_times = earliest.groupby(trainpart_ids).min()
+
+        def build_train(trainpart_id: str) -> Optional[Train]:
+            category = self.train_meta_data[trainpart_id]["category"]
+            train = self.create_train(trainpart_id, category)
+            try:
+                relevant_data = self.df.iloc[rows[trainpart_id]]
+                schedule = ScheduleBuilder().from_df(relevant_data).build()
+                self.assign_to_train(schedule, train)
+                return train
+            except Exception as e:
+                self.logger.error(f"Error while scheduling train {trainpart_id}: {e}")
+                return None
+
+        return WindowedScheduler(
+            sim,
+            build_train,
+            {
+                trainpart_id: start_time.to_pydatetime()
+                for trainpart_id, start_time in start_times.items()
+                if trainpart_id in self.train_meta_data
+            },
+            {
+                trainpart_id: meta["previous_trainparts"]
+                for trainpart_id, meta in self.train_meta_data.items()
+            },
+            window,
+            self.create_result_writer(self.result_folder, "results", RESULT_COLUMNS),
+        )
+
     @staticmethod
     def link_trains(trains: Dict[str, T], train_meta_data: Dict):
         for trainpart_id, train_meta in train_meta_data.items():
@@ -164,10 +389,24 @@ class BaseExperiment(ABC):
                     if pt in trains
                 ]
 
+    def create_result_writer(
+        self, result_folder: str, name: str, columns: Dict[str, str]
+    ) -> ResultWriter:
+        """Creates a writer in the format of `format` in the `[output]` section."""
+        output_format = self.config.get("output", {}).get("format", "csv")
+        return create_result_writer(result_folder, name, columns, output_format)
+
+    def write_result(
+        self, df: pd.DataFrame, result_folder: str, name: str, columns: Dict[str, str]
+    ):
+        writer = self.create_result_writer(result_folder, name, columns)
+        writer.write(df)
+        writer.close()
+
     def process_results(self, trains: Dict[str, T], result_folder: str):
         results = [train.traversal_logs_as_df() for train in trains.values()]
         self.results_df = pd.concat(results)
-        self.results_df.to_csv(result_folder + "/results.csv", index=False)
+        self.write_result(self.results_df, result_folder, "results", RESULT_COLUMNS)
 
     def process_track_reservations(self, network: Network, result_folder: str):
         track_reservations = []
@@ -183,8 +422,11 @@ class BaseExperiment(ABC):
             track_reservations.extend(logs)
 
         self.track_reservations_df = pd.DataFrame(track_reservations)
-        self.track_reservations_df.to_csv(
-            result_folder + "/track_reservations.csv", index=False
+        self.write_result(
+            self.track_reservations_df,
+            result_folder,
+            "track_reservations",
+            TRACK_RESERVATION_COLUMNS,
         )
 
     @abstractmethod
@@ -196,7 +438,9 @@ class BaseExperiment(ABC):
         pass
 
     @abstractmethod
-    def assign_to_train(self, schedule: Schedule, train: Train):
+    def assign_to_train(
+        self, schedule: Schedule, train: Train, paths: Optional[PathMap] = None
+    ):
         pass
 
     def save_stats(self, stats: Dict):
@@ -208,37 +452,102 @@ class BaseExperiment(ABC):
             if isinstance(self.delay, SaveablePrimaryDelayInjector):
                 self.delay.save_injected_delay(self.result_folder + "/delay.csv")
 
+    def restore_cached_result(self):
+        assert self.result_cache is not None and self.cached_result is not None
+        self.logger.info("Reusing the cached results in %s", self.cached_result)
+        restored = self.result_cache.restore(self.cache_key, self.result_folder)
+        self.logger.info("Copied %s", ", ".join(sorted(restored)))
+
+    def store_result(self):
+        if self.result_cache is None:
+            return
+        config_file = os.path.basename(self.config_file or "config.toml")
+        # the log and config differ between runs with the same results
+        self.result_cache.store(
+            self.cache_key,
+            self.cache_key_inputs,
+            self.result_folder,
+            exclude=["log.txt", config_file],
+        )
+        self.logger.info("Stored the results in the cache as %s", self.cache_key)
+
     def run(self):
+        try:
+            if self.cached_result is not None:
+                self.restore_cached_result()
+            else:
+                self.run_simulation()
+        finally:
+            self.stop_profiling()
+
+    def run_simulation(self):
         self.logger.info(f"Starting {self.config['general']['name']} simulation")
 
-        sim = Simulation(self.delay, self.network)
-
-        self.logger.info("Scheduling trains")
-        trains = self.schedule_trains(sim)
-        self.logger.info(f"Number of scheduled trains: {len(trains)}")
+        log_config = self.config.get("logging", {})
+        sim = Simulation(self.delay, self.network, log_config.get("profile", False))
+        if log_config.get("trace", False):
+            sim.add_observer(
+                BinaryTraceWriter(os.path.join(self.result_folder, "trace.bin"))
+            )
 
-        self.logger.info("Linking trains (update dependencies)")
-        self.link_trains(trains, self.train_meta_data)
+        window_minutes = self.config.get("scheduling", {}).get("window_minutes")
+        scheduler = None
+        if window_minutes is None:
+            self.logger.info("Scheduling trains")
+            with self.profiler.phase("schedule_trains"):
+                trains = self.schedule_trains(sim)
+            number_of_trains = len(trains)
+            self.logger.info(f"Number of scheduled trains: {number_of_trains}")
+
+            self.logger.info("Linking trains (update dependencies)")
+            with self.profiler.phase("link_trains"):
+                self.link_trains(trains, self.train_meta_data)
+        else:
+            self.logger.info(
+                f"Admitting trains {window_minutes} minutes before their start"
+            )
+            with self.profiler.phase("schedule_trains"):
+                scheduler = self.create_windowed_scheduler(
+                    sim, timedelta(minutes=window_minutes)
+                )
+                scheduler.schedule()
 
         self.logger.info("Running simulation")
         start_time = datetime.now()
-        sim.run()
+        with self.profiler.phase("run"):
+            sim.run()
         end_time = datetime.now()
+        if sim.observer is not None:
+            sim.observer.close()
         duration = (end_time - start_time).total_seconds()
 
         self.logger.info("Processing results and track reservations")
-        self.process_results(trains, self.result_folder)
-        self.process_track_reservations(self.network, self.result_folder)
+        scheduling_stats = {}
+        with self.profiler.phase("process_results"):
+            if scheduler is None:
+                self.process_results(trains, self.result_folder)
+            else:
+                scheduler.close()
+                number_of_trains = scheduler.admitted
+                scheduling_stats["max_active_trains"] = scheduler.max_active
+        with self.profiler.phase("process_reservations"):
+            self.process_track_reservations(self.network, self.result_folder)
 
         self.save_delay_log()
 
+        self.stop_profiling()
+
         stats = {
             "duration_seconds": duration,
             "number_of_train_schedules:": len(self.train_meta_data),
-            "number_of_trains_successfully_scheduled": len(trains),
+            "number_of_trains_successfully_scheduled": number_of_trains,
+            **scheduling_stats,
+            **sim.stats(),
+            "phases": self.profiler.stats(),
         }
 
         self.save_stats(stats)
+        self.store_result()
         self.logger.info("Simulation completed and results processed")
 
 
@@ -251,15 +560,27 @@ class MBExperiment(BaseExperiment):
             mbTrackFactory = MBTrackFactory(section_length)
             return network_from_xml(f.read(), mbTrackFactory)
 
+    def prepare_network(self, network: Network):
+        section_length = self.config["mb"]["section_length"]
+        for track in cast(Network[MBTrack], network).tracks.values():
+            if track.section_length != section_length:
+                track.split(section_length)
+        super().prepare_network(network)
+
     def create_train(self, trainpart_id: str, category: str) -> Train:
         acc = self.train_behaviour_data[category]["acc"]
         dec = self.train_behaviour_data[category]["dec"]
         rel_max_speed = self.train_behaviour_data[category]["rel_max_speed"]
         return MBTrain(str(trainpart_id), str(category), acc, dec, rel_max_speed)
 
-    def assign_to_train(self, schedule: Schedule, train: Train):
+    def assign_to_train(
+        self, schedule: Schedule, train: Train, paths: Optional[PathMap] = None
+    ):
         mtrain = cast(MBTrain, train)
-        MBScheduleTransformer.assign_to_train(schedule, mtrain, self.network)
+        lazy = self.config["mb"].get("lazy_tasklist", False)
+        MBScheduleTransformer.assign_to_train(
+            schedule, mtrain, self.network, lazy, paths
+        )
 
     def process_track_reservations(self, network: Network, result_folder: str):
         mbnetwork = cast(Network[MBTrack], network)
@@ -281,8 +602,11 @@ class MBExperiment(BaseExperiment):
                 track_reservations.extend(logs)
 
         self.track_reservations_df = pd.DataFrame(track_reservations)
-        self.track_reservations_df.to_csv(
-            result_folder + "/track_reservations.csv", index=False
+        self.write_result(
+            self.track_reservations_df,
+            result_folder,
+            "track_reservations",
+            TRACK_RESERVATION_COLUMNS,
         )
 
 
@@ -290,11 +614,15 @@ class LBExperiment(MBExperiment):
     def create_train(self, trainpart_id: str, category: str) -> Train:
         return Train(str(trainpart_id), str(category))
 
-    def assign_to_train(self, schedule: Schedule, train: Train):
-        LBScheduleTransformer.assign_to_train(schedule, train, self.network)
+    def assign_to_train(
+        self, schedule: Schedule, train: Train, paths: Optional[PathMap] = None
+    ):
+        LBScheduleTransformer.assign_to_train(schedule, train, self.network, paths)
 
 
 class FBExperiment(BaseExperiment):
+    direct_tracks_first = True
+
     def load_network(self) -> Network:
         network_path = self.config["paths"]["network"]
         with open(network_path, "r") as f:
@@ -304,14 +632,18 @@ class FBExperiment(BaseExperiment):
     def create_train(self, trainpart_id: str, category: str) -> Train:
         return Train(str(trainpart_id), str(category))
 
-    def assign_to_train(self, schedule: Schedule, train: Train):
+    def assign_to_train(
+        self, schedule: Schedule, train: Train, paths: Optional[PathMap] = None
+    ):
         force_direct_path = self.config.get("fb", {}).get("force_direct_path", False)
         ScheduleTransformer.assign_to_train(
-            schedule, train, self.network, force_direct_path
+            schedule, train, self.network, force_direct_path, paths
         )
 
 
-def create_experiment(config: Union[str, Dict]) -> BaseExperiment:
+def create_experiment(
+    config: Union[str, Dict], inputs: Optional[SharedInputs] = None
+) -> BaseExperiment:
     if isinstance(config, str):
         config_dict = toml.load(config)
     else:
@@ -319,11 +651,11 @@ def create_experiment(config: Union[str, Dict]) -> BaseExperiment:
 
     sim_type = config_dict["general"]["simulation_type"]
     if sim_type == "mb":
-        return MBExperiment(config)
+        return MBExperiment(config, inputs)
     elif sim_type == "fb":
-        return FBExperiment(config)
+        return FBExperiment(config, inputs)
     elif sim_type == "lb":
-        return LBExperiment(config)
+        return LBExperiment(config, inputs)
     else:
         raise ValueError(f"Invalid simulation type: {sim_type}")
 
@@ -337,11 +669,42 @@ def run_experiment(config_path):
         return f"Error in experiment {config_path}: {str(e)}\n{traceback.format_exc()}"
 
 
-def run_experiments_parallel(config_files, max_workers):
-    with Pool(processes=max_workers) as pool:
-        results = list(
-            tqdm(pool.imap(run_experiment, config_files), total=len(config_files))
-        )
+def run_experiment_grid(config_path):
+    """
+    Runs each point of the `[sweep]` grid of a config, see `expand_grid`.
+    The runs share the timetable and the network where their inputs match.
+    """
+    inputs = SharedInputs()
+    results = []
+    for config in tqdm(expand_grid(toml.load(config_path))):
+        name = config["general"]["name"]
+        try:
+            create_experiment(config, inputs).run()
+            results.append(f"Experiment completed: {name}")
+        except Exception as e:
+            results.append(
+                f"Error in experiment {name}: {str(e)}\n{traceback.format_exc()}"
+            )
+    return results
+
+
+def execute_experiment(config_path):
+    create_experiment(config_path).run()
+
+
+def run_experiments_parallel(
+    config_files, max_workers, timeout=None, retries=0, manifest_path=None
+):
+    manifest = run_sweep(
+        config_files, execute_experiment, max_workers, timeout, retries, manifest_path
+    )
+    results = []
+    for config_file in config_files:
+        entry = manifest[config_file]
+        if entry["status"] == "done":
+            results.append(f"Experiment completed: {config_file}")
+        else:
+            results.append(f"Error in experiment {config_file}: {entry['error']}")
     return results
 
 
@@ -368,23 +731,48 @@ if __name__ == "__main__":
         default=cpu_count(),
         help="Number of workers to use for parallel",
     )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Seconds after which an experiment of a directory is stopped",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=0,
+        help="Number of times a failed experiment of a directory is rerun",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        help="Progress file of a directory; experiments done before are skipped",
+    )
     args = parser.parse_args()
 
     if args.config is not None:
         # Single config file mode
-        result = run_experiment(args.config)
-        print(result)
+        if "sweep" in toml.load(args.config):
+            for result in run_experiment_grid(args.config):
+                print(result)
+        else:
+            result = run_experiment(args.config)
+            print(result)
     elif args.dir is not None:
         # Directory mode
         config_files = glob.glob(os.path.join(args.dir, "*.toml"))
         num_experiments = len(config_files)
 
-        if args.n_workers == 1:
+        use_sweep = (
+            args.timeout is not None or args.retries > 0 or args.manifest is not None
+        )
+        if args.n_workers == 1 and not use_sweep:
             results = run_experiments_sequential(config_files)
         else:
-            max_workers = min(args.n_workers, cpu_count(), num_experiments)
+            max_workers = max(min(args.n_workers, cpu_count(), num_experiments), 1)
             print(f"Running {num_experiments} experiments using {max_workers} workers")
-            results = run_experiments_parallel(config_files, max_workers)
+            results = run_experiments_parallel(
+                config_files, max_workers, args.timeout, args.retries, args.manifest
+            )
 
         # Print results
         for result in results:
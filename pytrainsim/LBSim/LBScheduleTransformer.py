@@ -1,11 +1,11 @@
-from typing import List
+from typing import List, Optional
 from pytrainsim.LBSim.driveTask import LBDriveTask
 from pytrainsim.MBSim.MBScheduleTransformer import MBScheduleTransformer
 from pytrainsim.MBSim.trackSection import MBTrack
 from pytrainsim.OCPSim.endTask import EndTask
 from pytrainsim.OCPSim.startTask import StartTask
 from pytrainsim.OCPSim.stopTask import StopTask
-from pytrainsim.infrastructure import Network
+from pytrainsim.infrastructure import Network, PathMap
 from pytrainsim.resources.train import Train
 from pytrainsim.schedule import OCPEntry, Schedule, TrackEntry
 from pytrainsim.task import Task
@@ -13,7 +13,12 @@ from pytrainsim.task import Task
 
 class LBScheduleTransformer:
     @staticmethod
-    def assign_to_train(schedule: Schedule, train: Train, network: Network[MBTrack]):
+    def assign_to_train(
+        schedule: Schedule,
+        train: Train,
+        network: Network[MBTrack],
+        paths: Optional[PathMap] = None,
+    ):
         if schedule.head is None or schedule.tail is None:
             return []
 
@@ -37,7 +42,7 @@ class LBScheduleTransformer:
                     raise ValueError(
                         f"Track not found between {current_entry.ocp_from} and {current_entry.ocp_to}"
                     )
-                tracks = network.shortest_path(from_ocp, to_ocp)
+                tracks = network.find_path(from_ocp, to_ocp, paths)
                 if tracks == []:
                     raise ValueError(
                         f"Track not found between {current_entry.ocp_from} and {current_entry.ocp_to}"
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
-from typing import Callable
+from typing import Callable, List
+from pytrainsim.infrastructure import InfrastructureElement
 from pytrainsim.MBSim.trackSection import TrackSection
 from pytrainsim.resources.train import Train, ArrivalLogEntry
 from pytrainsim.schedule import TrackEntry
@@ -7,6 +8,15 @@ from pytrainsim.task import Task
 
 
 class LBDriveTask(Task):
+    __slots__ = (
+        "track_section",
+        "trackEntry",
+        "_train",
+        "task_id",
+        "_scheduled_completion_time",
+        "_min_duration",
+    )
+
     def __init__(
         self,
         track_section: TrackSection,
@@ -25,7 +35,6 @@ class LBDriveTask(Task):
 
     def complete(self, simulation_time: datetime):
         if self.track_section.is_last_track_section():
-            self.log_task_event(simulation_time, "Completed")
             self.train.log_arrival(
                 ArrivalLogEntry(
                     self.task_id,
@@ -37,7 +46,7 @@ class LBDriveTask(Task):
             )
 
     def start(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Started")
+        pass
 
     @property
     def train(self) -> Train:
@@ -47,12 +56,15 @@ class LBDriveTask(Task):
         return self.track_section.has_capacity()
 
     def reserve_infra(self, simulation_time: datetime) -> bool:
-        return self.track_section.reserve(self.train.train_name, simulation_time)
+        return self.train.reserve(self.track_section, simulation_time)
 
     def release_infra(self, simulation_time: datetime) -> bool:
-        self.track_section.release(self.train.train_name, simulation_time)
+        self.train.release(self.track_section, simulation_time)
         return True
 
+    def infra_elements(self) -> List[InfrastructureElement]:
+        return [self.track_section]
+
     def register_infra_free_callback(self, callback: Callable[[], None]):
         self.track_section.register_free_callback(callback)
 
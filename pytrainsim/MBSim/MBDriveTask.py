@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple, Union
+from pytrainsim.infrastructure import InfrastructureElement
 from pytrainsim.MBSim.MBTrain import MBTrain
 from pytrainsim.MBSim.trackSection import TrackSection
 from pytrainsim.resources.train import Train, ArrivalLogEntry
@@ -10,6 +11,8 @@ from pytrainsim.task import Task
 
 
 class MBDriveTask(Task):
+    __slots__ = ("arrival_id", "trackSection", "_train", "_next", "exit_speed")
+
     def __init__(
         self,
         trackEntry: TrackEntry,
@@ -17,17 +20,35 @@ class MBDriveTask(Task):
         train: MBTrain,
         next_MBDriveTask: Optional["MBDriveTask"] = None,
     ) -> None:
-        self.trackEntry = trackEntry
+        # the only part of the track entry that is not derived from the section
+        self.arrival_id = trackEntry.arrival_id
         self.trackSection = trackSection
         self._train = train
-        self.task_id = trackEntry.arrival_id + "_" + str(trackSection.idx)
 
-        self.next_MBDriveTask = next_MBDriveTask
+        # the next task, or a function creating it on first use if the
+        # tasklist is lazy
+        self._next: Union[MBDriveTask, Callable[[], MBDriveTask], None] = (
+            next_MBDriveTask
+        )
 
         self.exit_speed: Optional[float] = None
 
+    @property
+    def task_id(self) -> str:
+        return self.arrival_id + "_" + str(self.trackSection.idx)
+
+    @property
+    def next_MBDriveTask(self) -> Optional[MBDriveTask]:
+        if self._next is not None and not isinstance(self._next, MBDriveTask):
+            self._next = self._next()
+        return self._next
+
+    @next_MBDriveTask.setter
+    def next_MBDriveTask(self, task: Optional[MBDriveTask]):
+        self._next = task
+
     def get_delay_task_id(self) -> str:
-        return "_".join(self.task_id.split("_")[:-1])
+        return self.arrival_id
 
     def complete(self, simulation_time: datetime):
         if self.exit_speed is None:
@@ -35,21 +56,19 @@ class MBDriveTask(Task):
 
         self._train.speed = self.exit_speed
 
-        self.log_task_event(simulation_time, "Completed")
-
         if self.trackSection.is_last_track_section():
             self.train.log_arrival(
                 ArrivalLogEntry(
                     self.get_delay_task_id(),
                     self.train.train_name,
-                    self.trackEntry.ocp_to,
+                    self.trackSection.parent_track.end.name,
                     scheduled_arrival=self.scheduled_completion_time(),
                     simulated_arrival=simulation_time,
                 )
             )
 
     def start(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Started")
+        pass
 
     @property
     def train(self) -> Train:
@@ -103,7 +122,7 @@ class MBDriveTask(Task):
 
     def reserve_infra(self, simulation_time: datetime) -> bool:
         if self not in self._train.reserved_driveTasks:
-            self.trackSection.reserve(self.train.train_name, simulation_time)
+            self._train.reserve(self.trackSection, simulation_time)
             self._train.reserved_driveTasks.append(self)
 
         # accelerating
@@ -122,7 +141,7 @@ class MBDriveTask(Task):
         for mbdrivetask in mbts:
             if mbdrivetask not in self._train.reserved_driveTasks:
 
-                mbdrivetask.trackSection.reserve(self.train.train_name, simulation_time)
+                self._train.reserve(mbdrivetask.trackSection, simulation_time)
                 self._train.reserved_driveTasks.append(mbdrivetask)
 
         if (
@@ -135,10 +154,13 @@ class MBDriveTask(Task):
         return True
 
     def release_infra(self, simulation_time: datetime) -> bool:
-        self.trackSection.release(self.train.train_name, simulation_time)
+        self._train.release(self.trackSection, simulation_time)
         self._train.reserved_driveTasks.remove(self)
         return True
 
+    def infra_elements(self) -> List[InfrastructureElement]:
+        return [self.trackSection]
+
     def register_infra_free_callback(self, callback: Callable[[], None]):
         self.trackSection.register_free_callback(callback)
 
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import partial
+from typing import Callable, List, Optional, Tuple, Union
+
+from pytrainsim.MBSim.MBDriveTask import MBDriveTask
+from pytrainsim.MBSim.MBTrain import MBTrain
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.lazyTaskList import LazyTaskList
+from pytrainsim.schedule import TrackEntry
+from pytrainsim.task import Task
+
+Segment = Union[Callable[[], Task], Tuple[TrackEntry, MBTrack]]
+
+
+class MBRoute:
+    """
+    Compact description of the tasks of a train: one segment per non-drive
+    task and one per track entry, which expands to one MBDriveTask per track
+    section. Tasks can be created all at once (`tasks`) or on demand by a
+    LazyTaskList (`create_task`).
+    """
+
+    def __init__(self, train: MBTrain):
+        self.train = train
+        self._segments: List[Segment] = []
+        self._starts: List[int] = []
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def add_task(self, factory: Callable[[], Task]):
+        self._starts.append(self._length)
+        self._segments.append(factory)
+        self._length += 1
+
+    def add_track(self, track_entry: TrackEntry, track: MBTrack):
+        self._starts.append(self._length)
+        self._segments.append((track_entry, track))
+        self._length += len(track.track_sections)
+
+    def _is_drive(self, idx: int) -> bool:
+        if idx >= self._length:
+            return False
+        return isinstance(self._segments[bisect_right(self._starts, idx) - 1], tuple)
+
+    def create_task(self, tasklist: LazyTaskList, idx: int) -> Task:
+        segment_idx = bisect_right(self._starts, idx) - 1
+        segment = self._segments[segment_idx]
+        if not isinstance(segment, tuple):
+            return segment()
+
+        track_entry, track = segment
+        section = track.track_sections[idx - self._starts[segment_idx]]
+        task = MBDriveTask(track_entry, section, self.train)
+        if self._is_drive(idx + 1):
+            task._next = partial(tasklist.__getitem__, idx + 1)
+        return task
+
+    def tasks(self) -> List[Task]:
+        tasks: List[Task] = []
+        previous: Optional[MBDriveTask] = None
+        for segment in self._segments:
+            if not isinstance(segment, tuple):
+                tasks.append(segment())
+                previous = None
+                continue
+
+            track_entry, track = segment
+            for track_section in track.track_sections:
+                mbDriveTask = MBDriveTask(track_entry, track_section, self.train)
+                if previous is not None:
+                    previous.next_MBDriveTask = mbDriveTask
+                tasks.append(mbDriveTask)
+                previous = mbDriveTask
+
+        return tasks
@@ -1,33 +1,62 @@
-from typing import List
-from pytrainsim.MBSim.MBDriveTask import MBDriveTask
+from functools import partial
+from typing import List, Optional
+from pytrainsim.MBSim.MBRoute import MBRoute
 from pytrainsim.MBSim.MBTrain import MBTrain
 from pytrainsim.MBSim.trackSection import MBTrack
 from pytrainsim.OCPSim.endTask import EndTask
 from pytrainsim.OCPSim.startTask import StartTask
 from pytrainsim.OCPSim.stopTask import StopTask
-from pytrainsim.infrastructure import Network
+from pytrainsim.infrastructure import Network, PathMap
+from pytrainsim.lazyTaskList import LazyTaskList
 from pytrainsim.schedule import OCPEntry, Schedule, TrackEntry
-from pytrainsim.task import Task
 
 
 class MBScheduleTransformer:
     @staticmethod
-    def assign_to_train(schedule: Schedule, train: MBTrain, network: Network[MBTrack]):
+    def assign_to_train(
+        schedule: Schedule,
+        train: MBTrain,
+        network: Network[MBTrack],
+        lazy: bool = False,
+        paths: Optional[PathMap] = None,
+    ):
+        """
+        Assigns the tasks of the schedule to the train.
+
+        With `lazy`, the train gets a LazyTaskList that creates the tasks
+        while the train advances instead of all tasks up front. `paths` are
+        used instead of searching the shortest path between OCPs.
+        """
         if schedule.head is None or schedule.tail is None:
             return []
 
-        tasks = []
+        route = MBScheduleTransformer.route(schedule, train, network, paths)
+        if lazy:
+            train.tasklist = LazyTaskList(len(route), route.create_task)
+        else:
+            train.tasklist = route.tasks()
+        train.current_task_index = 0
+
+    @staticmethod
+    def route(
+        schedule: Schedule,
+        train: MBTrain,
+        network: Network[MBTrack],
+        paths: Optional[PathMap] = None,
+    ) -> MBRoute:
+        route = MBRoute(train)
         current_entry = schedule.head
 
-        startTask = StartTask(train, current_entry)
-        tasks.append(startTask)
+        route.add_task(partial(StartTask, train, current_entry))
 
         while current_entry:
             if isinstance(current_entry, OCPEntry):
                 ocp = network.get_ocp(current_entry.ocp_name)
                 if ocp is None:
                     raise ValueError(f"OCP not found for {current_entry.ocp_name}")
-                tasks.append(StopTask(ocp, current_entry, train, current_entry.stop_id))
+                route.add_task(
+                    partial(StopTask, ocp, current_entry, train, current_entry.stop_id)
+                )
 
             elif isinstance(current_entry, TrackEntry):
                 from_ocp = network.get_ocp(current_entry.ocp_from)
@@ -36,7 +65,7 @@ class MBScheduleTransformer:
                     raise ValueError(
                         f"Track not found between {current_entry.ocp_from} and {current_entry.ocp_to}"
                     )
-                tracks = network.shortest_path(from_ocp, to_ocp)
+                tracks = network.find_path(from_ocp, to_ocp, paths)
                 if tracks == []:
                     raise ValueError(
                         f"Track not found between {current_entry.ocp_from} and {current_entry.ocp_to}"
@@ -46,9 +75,7 @@ class MBScheduleTransformer:
                 )
 
                 for split_entry, track in zip(split_entries, tracks):
-                    tasks = MBScheduleTransformer._TrackEntry_to_Tasklist(
-                        track, split_entry, train, tasks
-                    )
+                    route.add_track(split_entry, track)
 
             current_entry = current_entry.next_entry
 
@@ -60,11 +87,9 @@ class MBScheduleTransformer:
         end_ocp = network.get_ocp(end_ocp_name)
         if end_ocp is None:
             raise ValueError(f"OCP not found for {end_ocp_name}")
-        endTask = EndTask(end_ocp, schedule.tail.completion_time, train)
-        tasks.append(endTask)
+        route.add_task(partial(EndTask, end_ocp, schedule.tail.completion_time, train))
 
-        train.tasklist = tasks
-        train.current_task_index = 0
+        return route
 
     @staticmethod
     def _split_TrackEntry(
@@ -105,23 +130,3 @@ class MBScheduleTransformer:
             )
 
         return track_entries
-
-    @staticmethod
-    def _TrackEntry_to_Tasklist(
-        track: MBTrack,
-        track_entry: TrackEntry,
-        train: MBTrain,
-        tasks: List[Task] = [],
-    ) -> List[Task]:
-        for track_section in track.track_sections:
-            mbDriveTask = MBDriveTask(
-                track_entry,
-                track_section,
-                train,
-            )
-            if len(tasks) > 0 and isinstance(tasks[-1], MBDriveTask):
-                tasks[-1].next_MBDriveTask = mbDriveTask
-
-            tasks.append(mbDriveTask)
-
-        return tasks
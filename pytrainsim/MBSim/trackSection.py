@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List
 import math
 
+from pytrainsim.ids import derived_id
 from pytrainsim.infrastructure import (
     OCP,
     InfrastructureElement,
@@ -10,6 +11,8 @@ from pytrainsim.infrastructure import (
 
 
 class MBTrack(Track):
+    __slots__ = ("track_sections", "max_speed", "section_length")
+
     def __init__(
         self,
         length: int,
@@ -20,14 +23,18 @@ class MBTrack(Track):
         max_speed: float,
     ):
         super().__init__(length, start, end, capacity, record_reservations=False)
-        self.track_sections: List[TrackSection] = []
         self.max_speed = max_speed
+        self.split(section_length)
 
-        num_sections = math.ceil(length / section_length)
-        section_lengths = [length / num_sections] * num_sections
+    def split(self, section_length: float):
+        """Replaces the track sections by sections of at most `section_length`."""
+        self.section_length = section_length
+        num_sections = math.ceil(self.length / section_length)
+        section_lengths = [self.length / num_sections] * num_sections
 
+        self.track_sections: List[TrackSection] = []
         for i, l in enumerate(section_lengths):
-            self.track_sections.append(TrackSection(self, i, l, capacity))
+            self.track_sections.append(TrackSection(self, i, l, self.capacity))
 
     # overwrite capacity setter to update capacity of all track sections
     @Track.capacity.setter
@@ -43,14 +50,19 @@ class MBTrack(Track):
 
 
 class TrackSection(InfrastructureElement):
+    __slots__ = ("parent_track", "idx", "length")
+
     def __init__(self, parent_track: MBTrack, idx: int, length: float, capacity: int):
-        name = f"{parent_track.name}_{idx}"
-        super().__init__(name, capacity)
+        super().__init__(None, capacity, uid=derived_id(parent_track.uid, idx))
 
         self.parent_track = parent_track
         self.idx = idx
         self.length = length
 
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return f"{self.parent_track.name}_{self.idx}"
+
     def is_last_track_section(self) -> bool:
         return self.idx == len(self.parent_track.track_sections) - 1
 
@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta
 from typing import Callable, List
-from pytrainsim.infrastructure import Track
+from pytrainsim.infrastructure import InfrastructureElement, Track
 from pytrainsim.resources.train import Train, ArrivalLogEntry
 from pytrainsim.schedule import TrackEntry
 from pytrainsim.task import Task
 
 
 class DriveTask(Task):
+    __slots__ = ("tracks", "trackEntry", "_train", "task_id")
+
     def __init__(
         self,
         tracks: List[Track],
@@ -20,7 +22,6 @@ class DriveTask(Task):
         self.task_id = task_id
 
     def complete(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Completed")
         self.train.log_arrival(
             ArrivalLogEntry(
                 self.task_id,
@@ -32,7 +33,7 @@ class DriveTask(Task):
         )
 
     def start(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Started")
+        pass
 
     @property
     def train(self) -> Train:
@@ -44,7 +45,7 @@ class DriveTask(Task):
     def reserve_infra(self, simulation_time: datetime) -> bool:
         reserved = all(
             [
-                track.reserve(self.train.train_name, simulation_time)
+                self.train.reserve(track, simulation_time)
                 for track in self.tracks
             ]
         )
@@ -55,9 +56,12 @@ class DriveTask(Task):
 
     def release_infra(self, simulation_time: datetime) -> bool:
         for track in self.tracks:
-            track.release(self.train.train_name, simulation_time)
+            self.train.release(track, simulation_time)
         return True
 
+    def infra_elements(self) -> List[InfrastructureElement]:
+        return list(self.tracks)
+
     def register_infra_free_callback(self, callback: Callable[[], None]):
         for track in self.tracks:
             if not track.has_capacity():
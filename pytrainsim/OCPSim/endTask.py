@@ -5,20 +5,19 @@ from pytrainsim.task import Task
 
 
 class EndTask(Task):
+    __slots__ = ("end_ocp", "departure_time", "_train", "task_id")
+
     def __init__(self, end_ocp: OCP, departure_time: datetime, train: Train) -> None:
         self.end_ocp = end_ocp
         self.departure_time = departure_time
         self._train = train
-
-    @property
-    def task_id(self) -> str:
-        return f"EndTask_{self.train.train_name}_{self.end_ocp.name}"
+        self.task_id = f"EndTask_{train.train_name}_{end_ocp.name}"
 
     def complete(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Completed")
+        pass
 
     def start(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Started")
+        pass
 
     @property
     def train(self) -> Train:
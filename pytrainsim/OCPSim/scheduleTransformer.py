@@ -1,8 +1,10 @@
+from typing import Optional
+
 from pytrainsim.OCPSim.driveTask import DriveTask
 from pytrainsim.OCPSim.endTask import EndTask
 from pytrainsim.OCPSim.startTask import StartTask
 from pytrainsim.OCPSim.stopTask import StopTask
-from pytrainsim.infrastructure import Network, Track
+from pytrainsim.infrastructure import Network, PathMap, Track
 from pytrainsim.resources.train import Train
 from pytrainsim.schedule import OCPEntry, Schedule, TrackEntry
 
@@ -14,6 +16,7 @@ class ScheduleTransformer:
         train: Train,
         network: Network[Track],
         force_direct_path: bool = False,
+        paths: Optional[PathMap] = None,
     ):
         if schedule.head is None or schedule.tail is None:
             return []
@@ -47,7 +50,7 @@ class ScheduleTransformer:
                         raise ValueError(
                             f"OCP not found for Track between {current_entry.ocp_from} and {current_entry.ocp_to}"
                         )
-                    tracks = network.shortest_path(start, end)
+                    tracks = network.find_path(start, end, paths)
                     if tracks == []:
                         raise ValueError(
                             f"Path not found between {current_entry.ocp_from} and {current_entry.ocp_to}"
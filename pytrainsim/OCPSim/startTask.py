@@ -5,6 +5,8 @@ from pytrainsim.task import OnNthCallback, Task
 
 
 class StartTask(Task):
+    __slots__ = ("_train", "start_ocp_entry", "task_id")
+
     def __init__(self, train: Train, start_ocp_entry: OCPEntry) -> None:
         self._train = train
         self.start_ocp_entry = start_ocp_entry
@@ -12,7 +14,6 @@ class StartTask(Task):
         self.task_id = f"StartTask_{self.train.train_name}"
 
     def complete(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Completed")
         self.train.log_arrival(
             ArrivalLogEntry(
                 self.task_id,
@@ -24,7 +25,7 @@ class StartTask(Task):
         )
 
     def start(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Started")
+        pass
 
     @property
     def train(self) -> Train:
@@ -1,17 +1,19 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
 
-from pytrainsim.infrastructure import OCP
+from pytrainsim.infrastructure import OCP, InfrastructureElement
 from pytrainsim.resources.train import Train, DepartureLogEntry
 from pytrainsim.task import Task
 
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, List
 
 if TYPE_CHECKING:
     from pytrainsim.schedule import OCPEntry
 
 
 class StopTask(Task):
+    __slots__ = ("ocp", "ocpEntry", "_train", "task_id")
+
     def __init__(
         self,
         ocp: OCP,
@@ -26,7 +28,6 @@ class StopTask(Task):
         self.task_id = task_id
 
     def complete(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Completed")
         self.train.log_departure(
             DepartureLogEntry(
                 self.ocp.name,
@@ -37,7 +38,7 @@ class StopTask(Task):
         )
 
     def start(self, simulation_time: datetime):
-        self.log_task_event(simulation_time, "Started")
+        pass
 
     @property
     def train(self) -> Train:
@@ -47,12 +48,15 @@ class StopTask(Task):
         return self.ocp.has_capacity()
 
     def reserve_infra(self, simulation_time: datetime) -> bool:
-        return self.ocp.reserve(self.train.train_name, simulation_time)
+        return self.train.reserve(self.ocp, simulation_time)
 
     def release_infra(self, simulation_time: datetime) -> bool:
-        self.ocp.release(self.train.train_name, simulation_time)
+        self.train.release(self.ocp, simulation_time)
         return True
 
+    def infra_elements(self) -> List[InfrastructureElement]:
+        return [self.ocp]
+
     def register_infra_free_callback(self, callback: Callable[[], None]):
         return self.ocp.register_free_callback(callback)
 
@@ -0,0 +1,260 @@
+"""
+Exports the state of a running simulation as plain data and imports it into
+a simulation built from the same inputs.
+
+Unlike `Simulation.snapshot`, the state holds no objects of the simulation:
+events and the tasks waiting for infrastructure are stored as
+(event type, time, train index, task index), infrastructure elements by
+their position in the network and trains by their position in
+`Simulation.trains`. The static parts, the network, timetables and tasks,
+are rebuilt by the importing process, e.g. by an experiment with the same
+config, so the state stays small and is fast to serialize. The simulation
+has to schedule the same trains in the same order as the exported one.
+"""
+
+from __future__ import annotations
+
+import pickle
+import random
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, cast
+
+import numpy as np
+
+from pytrainsim.MBSim.MBDriveTask import MBDriveTask
+from pytrainsim.MBSim.MBTrain import MBTrain
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.event import AttemptEnd, Event, StartEvent
+from pytrainsim.infrastructure import InfrastructureElement, Network
+from pytrainsim.lazyTaskList import LazyTaskList
+from pytrainsim.reservationRecorder import ReservationLogEntry
+from pytrainsim.resources.train import Train
+from pytrainsim.simulation import Simulation
+from pytrainsim.task import OnNthCallback, Task
+
+STATE_VERSION = 1
+
+EVENT_TYPES = [StartEvent, AttemptEnd]
+# waiter referencing an OnNthCallback shared by several trains
+NTH_CALLBACK = len(EVENT_TYPES)
+
+LOG_FIELDS = (
+    "arrival_task_id",
+    "departure_task_id",
+    "trainpart_id",
+    "OCP",
+    "scheduled_arrival",
+    "simulated_arrival",
+    "scheduled_departure",
+    "simulated_departure",
+)
+
+# (event type, time, train index, task index) or (NTH_CALLBACK, index)
+Waiter = Tuple
+
+
+def network_elements(network: Network) -> Iterator[InfrastructureElement]:
+    """Yields the OCPs, tracks and track sections in a stable order."""
+    yield from network.ocps.values()
+    for track in network.tracks.values():
+        yield track
+        if isinstance(track, MBTrack):
+            yield from track.track_sections
+
+
+class _Exporter:
+    def __init__(self, sim: Simulation):
+        self.trains = {id(train): idx for idx, train in enumerate(sim.trains)}
+        self.nth_callbacks: List[Tuple] = []
+        self._nth_index: Dict[int, int] = {}
+
+    def task(self, task: Task) -> Tuple[int, int]:
+        train = task.train
+        # tasks referenced by the state are the current task or ahead of it
+        for idx in range(train.current_task_index, len(train.tasklist)):
+            if train.tasklist[idx] is task:
+                return self.trains[id(train)], idx
+        raise ValueError(f"Task {task} is not ahead of its train")
+
+    def event(self, event: Event) -> Waiter:
+        if type(event) not in EVENT_TYPES:
+            raise ValueError(f"Cannot export {type(event).__name__}")
+        return (EVENT_TYPES.index(type(event)), event.time, *self.task(event.task))
+
+    def waiter(self, callback: Callable) -> Waiter:
+        if isinstance(callback, OnNthCallback):
+            idx = self._nth_index.get(id(callback))
+            if idx is None:
+                idx = len(self.nth_callbacks)
+                self._nth_index[id(callback)] = idx
+                self.nth_callbacks.append(
+                    (callback.n, callback.i, self.waiter(callback.callback))
+                )
+            return (NTH_CALLBACK, idx)
+        event = getattr(callback, "__self__", None)
+        if isinstance(event, Event) and callback.__func__ is Event.reschedule:
+            return self.event(event)
+        raise ValueError(f"Cannot export waiter {callback}")
+
+    def element(self, element: InfrastructureElement) -> Optional[Tuple]:
+        reservations = None
+        if element.record_reservations:
+            reservations = [
+                (entry.trainpart_id, entry.start_time, entry.end_time)
+                for entries in element.reservation_recorder.reservation_logs.values()
+                for entry in entries
+            ]
+        if not element._occupied and not element._callbacks and not reservations:
+            return None
+        return (
+            element._occupied,
+            [self.waiter(callback) for callback in element._callbacks],
+            reservations,
+        )
+
+    def train(self, train: Train) -> Tuple:
+        logs = [tuple(log[field] for field in LOG_FIELDS) for log in train.traversal_logs]
+        waiters = [self.waiter(callback) for callback in train.on_finished_callbacks]
+        mb_state = None
+        if isinstance(train, MBTrain):
+            tasks = [train.current_task(), *train.reserved_driveTasks]
+            mb_state = (
+                train.speed,
+                [self.task(task)[1] for task in train.reserved_driveTasks],
+                [
+                    (self.task(task)[1], task.exit_speed)
+                    for task in tasks
+                    if isinstance(task, MBDriveTask) and task.exit_speed is not None
+                ],
+            )
+        return (train.current_task_index, train.finished, logs, waiters, mb_state)
+
+
+def capture_state(sim: Simulation) -> Dict[str, Any]:
+    """
+    Returns the state of the simulation as plain data: the event queue, the
+    occupancy, waiting tasks and reservations of the infrastructure, the
+    progress and logs of the trains, the state of the delay injector and
+    of the `random` and `numpy.random` generators.
+    """
+    if sim.on_train_finished is not None:
+        raise ValueError("Simulations admitting trains cannot be exported")
+
+    exporter = _Exporter(sim)
+    elements = {}
+    for idx, element in enumerate(network_elements(sim.network)):
+        state = exporter.element(element)
+        if state is not None:
+            elements[idx] = state
+
+    return {
+        "version": STATE_VERSION,
+        "current_time": getattr(sim, "current_time", None),
+        "reschedules": sim.reschedules,
+        # in heap order, so events at the same time are processed as before
+        "events": [exporter.event(event) for event in sim.event_queue],
+        "elements": elements,
+        "trains": [exporter.train(train) for train in sim.trains],
+        "nth_callbacks": exporter.nth_callbacks,
+        "delay": sim.delay_injector.get_state(),
+        "random": random.getstate(),
+        "numpy_random": np.random.get_state(),
+    }
+
+
+class _Importer:
+    def __init__(self, sim: Simulation, nth_callbacks: List[Tuple]):
+        self.sim = sim
+        self._nth_states = nth_callbacks
+        self._nth: Dict[int, OnNthCallback] = {}
+
+    def event(self, state: Waiter) -> Event:
+        event_type, time, train_idx, task_idx = state
+        task = self.sim.trains[train_idx].tasklist[task_idx]
+        return EVENT_TYPES[event_type](self.sim, time, task)
+
+    def waiter(self, state: Waiter) -> Callable:
+        if state[0] != NTH_CALLBACK:
+            return self.event(state).reschedule
+        idx = state[1]
+        if idx not in self._nth:
+            n, i, waiter = self._nth_states[idx]
+            callback = OnNthCallback(n, self.waiter(waiter))
+            callback.i = i
+            self._nth[idx] = callback
+        return self._nth[idx]
+
+    def element(self, element: InfrastructureElement, state: Optional[Tuple]):
+        element.reset()
+        if state is None:
+            return
+        occupied, waiters, reservations = state
+        element._occupied = occupied
+        element._callbacks = [self.waiter(waiter) for waiter in waiters]
+        if reservations:
+            logs = element.reservation_recorder.reservation_logs
+            for trainpart_id, start_time, end_time in reservations:
+                logs.setdefault(trainpart_id, []).append(
+                    ReservationLogEntry(trainpart_id, start_time, end_time)
+                )
+
+    def train(self, train: Train, state: Tuple):
+        current_task_index, finished, logs, waiters, mb_state = state
+        train.reset()
+        train.current_task_index = current_task_index
+        if isinstance(train.tasklist, LazyTaskList):
+            train.tasklist.release_before(current_task_index)
+        train.finished = finished
+        train.traversal_logs = [dict(zip(LOG_FIELDS, log)) for log in logs]
+        train.on_finished_callbacks = [self.waiter(waiter) for waiter in waiters]
+        if mb_state is not None:
+            mtrain = cast(MBTrain, train)
+            speed, reserved, exit_speeds = mb_state
+            mtrain.speed = speed
+            mtrain.reserved_driveTasks = [mtrain.tasklist[idx] for idx in reserved]
+            for idx, exit_speed in exit_speeds:
+                task = mtrain.tasklist[idx]
+                assert isinstance(task, MBDriveTask)
+                task.exit_speed = exit_speed
+
+
+def apply_state(sim: Simulation, state: Dict[str, Any]):
+    """
+    Sets a simulation built from the same inputs as the exported one to the
+    exported state, including the `random` and `numpy.random` generators.
+    """
+    if state.get("version") != STATE_VERSION:
+        raise ValueError(f"Unsupported state version: {state.get('version')}")
+    if len(state["trains"]) != len(sim.trains):
+        raise ValueError(
+            f"State has {len(state['trains'])} trains, "
+            f"the simulation {len(sim.trains)}"
+        )
+
+    importer = _Importer(sim, state["nth_callbacks"])
+    for train, train_state in zip(sim.trains, state["trains"]):
+        importer.train(train, train_state)
+    for idx, element in enumerate(network_elements(sim.network)):
+        importer.element(element, state["elements"].get(idx))
+
+    current_time: Optional[datetime] = state["current_time"]
+    if current_time is None:
+        if hasattr(sim, "current_time"):
+            del sim.current_time
+    else:
+        sim.current_time = current_time
+    sim.reschedules = state["reschedules"]
+    sim.event_queue = [importer.event(event) for event in state["events"]]
+    sim.delay_injector.set_state(state["delay"])
+    random.setstate(state["random"])
+    np.random.set_state(state["numpy_random"])
+
+
+def export_state(sim: Simulation) -> bytes:
+    """Returns `capture_state` serialized as bytes."""
+    return pickle.dumps(capture_state(sim), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def import_state(sim: Simulation, data: bytes):
+    """Applies a state serialized by `export_state` to the simulation."""
+    apply_state(sim, pickle.loads(data))
@@ -2,10 +2,11 @@ from typing import Dict
 from pytrainsim.delay.primaryDelay import PrimaryDelayInjector
 
 from pytrainsim.delay.normalDelay import NormalPrimaryDelayInjector
+from pytrainsim.delay.delayLog import read_delay_log
 from pytrainsim.delay.dfDelay import DFPrimaryDelayInjector, MBDFPrimaryDelayInjector
 from pytrainsim.delay.paretoDelay import ParetoPrimaryDelayInjector
 from pytrainsim.delay.ensembleDelay import EnsembleDelayInjector
-import pandas as pd
+from pytrainsim.delay.empiricalDelay import EmpiricalPrimaryDelayInjector
 
 
 class DelayFactory:
@@ -14,7 +15,7 @@ class DelayFactory:
         delay_type = config.pop("type", "normal")
 
         if delay_type == "df":
-            delay_df = pd.read_csv(config.pop("path"))
+            delay_df = read_delay_log(config.pop("path"))
             if config.pop("simulation_type", None) == "mb":
                 return MBDFPrimaryDelayInjector(delay_df, **config)
             else:
@@ -23,6 +24,8 @@ class DelayFactory:
             return NormalPrimaryDelayInjector(**config)
         elif delay_type == "pareto":
             return ParetoPrimaryDelayInjector(**config)
+        elif delay_type == "empirical":
+            return EmpiricalPrimaryDelayInjector.from_csv(config.pop("path"), **config)
         elif delay_type == "ensemble":
             sub_injectors = {}
             for key in ["injector_p_1s", "injector_p", "injector_f_1s", "injector_f"]:
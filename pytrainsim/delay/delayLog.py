@@ -0,0 +1,83 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+class DelayLogWriter:
+    """
+    Append-only Parquet log of injected delays.
+
+    Entries are buffered in a fixed-size float32 array and flushed as one
+    row group every `chunk_size` entries. Task ids are dictionary encoded per
+    row group, so repeated ids are only stored once. Requires `pyarrow`.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 65536):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.path = path
+        self.chunk_size = chunk_size
+        self.schema = pa.schema(
+            [
+                ("task_id", pa.dictionary(pa.int32(), pa.string())),
+                ("delay_seconds", pa.float32()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+        self._task_ids: List[str] = []
+        self._delay_seconds = np.empty(chunk_size, dtype=np.float32)
+        self.closed = False
+
+    def append(self, task_id: str, delay_seconds: float):
+        if self.closed:
+            raise ValueError("Delay log is already closed")
+        self._delay_seconds[len(self._task_ids)] = delay_seconds
+        self._task_ids.append(task_id)
+        if len(self._task_ids) == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        n = len(self._task_ids)
+        if n == 0:
+            return
+        pa = self._pa
+        table = pa.Table.from_arrays(
+            [
+                pa.array(self._task_ids, pa.string()).dictionary_encode(),
+                pa.array(self._delay_seconds[:n]),
+            ],
+            schema=self.schema,
+        )
+        self._writer.write_table(table)
+        self._task_ids = []
+
+    def __getstate__(self):
+        raise ValueError(
+            f"Delay log streamed to {self.path} cannot be pickled, "
+            "log delays in memory to snapshot a simulation"
+        )
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        self._writer.close()
+        self.closed = True
+
+
+def read_delay_log(path: str) -> pd.DataFrame:
+    """
+    Reads a delay log written as CSV or Parquet into a DataFrame with the
+    columns `task_id` and `delay_seconds`. If a task was delayed more than
+    once, the last entry is kept.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        df["task_id"] = df["task_id"].astype(str)
+    else:
+        df = pd.read_csv(path)
+    return df.drop_duplicates("task_id", keep="last")
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from typing import Dict
 import pandas as pd
 
 from pytrainsim.MBSim.MBDriveTask import MBDriveTask
@@ -6,20 +6,20 @@ from pytrainsim.delay.primaryDelay import PrimaryDelayInjector
 from pytrainsim.task import Task
 
 
+def _delays_by_task_id(df: pd.DataFrame) -> Dict[str, float]:
+    return dict(zip(df["task_id"], df["delay_seconds"].astype(float)))
+
+
 class DFPrimaryDelayInjector(PrimaryDelayInjector):
     def __init__(
         self,
         df: pd.DataFrame,
         **kwargs,
     ):
-        self.df = df
-        self.df = df.set_index("task_id")
+        self.delays = _delays_by_task_id(df)
 
-    def inject_delay(self, task: Task) -> timedelta:
-        if task.task_id in self.df.index:
-            delay = float(self.df.loc[task.task_id, "delay_seconds"])  # type: ignore
-            return timedelta(seconds=delay)
-        return timedelta(0)
+    def inject_delay(self, task: Task) -> float:
+        return self.delays.get(task.task_id, 0.0)
 
 
 class MBDFPrimaryDelayInjector(PrimaryDelayInjector):
@@ -28,18 +28,10 @@ class MBDFPrimaryDelayInjector(PrimaryDelayInjector):
         df: pd.DataFrame,
         **kwargs,
     ):
-        self.df = df
-        self.df = df.set_index("task_id")
+        self.delays = _delays_by_task_id(df)
 
-    def inject_delay(self, task: Task) -> timedelta:
-        divider = 1
-        delay_task_id = task.task_id
+    def inject_delay(self, task: Task) -> float:
         if isinstance(task, MBDriveTask):
-            divider = len(task.trackSection.parent_track.track_sections)
-            delay_task_id = task.get_delay_task_id()
-
-        if delay_task_id in self.df.index:
-            delay = float(self.df.loc[delay_task_id, "delay_seconds"])  # type: ignore
-            delay = delay / divider
-            return timedelta(seconds=delay)
-        return timedelta(0)
+            delay = self.delays.get(task.get_delay_task_id(), 0.0)
+            return delay / len(task.trackSection.parent_track.track_sections)
+        return self.delays.get(task.task_id, 0.0)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pytrainsim.delay.primaryDelay import SaveablePrimaryDelayInjector
+from pytrainsim.task import Task
+
+GroupKey = Tuple[Optional[str], Optional[str]]
+
+
+class AliasSampler:
+    """
+    Samples from a discrete distribution over bins using Walker's alias method.
+
+    Each bin i is drawn with probability weights[i] / sum(weights); the value
+    is then drawn uniformly from [lows[i], highs[i]] (a point mass if both
+    bounds are equal). Draws are generated in vectorised blocks of
+    `block_size` and handed out one at a time, so a single draw is O(1).
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        lows: np.ndarray,
+        highs: np.ndarray,
+        block_size: int = 4096,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        weights = np.asarray(weights, dtype=float)
+        if len(weights) == 0 or weights.sum() <= 0 or (weights < 0).any():
+            raise ValueError("Weights must be non-negative with a positive sum")
+
+        self.lows = np.asarray(lows, dtype=float)
+        self.highs = np.asarray(highs, dtype=float)
+        self.block_size = block_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.prob, self.alias = self._build_alias_table(weights)
+
+        self._block: List[float] = []
+        self._pos = 0
+
+    @staticmethod
+    def _build_alias_table(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        n = len(weights)
+        scaled = weights / weights.sum() * n
+        prob = np.ones(n)
+        alias = np.arange(n)
+
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = g
+            scaled[g] = scaled[g] + scaled[s] - 1
+            if scaled[g] < 1:
+                small.append(g)
+            else:
+                large.append(g)
+
+        # remaining entries are 1 up to floating point error
+        return prob, alias
+
+    def sample_n(self, n: int) -> np.ndarray:
+        columns = self.rng.integers(0, len(self.prob), size=n)
+        accept = self.rng.random(n) < self.prob[columns]
+        bins = np.where(accept, columns, self.alias[columns])
+        u = self.rng.random(n)
+        return self.lows[bins] + u * (self.highs[bins] - self.lows[bins])
+
+    def sample(self) -> float:
+        if self._pos >= len(self._block):
+            self._block = self.sample_n(self.block_size).tolist()
+            self._pos = 0
+        value = self._block[self._pos]
+        self._pos += 1
+        return value
+
+    def get_state(self) -> Tuple[Dict, List[float]]:
+        """Returns the generator state and the draws not handed out yet."""
+        return self.rng.bit_generator.state, self._block[self._pos :]
+
+    def set_state(self, state: Tuple[Dict, List[float]]):
+        self.rng.bit_generator.state, self._block = state
+        self._pos = 0
+
+
+class EmpiricalPrimaryDelayInjector(SaveablePrimaryDelayInjector):
+    """
+    Draws delays from empirical distributions grouped by train category and
+    task type (the class name of the task, e.g. `StopTask`).
+
+    Groups are resolved from most to least specific: (category, task_type),
+    (category, any), (any, task_type), (any, any). Tasks without a matching
+    group are not delayed.
+    """
+
+    def __init__(
+        self,
+        samplers: Dict[GroupKey, AliasSampler],
+        probability: float = 1.0,
+        log: bool = False,
+        rng: Optional[np.random.Generator] = None,
+        **kwargs,
+    ):
+        self.samplers = samplers
+        self.probability = probability
+        # decides whether a task is delayed at all
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._resolved: Dict[Tuple[str, str], Optional[AliasSampler]] = {}
+
+        super().__init__(log, **kwargs)
+
+    @staticmethod
+    def from_df(
+        df: pd.DataFrame,
+        block_size: int = 4096,
+        seed: Optional[int] = None,
+        **kwargs,
+    ) -> EmpiricalPrimaryDelayInjector:
+        """
+        Creates the injector from a histogram or quantile table.
+
+        Histogram tables have the columns `delay_seconds` and `weight`;
+        quantile tables have the columns `quantile` and `delay_seconds` and
+        are sampled by linear interpolation between consecutive quantiles.
+        The optional columns `category` and `task_type` group the rows; empty
+        values match any category or task type.
+        """
+        rng = np.random.default_rng(seed)
+        df = df.copy()
+        group_columns = ["category", "task_type"]
+        for column in group_columns:
+            if column not in df.columns:
+                df[column] = None
+            df[column] = df[column].astype(object).where(df[column].notna(), None)
+
+        samplers: Dict[GroupKey, AliasSampler] = {}
+        for key, group in df.groupby(group_columns, dropna=False, sort=False):
+            category, task_type = (None if pd.isna(k) else str(k) for k in key)
+            samplers[(category, task_type)] = EmpiricalPrimaryDelayInjector._sampler(
+                group, block_size, rng
+            )
+
+        return EmpiricalPrimaryDelayInjector(samplers, rng=rng, **kwargs)
+
+    @staticmethod
+    def from_csv(path: str, **kwargs) -> EmpiricalPrimaryDelayInjector:
+        return EmpiricalPrimaryDelayInjector.from_df(pd.read_csv(path), **kwargs)
+
+    @staticmethod
+    def _sampler(
+        group: pd.DataFrame, block_size: int, rng: np.random.Generator
+    ) -> AliasSampler:
+        if "quantile" in group.columns:
+            group = group.sort_values("quantile")
+            quantiles = group["quantile"].to_numpy(dtype=float)
+            delays = group["delay_seconds"].to_numpy(dtype=float)
+            if len(quantiles) < 2:
+                raise ValueError("Quantile tables need at least two rows per group")
+            return AliasSampler(
+                np.diff(quantiles), delays[:-1], delays[1:], block_size, rng
+            )
+
+        delays = group["delay_seconds"].to_numpy(dtype=float)
+        weights = group["weight"].to_numpy(dtype=float)
+        return AliasSampler(weights, delays, delays, block_size, rng)
+
+    def get_state(self) -> Any:
+        return {
+            "log": super().get_state(),
+            "samplers": [sampler.get_state() for sampler in self.samplers.values()],
+            "rng": self.rng.bit_generator.state,
+        }
+
+    def set_state(self, state: Any):
+        super().set_state(state["log"])
+        for sampler, sampler_state in zip(self.samplers.values(), state["samplers"]):
+            sampler.set_state(sampler_state)
+        self.rng.bit_generator.state = state["rng"]
+
+    def _resolve_sampler(self, category: str, task_type: str) -> Optional[AliasSampler]:
+        for key in [
+            (category, task_type),
+            (category, None),
+            (None, task_type),
+            (None, None),
+        ]:
+            if key in self.samplers:
+                return self.samplers[key]
+        return None
+
+    def _draw_delay(self, task: Task) -> float:
+        key = (task.train.train_category, task.__class__.__name__)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve_sampler(*key)
+
+        sampler = self._resolved[key]
+        if sampler is None:
+            return 0.0
+        if self.probability < 1 and self.rng.random() >= self.probability:
+            return 0.0
+        return max(0.0, sampler.sample())
@@ -1,4 +1,5 @@
-from datetime import timedelta
+from typing import Any
+
 from pytrainsim.OCPSim.startTask import StartTask
 from pytrainsim.delay.primaryDelay import SaveablePrimaryDelayInjector
 from pytrainsim.task import Task
@@ -25,7 +26,7 @@ class EnsembleDelayInjector(SaveablePrimaryDelayInjector):
         self.injector_f_1s.log = False
         self.injector_f.log = False
 
-        super().__init__(log)
+        super().__init__(log, **kwargs)
 
         self.freight_categories = [
             "KLV-Ganzzug",
@@ -46,8 +47,21 @@ class EnsembleDelayInjector(SaveablePrimaryDelayInjector):
             "Angebotstrassen",
         ]
 
-    def _draw_delay(self, task: Task) -> timedelta:
-        delay = timedelta()
+    def _injectors(self):
+        return [self.injector_p_1s, self.injector_p, self.injector_f_1s, self.injector_f]
+
+    def get_state(self) -> Any:
+        return {
+            "log": super().get_state(),
+            "injectors": [injector.get_state() for injector in self._injectors()],
+        }
+
+    def set_state(self, state: Any):
+        super().set_state(state["log"])
+        for injector, injector_state in zip(self._injectors(), state["injectors"]):
+            injector.set_state(injector_state)
+
+    def _draw_delay(self, task: Task) -> float:
         if isinstance(task, StartTask):
             if task.train.train_category in self.freight_categories:
                 delay = self.injector_f_1s.inject_delay(task)
@@ -1,4 +1,3 @@
-from datetime import timedelta
 import random
 
 import numpy as np
@@ -18,11 +17,10 @@ class NormalPrimaryDelayInjector(SaveablePrimaryDelayInjector):
         self.mean = mean
         self.std_dev = std
         self.probability = probability
-        super().__init__(log)
+        super().__init__(log, **kwargs)
 
-    def _draw_delay(self, task: Task) -> timedelta:
+    def _draw_delay(self, task: Task) -> float:
         if random.random() < self.probability:
             delay_minutes = max(0, np.random.normal(loc=self.mean, scale=self.std_dev))
-            delay_minutes = timedelta(minutes=round(delay_minutes))
-            return delay_minutes
-        return timedelta(0)
+            return round(delay_minutes) * 60.0
+        return 0.0
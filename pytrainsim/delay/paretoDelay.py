@@ -1,4 +1,3 @@
-from datetime import timedelta
 import random
 
 from pytrainsim.delay.primaryDelay import SaveablePrimaryDelayInjector
@@ -20,9 +19,9 @@ class ParetoPrimaryDelayInjector(SaveablePrimaryDelayInjector):
         self.scale = scale
         self.probability = probability
 
-        super().__init__(log)
+        super().__init__(log, **kwargs)
 
-    def _draw_delay(self, task: Task) -> timedelta:
+    def _draw_delay(self, task: Task) -> float:
         if random.random() < self.probability:
             uniform_random = random.random()
             pareto_random = (
@@ -32,6 +31,5 @@ class ParetoPrimaryDelayInjector(SaveablePrimaryDelayInjector):
             # Clamp the Pareto delay between 0 and 7 hours (420 minutes)
             pareto_random = max(0, min(pareto_random, 7 * 60))
 
-            delay_minutes = timedelta(minutes=pareto_random)
-            return delay_minutes
-        return timedelta(0)
+            return pareto_random * 60.0
+        return 0.0
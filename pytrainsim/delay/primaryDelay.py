@@ -1,14 +1,28 @@
 from abc import ABC, abstractmethod
-from datetime import timedelta
-from typing import Dict
+from typing import Any, Dict, Optional
 
+from pytrainsim.delay.delayLog import DelayLogWriter
 from pytrainsim.task import Task
 import pandas as pd
 
 
 class PrimaryDelayInjector(ABC):
     @abstractmethod
-    def inject_delay(self, task: Task) -> timedelta:
+    def inject_delay(self, task: Task) -> float:
+        """
+        Return the primary delay of the task in seconds.
+        """
+        pass
+
+    def get_state(self) -> Any:
+        """
+        Returns the state that changes while delays are drawn, as plain data,
+        e.g. to continue a simulation from a checkpoint. Draws from the
+        `random` and `numpy.random` modules are not included.
+        """
+        return None
+
+    def set_state(self, state: Any):
         pass
 
 
@@ -16,24 +30,46 @@ class SaveablePrimaryDelayInjector(PrimaryDelayInjector, ABC):
     def __init__(
         self,
         log: bool = False,
+        log_file: Optional[str] = None,
+        log_chunk_size: int = 65536,
         **kwargs,
     ):
         self.log = log
+        self.delay_log: Optional[DelayLogWriter] = None
         if log:
-            self.injected_delay: Dict[str, float] = {}
+            if log_file is not None:
+                self.delay_log = DelayLogWriter(log_file, log_chunk_size)
+            else:
+                self.injected_delay: Dict[str, float] = {}
 
     @abstractmethod
-    def _draw_delay(self, task: Task) -> timedelta:
+    def _draw_delay(self, task: Task) -> float:
         pass
 
-    def inject_delay(self, task: Task) -> timedelta:
+    def inject_delay(self, task: Task) -> float:
         delay = self._draw_delay(task)
-        if self.log and delay.seconds > 0:
-            self.injected_delay[task.task_id] = delay.seconds
+        if self.log and delay > 0:
+            if self.delay_log is not None:
+                self.delay_log.append(task.task_id, delay)
+            else:
+                self.injected_delay[task.task_id] = delay
         return delay
 
+    def get_state(self) -> Any:
+        # streamed delay logs stay with the process that wrote them
+        if self.log and self.delay_log is None:
+            return dict(self.injected_delay)
+        return None
+
+    def set_state(self, state: Any):
+        if state is not None:
+            self.injected_delay = dict(state)
+
     def save_injected_delay(self, csv_file: str):
-        if self.log:
+        if self.delay_log is not None:
+            # streamed delays are already on disk, only pending entries remain
+            self.delay_log.close()
+        elif self.log:
             df = pd.DataFrame(
                 list(self.injected_delay.items()), columns=["task_id", "delay_seconds"]
             )
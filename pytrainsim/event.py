@@ -1,19 +1,18 @@
 from __future__ import annotations
-from datetime import datetime
-import logging
+from datetime import datetime, timedelta
 
 from pytrainsim.task import Task
 from abc import ABC, abstractmethod
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from pytrainsim.simulation import Simulation
 
-logger = logging.getLogger(__name__)
-
 
 class Event(ABC):
+    __slots__ = ("simulation", "time", "task")
+
     def __init__(self, simulation: Simulation, time: datetime, task: Task):
         self.simulation = simulation
         self.time = time
@@ -22,12 +21,9 @@ class Event(ABC):
     def __lt__(self, other: "Event") -> bool:
         return self.time < other.time
 
-    def log_event(self, message: str, level=logging.DEBUG):
-        log_message = f"Time {self.time}: {message}"
-        logger.log(level, log_message)
-
     def reschedule(self):
         self.time = self.simulation.current_time
+        self.simulation.reschedules += 1
         self.simulation.schedule_event(self)
 
     @abstractmethod
@@ -45,6 +41,8 @@ class StartEvent(Event):
     - task (Task): The task associated with the event.
     """
 
+    __slots__ = ()
+
     def __init__(self, simulation: Simulation, time: datetime, task: Task):
         self.simulation = simulation
         self.time = time
@@ -58,15 +56,21 @@ class StartEvent(Event):
             )
 
             delay = self.simulation.delay_injector.inject_delay(self.task)
-            completion_time += delay
+            if delay:
+                completion_time += timedelta(seconds=delay)
 
             self.task.reserve_infra(self.simulation.current_time)
             self.task.start(self.time)
+            observer = self.simulation.observer
+            if observer is not None:
+                observer.task_started(self.time, self.task)
             self.simulation.schedule_event(
                 AttemptEnd(self.simulation, completion_time, self.task)
             )
         else:
-            self.log_event(f"Infra for {self.task} not available, rescheduling Start")
+            observer = self.simulation.observer
+            if observer is not None:
+                observer.task_blocked(self.simulation.current_time, self.task, self.task)
             self.task.register_infra_free_callback(self.reschedule)
 
 
@@ -89,6 +93,8 @@ class AttemptEnd(Event):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, simulation: Simulation, time: datetime, task: Task):
         self.simulation = simulation
         self.time = time
@@ -103,10 +109,13 @@ class AttemptEnd(Event):
         reserves the next task's infrastructure, advances the train, and schedules an AttemptEnd event.
         If the next task's infrastructure is not available, schedules an AttemptEnd event with a delay of 1 time unit.
         """
+        observer = self.simulation.observer
         next_task = self.task.train.peek_next_task()
         if not next_task:
             self.task.complete(self.time)
             self.task.release_infra(self.simulation.current_time)
+            if observer is not None:
+                observer.task_completed(self.time, self.task)
             return
 
         if next_task.infra_available():
@@ -116,6 +125,9 @@ class AttemptEnd(Event):
             next_task.reserve_infra(self.simulation.current_time)
             self.task.train.advance()
             next_task.start(self.time)
+            if observer is not None:
+                observer.task_completed(self.time, self.task)
+                observer.task_started(self.time, next_task)
 
             next_task_completion_time = max(
                 next_task.scheduled_completion_time(),
@@ -123,7 +135,8 @@ class AttemptEnd(Event):
             )
 
             delay = self.simulation.delay_injector.inject_delay(next_task)
-            next_task_completion_time += delay
+            if delay:
+                next_task_completion_time += timedelta(seconds=delay)
 
             event = AttemptEnd(
                 self.simulation,
@@ -133,9 +146,26 @@ class AttemptEnd(Event):
 
             self.simulation.schedule_event(event)
         else:
-            self.task.log_task_event(
-                self.simulation.current_time,
-                f"Completion Blocked: Infra for {next_task} not available, rescheduling AttemptEnd",
-            )
-
+            if observer is not None:
+                observer.task_blocked(self.simulation.current_time, self.task, next_task)
             next_task.register_infra_free_callback(self.reschedule)
+
+
+class AdmitEvent(Event):
+    """
+    Calls `admit` at the given time. Used to add trains to the simulation
+    while it is running; the event has no task.
+    """
+
+    __slots__ = ("admit",)
+
+    def __init__(
+        self, simulation: Simulation, time: datetime, admit: Callable[[], None]
+    ):
+        self.simulation = simulation
+        self.time = time
+        self.task = None  # type: ignore[assignment]
+        self.admit = admit
+
+    def execute(self):
+        self.admit()
@@ -0,0 +1,58 @@
+from typing import Dict, List, Optional
+
+
+class IdRegistry:
+    """
+    Assigns integer ids to names.
+
+    A name always gets the same id, so OCPs and tracks of a network that is
+    loaded again keep their ids. Objects that are identified by another
+    object, such as track sections by their track, are not registered but
+    get an id from `derived_id`.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+
+    def intern(self, name: str) -> int:
+        uid = self._ids.get(name)
+        if uid is None:
+            uid = self.new_id()
+            self._ids[name] = uid
+            self._names[uid] = name
+        return uid
+
+    def new_id(self) -> int:
+        self._names.append(None)
+        return len(self._names) - 1
+
+    def get(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def name(self, uid: int) -> Optional[str]:
+        """Returns the name of the id or None if it is anonymous."""
+        return self._names[uid]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def reset(self):
+        """Forgets all names, so ids are assigned from 0 again."""
+        self._ids = {}
+        self._names = []
+
+
+def derived_id(parent: int, idx: int) -> int:
+    """
+    Returns a negative id unique to (parent, idx) for non-negative parent ids
+    and indices, so it never collides with ids of a registry. The id is
+    never -1, which Python hashes like -2.
+    """
+    # Szudzik's pairing function
+    paired = parent * parent + parent + idx if parent >= idx else parent + idx * idx
+    return -2 - paired
+
+
+# ids of OCPs and tracks
+infrastructure_ids = IdRegistry()
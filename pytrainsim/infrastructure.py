@@ -6,16 +6,40 @@ from typing import Callable, Dict, List, Optional, Set, Tuple
 import heapq
 from typing import TypeVar, Generic
 
+from pytrainsim.ids import infrastructure_ids
 from pytrainsim.reservationRecorder import ReservationRecorder
 
 
 class InfrastructureElement(ABC):
+    # subclasses store the name or derive it
+    __slots__ = (
+        "uid",
+        "_capacity",
+        "_occupied",
+        "_callbacks",
+        "record_reservations",
+        "reservation_recorder",
+    )
+
+    name: str
+
     record_reservations_default: bool = True
 
     def __init__(
-        self, name: str, capacity: int = -1, record_reservations: Optional[bool] = None
+        self,
+        name: Optional[str],
+        capacity: int = -1,
+        record_reservations: Optional[bool] = None,
+        uid: Optional[int] = None,
     ):
-        self.name = name
+        # elements without a name derive it, e.g. track sections from their track
+        if name is not None:
+            self.name = name
+        # elements without a given id are registered by name
+        if uid is None:
+            assert name is not None
+            uid = infrastructure_ids.intern(name)
+        self.uid = uid
         self._capacity = capacity
         self._occupied: int = 0
         self._callbacks: List[Callable] = []
@@ -76,11 +100,14 @@ class InfrastructureElement(ABC):
             callback()
 
     def __hash__(self) -> int:
-        return hash(self.name)
+        return self.uid
 
 
 T = TypeVar("T", bound="Track")
 
+# precomputed paths: (start OCP name, end OCP name) -> names of the tracks
+PathMap = Dict[Tuple[str, str], List[str]]
+
 
 class GeoPoint:
     def __init__(self, lat: float, lon: float):
@@ -92,6 +119,8 @@ class GeoPoint:
 
 
 class OCP(InfrastructureElement, Generic[T]):
+    __slots__ = ("name", "outgoing_tracks", "geo")
+
     def __init__(self, name: str, geo_point: Optional[GeoPoint] = None):
         super().__init__(name=name, record_reservations=False)
         self.outgoing_tracks: Set[T] = set()
@@ -99,6 +128,8 @@ class OCP(InfrastructureElement, Generic[T]):
 
 
 class Track(InfrastructureElement):
+    __slots__ = ("name", "length", "start", "end")
+
     def __init__(
         self,
         length: int,
@@ -115,9 +146,6 @@ class Track(InfrastructureElement):
 
         start.outgoing_tracks.add(self)
 
-    def __hash__(self) -> int:
-        return hash(self.name)
-
     def __lt__(self, other: Track) -> bool:
         return self.length < other.length
 
@@ -185,6 +213,19 @@ class Network(Generic[T]):
 
         return []
 
+    def find_path(
+        self, start: OCP[T], end: OCP[T], paths: Optional[PathMap] = None
+    ) -> List[T]:
+        """
+        Returns the path from `paths` if it was precomputed for start and end,
+        otherwise the shortest path.
+        """
+        if paths is not None:
+            names = paths.get((start.name, end.name))
+            if names is not None:
+                return [self.tracks[name] for name in names]
+        return self.shortest_path(start, end)
+
     def reset(self):
         for ocp in self.ocps.values():
             ocp.reset()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator, Sequence
+
+from pytrainsim.task import Task
+
+
+class LazyTaskList(Sequence[Task]):
+    """
+    Task list that creates tasks on first access instead of holding all tasks
+    of a train from the start.
+
+    `factory(tasklist, idx)` creates the task at position idx. Created tasks
+    are cached, so repeated access returns the same object, until
+    `release_before` drops the tasks the train has already passed.
+    """
+
+    def __init__(self, length: int, factory: Callable[[LazyTaskList, int], Task]):
+        self._length = length
+        self._factory = factory
+        self._tasks: Dict[int, Task] = {}
+        self._first = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, idx: int) -> Task:  # type: ignore[override]
+        if idx < 0:
+            idx += self._length
+        task = self._tasks.get(idx)
+        if task is None:
+            if not 0 <= idx < self._length:
+                raise IndexError("task index out of range")
+            task = self._factory(self, idx)
+            self._tasks[idx] = task
+        return task
+
+    def __iter__(self) -> Iterator[Task]:
+        for idx in range(self._length):
+            yield self[idx]
+
+    def release_before(self, idx: int) -> None:
+        """Drops the cached tasks before idx."""
+        for i in range(self._first, idx):
+            self._tasks.pop(i, None)
+        self._first = max(self._first, idx)
+
+    def materialized(self) -> int:
+        """Returns the number of tasks currently held."""
+        return len(self._tasks)
+
+    def reset(self) -> None:
+        self._tasks = {}
+        self._first = 0
@@ -1,30 +1,49 @@
 import logging
 import sys
+from typing import List
+
+# handlers added by setup_logging
+_handlers: List[logging.Handler] = []
 
 
 def setup_logging(
     log_file="app.log",
     console_log_level=None,
-    file_log_level=logging.DEBUG,
+    file_log_level=logging.INFO,
 ):
-    if len(logging.getLogger().handlers) == 0:
-        root_logger = logging.getLogger()
-        root_logger.setLevel(file_log_level)
-
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(file_log_level)
-        file_format = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        file_handler.setFormatter(file_format)
-
-        root_logger.addHandler(file_handler)
-
-        if console_log_level:
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(console_log_level)
-            console_format = logging.Formatter("%(message)s")
-            console_handler.setFormatter(console_format)
-            root_logger.addHandler(console_handler)
-
-        root_logger.info("Logging setup complete.")
+    """
+    Logs to `log_file` and, with `console_log_level`, to stdout. Calling it
+    again, e.g. for the next experiment in the same process, replaces the
+    handlers added before; a root logger configured elsewhere is left as is.
+    """
+    root_logger = logging.getLogger()
+    installed = [h for h in _handlers if h in root_logger.handlers]
+    if root_logger.handlers and not installed:
+        return
+
+    for handler in _handlers:
+        root_logger.removeHandler(handler)
+        handler.close()
+    _handlers.clear()
+
+    root_logger.setLevel(file_log_level)
+
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(file_log_level)
+    file_format = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    file_handler.setFormatter(file_format)
+    _handlers.append(file_handler)
+
+    if console_log_level:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(console_log_level)
+        console_format = logging.Formatter("%(message)s")
+        console_handler.setFormatter(console_format)
+        _handlers.append(console_handler)
+
+    for handler in _handlers:
+        root_logger.addHandler(handler)
+
+    root_logger.info("Logging setup complete.")
@@ -0,0 +1,103 @@
+"""
+Builds the schedules of many trainparts in a process pool.
+
+Workers build each schedule from the timetable and search the paths between
+its OCPs. They only return plain data: the schedule entries and the names of
+the tracks on each path. The tasks are then created serially in the parent
+process against its own network objects, e.g. with
+`MBScheduleTransformer.assign_to_train(schedule, train, network, paths=paths)`,
+so the speedup of the setup phase is bounded by the share of this step, see
+`python -m benchmarks.setup_phase`.
+"""
+
+import multiprocessing
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pytrainsim.infrastructure import Network, PathMap
+from pytrainsim.schedule import Schedule, ScheduleBuilder, TrackEntry
+
+ScheduleResult = Tuple[str, Optional[Schedule], PathMap, Optional[str]]
+
+_df: Optional[pd.DataFrame] = None
+_network: Optional[Network] = None
+_direct_tracks_first = False
+
+
+def _init_worker(df: pd.DataFrame, network: Network, direct_tracks_first: bool):
+    global _df, _network, _direct_tracks_first
+    _df = df
+    _network = network
+    _direct_tracks_first = direct_tracks_first
+
+
+def find_paths(
+    schedule: Schedule, network: Network, direct_tracks_first: bool = False
+) -> PathMap:
+    """
+    Searches the path between the OCPs of each track entry of the schedule.
+
+    With `direct_tracks_first`, entries connected by a single track are
+    skipped, as the fixed block transformer uses that track directly.
+    """
+    paths: PathMap = {}
+    for entry in schedule.entries():
+        if not isinstance(entry, TrackEntry):
+            continue
+        key = (entry.ocp_from, entry.ocp_to)
+        if key in paths:
+            continue
+        if direct_tracks_first and network.get_track_by_ocp_names(*key):
+            continue
+        start = network.get_ocp(entry.ocp_from)
+        end = network.get_ocp(entry.ocp_to)
+        # missing OCPs are reported by the transformer
+        if start is None or end is None:
+            continue
+        paths[key] = [track.name for track in network.shortest_path(start, end)]
+    return paths
+
+
+def _build(task: Tuple[str, np.ndarray]):
+    assert _df is not None and _network is not None
+    trainpart_id, rows = task
+    try:
+        schedule = ScheduleBuilder().from_df(_df.iloc[rows]).build()
+        paths = find_paths(schedule, _network, _direct_tracks_first)
+        # unlinked, so long schedules are pickled without deep recursion
+        return trainpart_id, schedule.unlink(), paths, None
+    except Exception as e:
+        return trainpart_id, None, {}, str(e)
+
+
+def build_schedules(
+    df: pd.DataFrame,
+    trainpart_ids: List[str],
+    network: Network,
+    workers: int,
+    direct_tracks_first: bool = False,
+) -> Iterator[ScheduleResult]:
+    """
+    Yields `(trainpart_id, schedule, paths, error)` for the trainparts in the
+    given order. If the schedule could not be built, it is None and `error`
+    holds the message.
+    """
+    keys = df["trainpart_id"].astype(str)
+    rows = keys.groupby(keys).indices
+    tasks = [(trainpart_id, rows[trainpart_id]) for trainpart_id in trainpart_ids]
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    # forked workers inherit the timetable and network instead of unpickling them
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    with context.Pool(
+        workers, _init_worker, (df, network, direct_tracks_first)
+    ) as pool:
+        for trainpart_id, entries, paths, error in pool.imap(_build, tasks, chunksize):
+            schedule = None if entries is None else Schedule.relink(entries)
+            yield trainpart_id, schedule, paths, error
@@ -0,0 +1,130 @@
+import csv
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Returns the peak resident set size of the process so far, or None if the
+    platform does not report it.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def current_rss_mb() -> Optional[float]:
+    """Returns the current resident set size, or the peak where unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+class PhaseProfiler:
+    """
+    Records wall time, CPU time and memory of named phases.
+
+    `peak_rss_mb` is the peak of the process up to the end of the phase, so
+    it only grows; a phase that raised it is the one that needed more memory
+    than all before. With `trace_memory`, tracemalloc additionally records
+    the peak of Python allocations within each phase, which slows the
+    process down considerably.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.current: Optional[str] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self.current = name
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.phases.setdefault(
+                name, {"wall_seconds": 0.0, "cpu_seconds": 0.0}
+            )
+            stats["wall_seconds"] += time.perf_counter() - wall_start
+            stats["cpu_seconds"] += time.process_time() - cpu_start
+            stats["peak_rss_mb"] = peak_rss_mb()
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                stats["peak_traced_mb"] = max(stats.get("peak_traced_mb", 0), peak)
+            self.current = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return self.phases
+
+    def close(self):
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class ResourceSampler:
+    """
+    Writes the current phase, CPU time and memory of the process to a CSV
+    file every `interval` seconds from a background thread.
+    """
+
+    def __init__(self, path: str, interval: float, profiler: PhaseProfiler):
+        self.path = path
+        self.interval = interval
+        self.profiler = profiler
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def start(self):
+        self._start = time.perf_counter()
+        self._thread.start()
+
+    def _sample(self):
+        with open(self.path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["seconds", "phase", "cpu_seconds", "rss_mb", "traced_mb"]
+            )
+            while True:
+                traced = (
+                    tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+                    if tracemalloc.is_tracing()
+                    else ""
+                )
+                rss = current_rss_mb()
+                writer.writerow(
+                    [
+                        round(time.perf_counter() - self._start, 3),
+                        self.profiler.current or "",
+                        round(time.process_time(), 3),
+                        "" if rss is None else round(rss, 1),
+                        traced if traced == "" else round(traced, 1),
+                    ]
+                )
+                f.flush()
+                if self._stop.wait(self.interval):
+                    break
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
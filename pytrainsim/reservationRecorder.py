@@ -11,6 +11,8 @@ class ReservationLogEntry:
 
 
 class ReservationRecorder:
+    __slots__ = ("reservation_logs",)
+
     def __init__(self):
         self.reservation_logs: Dict[str, List[ReservationLogEntry]] = {}
 
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, List, Union
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Union
 import pandas as pd
 
+from pytrainsim.lazyTaskList import LazyTaskList
 from pytrainsim.task import Task
 
+if TYPE_CHECKING:
+    from pytrainsim.infrastructure import InfrastructureElement
+    from pytrainsim.trace import SimulationObserver
+
 
 @dataclass
 class ArrivalLogEntry:
@@ -35,11 +40,13 @@ class Train:
         self.train_name = train_name
         self.train_category = train_category
         self.previous_trainparts = previous_trainparts
-        self.tasklist: List[Task] = []
+        self.tasklist: Sequence[Task] = []
         self.current_task_index = 0
         self.traversal_logs = []
         self.on_finished_callbacks: List[Callable] = []
         self.finished = False
+        # notified of reservations, set by the simulation
+        self.observer: Optional[SimulationObserver] = None
 
     def current_task(self) -> Task:
         return self.tasklist[self.current_task_index]
@@ -51,6 +58,8 @@ class Train:
 
     def advance(self) -> None:
         self.current_task_index += 1
+        if isinstance(self.tasklist, LazyTaskList):
+            self.tasklist.release_before(self.current_task_index)
 
     def finish(self) -> None:
         self.finished = True
@@ -64,6 +73,22 @@ class Train:
         else:
             self.on_finished_callbacks.append(callback)
 
+    def reserve(
+        self, element: InfrastructureElement, simulation_time: datetime
+    ) -> bool:
+        """Reserves the element for this train and notifies the observer."""
+        if not element.reserve(self.train_name, simulation_time):
+            return False
+        if self.observer is not None:
+            self.observer.infra_reserved(simulation_time, self.train_name, element)
+        return True
+
+    def release(self, element: InfrastructureElement, simulation_time: datetime):
+        """Releases the element reserved by this train and notifies the observer."""
+        element.release(self.train_name, simulation_time)
+        if self.observer is not None:
+            self.observer.infra_released(simulation_time, self.train_name, element)
+
     def log_arrival(self, entry_data: ArrivalLogEntry):
         """
         Logs the arrival information of a train.
@@ -130,6 +155,14 @@ class Train:
     def reset(self) -> None:
         """Resets the train to its initial state."""
         self.current_task_index = 0
+        if isinstance(self.tasklist, LazyTaskList):
+            self.tasklist.reset()
         self.traversal_logs = []
         self.on_finished_callbacks = []
         self.finished = False
+
+    def __getstate__(self) -> dict:
+        # observers, e.g. trace writers, are not part of snapshots
+        state = self.__dict__.copy()
+        state["observer"] = None
+        return state
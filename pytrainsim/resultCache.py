@@ -0,0 +1,148 @@
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional
+
+# config entries that do not change the results of an experiment
+IGNORED_CONFIG_KEYS = {
+    "general": ["name", "description", "git_commit"],
+    "logging": ["console_log_level", "file_log_level"],
+}
+IGNORED_SECTIONS = ["cache"]
+
+COMPLETE_MARKER = "cache_key.json"
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _input_files(value: Any) -> List[str]:
+    """Returns all strings in the config that are paths of existing files."""
+    if isinstance(value, dict):
+        return [path for item in value.values() for path in _input_files(item)]
+    if isinstance(value, list):
+        return [path for item in value for path in _input_files(item)]
+    if isinstance(value, str) and os.path.isfile(value):
+        return [value]
+    return []
+
+
+def normalize_config(config: Dict) -> Dict:
+    normalized = copy.deepcopy(config)
+    for section in IGNORED_SECTIONS:
+        normalized.pop(section, None)
+    for section, keys in IGNORED_CONFIG_KEYS.items():
+        for key in keys:
+            normalized.get(section, {}).pop(key, None)
+    return normalized
+
+
+def cache_key_inputs(config: Dict, code_version: str) -> Dict:
+    """
+    Returns everything the cache key is computed from: the normalized
+    config, the digests of the input files it references and the version
+    of the code.
+    """
+    return {
+        "config": normalize_config(config),
+        "inputs": {
+            path: file_digest(path) for path in sorted(set(_input_files(config)))
+        },
+        "code": code_version,
+    }
+
+
+def cache_key(key_inputs: Dict) -> str:
+    data = json.dumps(key_inputs, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def unseeded_random_delay(delay_config: Dict) -> bool:
+    """
+    Returns whether the delay of the `[delay]` section is drawn at random
+    without a seed, so runs with the same config differ. Normal and Pareto
+    delays have no seed; empirical delays are reproducible with `seed`.
+    """
+    delay_type = delay_config.get("type", "normal")
+    probability = delay_config.get("probability", 0)
+    if delay_type == "normal":
+        # a probability of one without spread always injects the mean
+        return probability > 0 and (probability < 1 or delay_config.get("std", 0) > 0)
+    if delay_type == "pareto":
+        return probability > 0
+    if delay_type == "empirical":
+        return delay_config.get("seed") is None
+    if delay_type == "ensemble":
+        return any(
+            unseeded_random_delay(value)
+            for value in delay_config.values()
+            if isinstance(value, dict)
+        )
+    return False
+
+
+class ResultCache:
+    """
+    Stores the result files of experiments in `folder/<key>`. An entry is
+    only used once it is complete: files are collected in a temporary folder
+    that is renamed to the key as the last step. Files are copied in both
+    directions, so changing a result file never changes the cache.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.folder, key)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.path(key)
+        if os.path.exists(os.path.join(path, COMPLETE_MARKER)):
+            return path
+        return None
+
+    def store(
+        self,
+        key: str,
+        key_inputs: Dict,
+        result_folder: str,
+        exclude: Iterable[str] = (),
+    ):
+        if self.get(key) is not None:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f".{key}-", dir=self.folder)
+        for name in os.listdir(result_folder):
+            src = os.path.join(result_folder, name)
+            if name in exclude or not os.path.isfile(src):
+                continue
+            shutil.copy2(src, os.path.join(tmp, name))
+        with open(os.path.join(tmp, COMPLETE_MARKER), "w") as f:
+            json.dump(key_inputs, f, indent=4, sort_keys=True, default=str)
+        try:
+            os.rename(tmp, self.path(key))
+        except OSError:
+            # stored by a concurrent run in the meantime
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def restore(self, key: str, result_folder: str) -> List[str]:
+        """Copies the cached files into the result folder and returns their names."""
+        path = self.path(key)
+        restored = []
+        for name in os.listdir(path):
+            if name == COMPLETE_MARKER:
+                continue
+            dst = os.path.join(result_folder, name)
+            if os.path.exists(dst):
+                continue
+            shutil.copy2(os.path.join(path, name), dst)
+            restored.append(name)
+        return restored
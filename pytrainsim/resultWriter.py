@@ -0,0 +1,183 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# column types of the result tables for typed formats: timestamps, strings
+# and dictionary encoded strings for ids that repeat in many rows
+RESULT_COLUMNS = {
+    "arrival_task_id": "string",
+    "departure_task_id": "string",
+    "trainpart_id": "dictionary",
+    "OCP": "dictionary",
+    "scheduled_arrival": "timestamp",
+    "simulated_arrival": "timestamp",
+    "scheduled_departure": "timestamp",
+    "simulated_departure": "timestamp",
+}
+
+TRACK_RESERVATION_COLUMNS = {
+    "trainpart_id": "dictionary",
+    "start_time": "timestamp",
+    "end_time": "timestamp",
+    "track": "dictionary",
+    "section": "dictionary",
+}
+
+
+class ResultWriter(ABC):
+    """Writes simulation results incrementally, e.g. per finished train."""
+
+    @abstractmethod
+    def write(self, df: pd.DataFrame):
+        pass
+
+    def close(self):
+        pass
+
+
+class CSVResultWriter(ResultWriter):
+    """
+    Appends DataFrames to a CSV file. The header is taken from the first
+    non-empty DataFrame; later DataFrames must have the same columns. If no
+    rows are written, `close` writes only a header: the columns of the
+    written empty DataFrames, or else `columns`.
+    """
+
+    def __init__(self, path: str, columns: Optional[List[str]] = None):
+        self.path = path
+        self._columns: Optional[List[str]] = None
+        self._empty_columns = columns
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            if len(df.columns):
+                self._empty_columns = list(df.columns)
+            return
+        if self._columns is None:
+            self._columns = list(df.columns)
+            df.to_csv(self.path, index=False)
+        else:
+            df[self._columns].to_csv(self.path, mode="a", header=False, index=False)
+
+    def close(self):
+        if self._columns is None:
+            pd.DataFrame(columns=self._empty_columns or []).to_csv(
+                self.path, index=False
+            )
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Writes DataFrames to a Parquet file in row groups of about
+    `row_group_size` rows. Columns listed in `columns` are stored with the
+    given type (see RESULT_COLUMNS); the types of other columns are inferred
+    from the first non-empty DataFrame. If no rows are written, `close`
+    writes an empty file with the columns in `columns`. Requires `pyarrow`.
+    """
+
+    def __init__(
+        self, path: str, columns: Dict[str, str], row_group_size: int = 65536
+    ):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.columns = columns
+        self.row_group_size = row_group_size
+
+        self._types = {
+            "string": pa.string(),
+            "dictionary": pa.dictionary(pa.int32(), pa.string()),
+            "timestamp": pa.timestamp("us"),
+        }
+        self._schema = None
+        self._writer = None
+        self._buffer: List = []
+        self._buffered_rows = 0
+
+    def _create_schema(self, df: pd.DataFrame):
+        pa = self._pa
+        inferred = pa.Schema.from_pandas(df, preserve_index=False)
+        return pa.schema(
+            [
+                (
+                    (name, self._types[self.columns[name]])
+                    if name in self.columns
+                    else inferred.field(name)
+                )
+                for name in df.columns
+            ]
+        )
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        if self._schema is None:
+            self._schema = self._create_schema(df)
+            self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        self._buffer.append(
+            self._pa.Table.from_pandas(
+                df[self._schema.names], schema=self._schema, preserve_index=False
+            )
+        )
+        self._buffered_rows += len(df)
+        if self._buffered_rows >= self.row_group_size:
+            self.flush(full_row_groups_only=True)
+
+    def flush(self, full_row_groups_only: bool = False):
+        """Writes the buffered rows, or only whole row groups of them."""
+        if not self._buffer:
+            return
+        table = self._pa.concat_tables(self._buffer)
+        n = len(table)
+        if full_row_groups_only:
+            n -= n % self.row_group_size
+        for offset in range(0, n, self.row_group_size):
+            self._writer.write_table(  # type: ignore[union-attr]
+                table.slice(offset, min(self.row_group_size, n - offset))
+            )
+        rest = table.slice(n)
+        self._buffer = [rest] if len(rest) else []
+        self._buffered_rows = len(rest)
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        elif self._schema is None:
+            schema = self._pa.schema(
+                [(name, self._types[type_]) for name, type_ in self.columns.items()]
+            )
+            self._pq.write_table(schema.empty_table(), self.path)
+            self._schema = schema
+
+
+def create_result_writer(
+    result_folder: str, name: str, columns: Dict[str, str], output_format: str = "csv"
+) -> ResultWriter:
+    """Creates a writer for `name.csv` or `name.parquet` in the result folder."""
+    if output_format == "csv":
+        return CSVResultWriter(f"{result_folder}/{name}.csv", list(columns))
+    if output_format == "parquet":
+        return ParquetResultWriter(f"{result_folder}/{name}.parquet", columns)
+    raise ValueError(f"Invalid output format: {output_format}")
+
+
+def read_results(path: str) -> pd.DataFrame:
+    """
+    Reads a result table written as CSV or Parquet with parsed timestamp
+    columns. Dictionary encoded columns of Parquet files are categoricals.
+    """
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    df = pd.read_csv(path)
+    for name, column_type in {**RESULT_COLUMNS, **TRACK_RESERVATION_COLUMNS}.items():
+        if column_type == "timestamp" and name in df.columns:
+            # microseconds as in Parquet; moving block results contain
+            # datetime.min, which is out of range for nanoseconds
+            df[name] = df[name].astype("datetime64[us]")
+    return df
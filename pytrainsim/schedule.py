@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import List, Optional, Union
 import warnings
 import pandas as pd
 
@@ -50,6 +50,32 @@ class Schedule:
                 current = current.next_entry
         return "\n".join(result)
 
+    def entries(self) -> List[Union[OCPEntry, TrackEntry]]:
+        result = []
+        current: Optional[Union[OCPEntry, TrackEntry]] = self.head
+        while current:
+            result.append(current)
+            current = current.next_entry
+        return result
+
+    def unlink(self) -> List[Union[OCPEntry, TrackEntry]]:
+        """
+        Returns the entries with their links removed, e.g. to pickle long
+        schedules without deep recursion. `relink` restores the schedule.
+        """
+        entries = self.entries()
+        for entry in entries:
+            entry.next_entry = None
+        return entries
+
+    @staticmethod
+    def relink(entries: List[Union[OCPEntry, TrackEntry]]) -> Schedule:
+        for entry, next_entry in zip(entries, entries[1:]):
+            entry.next_entry = next_entry  # type: ignore[assignment]
+        if not entries:
+            return Schedule()
+        return Schedule(entries[0], entries[-1])  # type: ignore[arg-type]
+
 
 class ScheduleBuilder:
     def __init__(self):
@@ -76,11 +102,13 @@ class ScheduleBuilder:
         return self
 
     def from_df(self, df: pd.DataFrame) -> ScheduleBuilder:
-        # Ensure 'stop' column exists and is of boolean type; use numpy directly
-        if "stop" not in df.columns:
-            stops = (df["scheduled_arrival"] != df["scheduled_departure"]).values
-        else:
-            stops = df["stop"].astype(bool).values
+        # Rows without a stop flag stop if they depart after their arrival
+        stops = (df["scheduled_arrival"] != df["scheduled_departure"]).values
+        if "stop" in df.columns:
+            given = df["stop"].to_numpy(dtype=object)
+            missing = pd.isna(given)
+            given[missing] = stops[missing]
+            stops = given.astype(bool)
 
         # first OCP is always a stop (required for simulation)
         stops[0] = True
@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import Dict, List
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_COLUMNS = ["scheduled_arrival", "scheduled_departure"]
+CATEGORICAL_COLUMNS = ["trainpart_id", "db640_code"]
+
+# durations may be missing for the first OCP of a trainpart, so they are
+# floats; float32 holds whole seconds exactly
+SCHEDULE_DTYPES: Dict[str, str] = {
+    "trainpart_id": "category",
+    "db640_code": "category",
+    "arrival_id": "object",
+    "stop_id": "object",
+    "stop_duration": "float32",
+    "run_duration": "float32",
+    "scheduled_arrival": "object",
+    "scheduled_departure": "object",
+    "stop": "boolean",
+}
+
+
+def read_schedule_csv(
+    path: str,
+    timestamp_format: str = "%Y-%m-%d %H:%M:%S",
+    chunk_size: int = 500_000,
+) -> pd.DataFrame:
+    """
+    Reads a train schedule CSV in chunks with declared dtypes: trainpart ids
+    and OCP codes are categoricals, durations float32 and timestamps are
+    parsed with `timestamp_format` per chunk.
+    """
+    chunks: List[pd.DataFrame] = []
+    for chunk in pd.read_csv(path, dtype=SCHEDULE_DTYPES, chunksize=chunk_size):
+        for column in TIMESTAMP_COLUMNS:
+            chunk[column] = pd.to_datetime(chunk[column], format=timestamp_format)
+        chunks.append(chunk)
+
+    if not chunks:
+        return pd.read_csv(path, dtype=SCHEDULE_DTYPES)
+
+    columns = list(chunks[0].columns)
+    categoricals = {
+        column: union_categoricals(
+            [chunk[column] for chunk in chunks], sort_categories=True
+        )
+        for column in CATEGORICAL_COLUMNS
+        if column in columns
+    }
+    df = pd.concat(
+        [chunk.drop(columns=list(categoricals)) for chunk in chunks],
+        ignore_index=True,
+    )
+    for column, values in categoricals.items():
+        df[column] = values
+    return df[columns]
+
+
+def load_schedule(
+    path: str,
+    cache: bool = False,
+    timestamp_format: str = "%Y-%m-%d %H:%M:%S",
+    chunk_size: int = 500_000,
+) -> pd.DataFrame:
+    """
+    Loads a train schedule with `read_schedule_csv`.
+
+    With `cache`, the typed schedule is stored as Parquet next to the CSV
+    (`<path>.parquet`) and read from there as long as it is newer than the
+    CSV. Caching requires `pyarrow`.
+    """
+    cache_path = path + ".parquet"
+    if (
+        cache
+        and os.path.exists(cache_path)
+        and os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    ):
+        logger.info("Reading cached schedule %s", cache_path)
+        return pd.read_parquet(cache_path)
+
+    df = read_schedule_csv(path, timestamp_format, chunk_size)
+    if cache:
+        try:
+            df.to_parquet(cache_path, index=False)
+        except OSError as e:
+            logger.warning("Could not cache schedule at %s: %s", cache_path, e)
+    return df
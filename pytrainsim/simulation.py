@@ -1,10 +1,21 @@
+from collections import defaultdict
 from datetime import datetime
 from pytrainsim.infrastructure import Network
 from pytrainsim.delay.primaryDelay import PrimaryDelayInjector
 from pytrainsim.resources.train import Train
-from pytrainsim.event import StartEvent, Event
+from pytrainsim.event import AdmitEvent, StartEvent, Event
+from pytrainsim.snapshotPickler import SnapshotPickler, relink_network
+from pytrainsim.task import logger as task_logger
+from pytrainsim.trace import ObserverGroup, SimulationObserver, TaskEventLogger
 import heapq
-from typing import List
+import io
+import logging
+import pickle
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
 
 
 class Simulation:
@@ -12,6 +23,7 @@ class Simulation:
         self,
         delay_injector: PrimaryDelayInjector,
         network: Network,
+        profile: bool = False,
     ) -> None:
         self.current_time: datetime
         self.event_queue: List[Event] = []
@@ -20,13 +32,39 @@ class Simulation:
         self.network: Network = network
         self.trains: List[Train] = []
 
+        self.profile = profile
+        self.reschedules = 0
+        self.profile_stats: Dict = {}
+
+        self.observer: Optional[SimulationObserver] = None
+        # if set, finished trains are removed from `trains` and passed here
+        self.on_train_finished: Optional[Callable[[Train], None]] = None
+
+    def add_observer(self, observer: SimulationObserver) -> None:
+        """Attaches an observer that is notified of task events."""
+        if self.observer is None:
+            self.observer = observer
+        elif isinstance(self.observer, ObserverGroup):
+            self.observer.observers.append(observer)
+        else:
+            self.observer = ObserverGroup([self.observer, observer])
+        for train in self.trains:
+            train.observer = self.observer
+
     def schedule_event(self, event: Event) -> None:
         """Schedule a new event to be executed at a specific time."""
         heapq.heappush(self.event_queue, event)
 
+    def schedule_admission(self, time: datetime, admit: Callable[[], None]) -> None:
+        """Calls `admit` at the given simulation time, e.g. to schedule a train."""
+        heapq.heappush(self.event_queue, AdmitEvent(self, time, admit))
+
     def schedule_train(self, train: Train):
         """Schedules a train for simulation."""
         self.trains.append(train)
+        train.observer = self.observer
+        if self.on_train_finished is not None:
+            train.register_finished_callback(lambda: self._retire_train(train))
         first_task = train.current_task()
         event = StartEvent(
             self,
@@ -35,21 +73,153 @@ class Simulation:
         )
         heapq.heappush(self.event_queue, event)
 
-    def run(self) -> None:
-        """Run the simulation by processing events in the queue."""
-        while self.event_queue:
-            event = heapq.heappop(self.event_queue)
-            if hasattr(self, "current_time") and event.time < self.current_time:
-                raise ValueError(
-                    f"Event time {event.time} is before current time {self.current_time}: {event}, {event.task}"
-                )
-            self.current_time = event.time
+    def run(self, until: Optional[datetime] = None) -> None:
+        """
+        Run the simulation by processing events in the queue. With `until`,
+        only the events before that time are processed; calling `run` again
+        continues from there.
+        """
+        if task_logger.isEnabledFor(logging.DEBUG) and not self._has_task_logger():
+            self.add_observer(TaskEventLogger())
+
+        if self.profile:
+            self._run_profiled(until)
+            return
+
+        event = self._next_event(until)
+        while event is not None:
+            event.execute()
+            event = self._next_event(until)
+
+    def _next_event(self, until: Optional[datetime]) -> Optional[Event]:
+        """
+        Pops the next event before `until` and advances the simulation time
+        to it, or returns None if there is none.
+        """
+        if not self.event_queue or (
+            until is not None and self.event_queue[0].time >= until
+        ):
+            return None
+        event = heapq.heappop(self.event_queue)
+        if hasattr(self, "current_time") and event.time < self.current_time:
+            raise ValueError(
+                f"Event time {event.time} is before current time {self.current_time}: {event}, {event.task}"
+            )
+        self.current_time = event.time
+        return event
+
+    def _retire_train(self, train: Train) -> None:
+        self.trains.remove(train)
+        if self.on_train_finished is not None:
+            self.on_train_finished(train)
+
+    def _has_task_logger(self) -> bool:
+        if isinstance(self.observer, ObserverGroup):
+            observers = self.observer.observers
+        else:
+            observers = [self.observer]
+        return any(isinstance(observer, TaskEventLogger) for observer in observers)
+
+    def _run_profiled(self, until: Optional[datetime] = None) -> None:
+        """
+        Runs the events like `run` while recording counts and wall time per
+        event type, added to the stats of previous runs.
+        """
+        previous = self.profile_stats
+        event_counts: Dict[str, int] = defaultdict(int, previous.get("event_counts", {}))
+        event_seconds: Dict[str, float] = defaultdict(
+            float, previous.get("event_wall_seconds", {})
+        )
+        max_queue_length = previous.get("max_queue_length", 0)
+        run_seconds = previous.get("run_wall_seconds", 0.0)
+        perf_counter = time.perf_counter
+
+        run_start = perf_counter()
+        while True:
+            queue_length = len(self.event_queue)
+            event = self._next_event(until)
+            if event is None:
+                break
+            max_queue_length = max(max_queue_length, queue_length)
+
+            event_start = perf_counter()
             event.execute()
+            event_name = event.__class__.__name__
+            event_seconds[event_name] += perf_counter() - event_start
+            event_counts[event_name] += 1
+        run_seconds += perf_counter() - run_start
+
+        events_processed = sum(event_counts.values())
+        self.profile_stats = {
+            "events_processed": events_processed,
+            "events_per_second": (
+                events_processed / run_seconds if run_seconds > 0 else 0.0
+            ),
+            "event_counts": dict(event_counts),
+            "event_wall_seconds": dict(event_seconds),
+            "max_queue_length": max_queue_length,
+            "run_wall_seconds": run_seconds,
+        }
+
+    def stats(self) -> Dict:
+        """
+        Returns the statistics of all runs since the last reset. Event counts,
+        timings and the maximum queue length are only available if profiling
+        is enabled.
+        """
+        return {"reschedules": self.reschedules, **self.profile_stats}
+
+    def snapshot(self) -> bytes:
+        """
+        Returns the complete state of the simulation: the event queue, the
+        occupancy and waiting tasks of the infrastructure, the progress of
+        the trains, the delay injector and the state of the `random` and
+        `numpy.random` generators the delay injectors draw from.
+
+        Combined with `run(until)`, a simulation can be continued from the
+        snapshot after changing it, e.g. the capacity of a track or the
+        delay injector, without simulating the time before again. Observers
+        are not part of the snapshot. Simulations that admit trains while
+        running, as with the windowed scheduler, or stream their delay log to
+        a file cannot be snapshot.
+        """
+        if self.on_train_finished is not None or any(
+            isinstance(event, AdmitEvent) for event in self.event_queue
+        ):
+            raise ValueError("Simulations admitting trains cannot be snapshot")
+        state = {
+            "simulation": self,
+            "random": random.getstate(),
+            "numpy_random": np.random.get_state(),
+        }
+        buffer = io.BytesIO()
+        SnapshotPickler(buffer).dump(state)
+        return buffer.getvalue()
+
+    @staticmethod
+    def restore(snapshot: bytes) -> "Simulation":
+        """
+        Returns the simulation of a snapshot and sets the `random` and
+        `numpy.random` generators to their state at the snapshot.
+        """
+        state = pickle.loads(snapshot)
+        random.setstate(state["random"])
+        np.random.set_state(state["numpy_random"])
+        simulation = state["simulation"]
+        relink_network(simulation.network)
+        return simulation
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state["observer"] = None
+        return state
 
     def reset(self, reset_network: bool = True) -> None:
         """Resets the simulation to its initial state."""
         self.current_time = datetime.min
         self.event_queue = []
+        self.reschedules = 0
+        self.profile_stats = {}
         for train in self.trains:
             train.reset()
         self.trains = []
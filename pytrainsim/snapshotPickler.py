@@ -0,0 +1,70 @@
+"""
+Pickles simulations for `Simulation.snapshot` with a recursion depth that
+does not grow with the length of schedules, routes or the network.
+"""
+
+import pickle
+from typing import Dict, Set
+
+from pytrainsim.MBSim.MBDriveTask import MBDriveTask
+from pytrainsim.infrastructure import OCP, Network
+from pytrainsim.schedule import OCPEntry, TrackEntry
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# attribute linking an object to the next one of a chain
+CHAIN_LINKS: Dict[type, str] = {
+    OCPEntry: "next_entry",
+    TrackEntry: "next_entry",
+    MBDriveTask: "_next",
+}
+
+
+def _create(func, args, successors):
+    # the successors are unpickled before, so the links to them resolve
+    return func(*args)
+
+
+class SnapshotPickler(pickle.Pickler):
+    """
+    Pickles the successors of a chain, e.g. the following entries of a
+    schedule, from its end before the object linking to them, so every
+    link refers to an object that is already pickled. OCPs are pickled
+    without their outgoing tracks, which link the whole network;
+    `relink_network` adds them again after unpickling.
+    """
+
+    def __init__(self, file):
+        super().__init__(file, protocol=PROTOCOL)
+        # ids of the chain members that are pickled or about to be
+        self._chained: Set[int] = set()
+
+    def reducer_override(self, obj):
+        if isinstance(obj, OCP):
+            func, args, (state, slots), *rest = obj.__reduce_ex__(PROTOCOL)
+            slots = {**slots, "outgoing_tracks": set()}
+            return (func, args, (state, slots), *rest)
+
+        link = CHAIN_LINKS.get(type(obj))
+        if link is None or id(obj) in self._chained:
+            return NotImplemented
+        self._chained.add(id(obj))
+
+        successors = []
+        successor = getattr(obj, link)
+        # lazy drive tasks link to a function creating the next task
+        while type(successor) in CHAIN_LINKS and id(successor) not in self._chained:
+            self._chained.add(id(successor))
+            successors.append(successor)
+            successor = getattr(successor, link)
+        if not successors:
+            return NotImplemented
+
+        func, args, *rest = obj.__reduce_ex__(PROTOCOL)
+        return (_create, (func, args, successors[::-1]), *rest)
+
+
+def relink_network(network: Network):
+    """Adds the tracks of the network to their start OCPs again."""
+    for track in network.tracks.values():
+        track.start.outgoing_tracks.add(track)
@@ -0,0 +1,321 @@
+"""
+Runs a sweep of experiments in worker processes.
+
+Each experiment runs in its own process, started as soon as a worker is
+free, so one long experiment does not hold back a batch of short ones. The
+experiments are started longest first by `estimate_cost`, so the longest
+ones do not start last. Experiments that fail, crash or exceed `timeout`
+are retried up to `retries` times. The state of each experiment is written
+to a JSON manifest after every change; running the sweep again with the
+same manifest skips the experiments that are already done.
+
+A single config can also describe a grid of experiments with a `[sweep]`
+section, see `expand_grid`.
+"""
+
+import copy
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+import traceback
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar, Union
+
+import toml
+from tqdm import tqdm
+
+from pytrainsim.ids import infrastructure_ids
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# relative cost per train of the simulation types
+MODEL_WEIGHTS = {"fb": 1.0, "lb": 1.5, "mb": 3.0}
+DEFAULT_SECTION_LENGTH = 500
+# tracebacks are cut to their end so they fit into the pipe to the parent
+MAX_TRACEBACK_CHARS = 16384
+
+
+def estimate_cost(config: Union[str, Dict]) -> float:
+    """
+    Estimates the relative cost of an experiment from its number of trains,
+    the size of its network file and its simulation type. Moving block
+    experiments get more expensive with shorter sections.
+    """
+    if isinstance(config, str):
+        config = toml.load(config)
+    paths = config.get("paths", {})
+
+    trains = 1
+    try:
+        with open(paths["train_meta_data"], "r") as f:
+            trains = max(len(json.load(f)), 1)
+    except (KeyError, OSError, ValueError):
+        pass
+
+    network_mb = 0.0
+    try:
+        network_mb = os.path.getsize(paths["network"]) / (1024 * 1024)
+    except (KeyError, OSError):
+        pass
+
+    simulation_type = config.get("general", {}).get("simulation_type", "fb")
+    weight = MODEL_WEIGHTS.get(simulation_type, 1.0)
+    if simulation_type == "mb":
+        section_length = config.get("mb", {}).get(
+            "section_length", DEFAULT_SECTION_LENGTH
+        )
+        weight *= DEFAULT_SECTION_LENGTH / section_length
+    return weight * trains * (1 + network_mb)
+
+
+def load_manifest(path: Optional[str]) -> Dict[str, Dict]:
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(path: Optional[str], manifest: Dict[str, Dict]):
+    if path is None:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp, path)
+
+
+def _run_child(run: Callable[[str], None], config_file: str, conn: Connection):
+    """Runs `run` in a worker and sends the traceback to the parent if it fails."""
+    try:
+        run(config_file)
+    except BaseException:
+        conn.send(traceback.format_exc()[-MAX_TRACEBACK_CHARS:])
+        raise
+    finally:
+        conn.close()
+
+
+class _Sweep:
+    """State of a running sweep: the queue, the workers and the manifest."""
+
+    def __init__(
+        self,
+        run: Callable[[str], None],
+        pending: List[str],
+        manifest: Dict[str, Dict],
+        manifest_path: Optional[str],
+        timeout: Optional[float],
+        retries: int,
+    ):
+        self.run = run
+        self.pending = pending
+        self.manifest = manifest
+        self.manifest_path = manifest_path
+        self.timeout = timeout
+        self.retries = retries
+        # sentinel -> (process, config file, start time, reader)
+        self.running: Dict[int, tuple] = {}
+        self.progress = tqdm(total=len(pending))
+
+        # forked workers start without importing the caller again
+        if "fork" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("fork")
+        else:
+            self.context = multiprocessing.get_context()
+
+    def spawn(self, workers: int):
+        """Starts the next pending experiments until `workers` are running."""
+        while self.pending and len(self.running) < workers:
+            config_file = self.pending.pop()
+            reader, writer = self.context.Pipe(duplex=False)
+            process = self.context.Process(
+                target=_run_child, args=(self.run, config_file, writer)
+            )
+            process.start()
+            writer.close()
+            entry = self.manifest[config_file]
+            entry["status"] = "running"
+            entry["attempts"] += 1
+            self.running[process.sentinel] = (
+                process,
+                config_file,
+                time.monotonic(),
+                reader,
+            )
+            save_manifest(self.manifest_path, self.manifest)
+
+    def reap(self):
+        """Waits for experiments to exit, at most until the next timeout."""
+        wait_seconds = None
+        if self.timeout is not None:
+            now = time.monotonic()
+            first_start = min(start for _, _, start, _ in self.running.values())
+            wait_seconds = max(first_start + self.timeout - now, 0)
+        for sentinel in wait(list(self.running), wait_seconds):
+            process, config_file, start, reader = self.running.pop(sentinel)
+            process.join()
+            error = error_traceback = None
+            if process.exitcode != 0:
+                error = f"exit code {process.exitcode}"
+                if reader.poll():
+                    error_traceback = reader.recv()
+                    # the last line holds the exception and its message
+                    error = error_traceback.strip().splitlines()[-1]
+            reader.close()
+            self.finish(config_file, error, time.monotonic() - start, error_traceback)
+
+    def expire(self):
+        """Terminates the experiments running longer than the timeout."""
+        if self.timeout is None:
+            return
+        now = time.monotonic()
+        for sentinel, (process, config_file, start, reader) in list(
+            self.running.items()
+        ):
+            if now - start < self.timeout:
+                continue
+            process.terminate()
+            process.join()
+            reader.close()
+            del self.running[sentinel]
+            self.finish(
+                config_file, f"timed out after {self.timeout} seconds", now - start
+            )
+
+    def finish(
+        self,
+        config_file: str,
+        error: Optional[str],
+        seconds: float,
+        error_traceback: Optional[str] = None,
+    ):
+        """Records the outcome of an attempt and queues failed ones to retry."""
+        entry = self.manifest[config_file]
+        entry["seconds"] = round(seconds, 3)
+        entry.pop("error", None)
+        entry.pop("traceback", None)
+        if error is None:
+            entry["status"] = "done"
+            self.progress.update()
+        else:
+            entry["error"] = error
+            if error_traceback is not None:
+                entry["traceback"] = error_traceback
+            if entry["attempts"] <= self.retries:
+                logger.warning("Retrying %s: %s", config_file, error)
+                entry["status"] = "pending"
+                self.pending.append(config_file)
+            else:
+                entry["status"] = "failed"
+                self.progress.update()
+        save_manifest(self.manifest_path, self.manifest)
+
+
+def run_sweep(
+    config_files: List[str],
+    run: Callable[[str], None],
+    workers: int,
+    timeout: Optional[float] = None,
+    retries: int = 0,
+    manifest_path: Optional[str] = None,
+) -> Dict[str, Dict]:
+    """
+    Calls `run` with each config file in its own process, at most `workers`
+    at a time, and returns the manifest: the status ("done" or "failed"),
+    attempts, estimated cost, duration and last error of each config file.
+    `run` signals a failure by raising; the exception is the `error` and its
+    traceback the `traceback` of the entry.
+    """
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers: {workers}")
+
+    manifest = load_manifest(manifest_path)
+    pending = []
+    for config_file in config_files:
+        entry = manifest.get(config_file)
+        if entry is not None and entry["status"] == "done":
+            continue
+        manifest[config_file] = {
+            "status": "pending",
+            "attempts": 0,
+            "cost": estimate_cost(config_file),
+        }
+        pending.append(config_file)
+    skipped = len(config_files) - len(pending)
+    if skipped:
+        logger.info("Skipping %d experiments done before", skipped)
+    # longest first; popped from the end
+    pending.sort(key=lambda config_file: manifest[config_file]["cost"])
+    save_manifest(manifest_path, manifest)
+
+    sweep = _Sweep(run, pending, manifest, manifest_path, timeout, retries)
+    while sweep.pending or sweep.running:
+        sweep.spawn(workers)
+        sweep.reap()
+        sweep.expire()
+
+    sweep.progress.close()
+    return manifest
+
+
+def expand_grid(config: Dict) -> List[Dict]:
+    """
+    Expands the `[sweep]` section of a config into one config per point of
+    the grid. Each key of the section is a dotted path into the config with
+    a list of values, e.g. `"mb.section_length" = [128, 256, 512]`; the
+    grid is the product of all lists. The name of each experiment is the
+    name of the config followed by `key=value` for each key of its point.
+    """
+    sweep = config.get("sweep", {})
+    base = {section: value for section, value in config.items() if section != "sweep"}
+    for key, values in sweep.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Sweep values of {key} must be a non-empty list")
+        if "." not in key:
+            raise ValueError(f"Sweep key {key} must be of the form section.key")
+
+    configs = []
+    for point in itertools.product(*sweep.values()):
+        expanded = copy.deepcopy(base)
+        labels = []
+        for key, value in zip(sweep, point):
+            *sections, name = key.split(".")
+            target = expanded
+            for section in sections:
+                target = target.setdefault(section, {})
+            target[name] = value
+            labels.append(f"{key}={value}")
+        if labels:
+            expanded["general"]["name"] = "-".join(
+                [expanded["general"]["name"], *labels]
+            )
+        configs.append(expanded)
+    return configs
+
+
+class SharedInputs:
+    """
+    Keeps loaded inputs, such as timetables and networks, so experiments
+    run in the same process load each input only once. Experiments that
+    share an input must not modify it, apart from state they reset.
+
+    New inputs reset the infrastructure ids, so ids do not accumulate over
+    the experiments run in one process. Networks loaded before must not be
+    extended afterwards.
+    """
+
+    def __init__(self):
+        self.inputs: Dict[Hashable, Any] = {}
+        infrastructure_ids.reset()
+
+    def get(self, key: Hashable, load: Callable[[], T]) -> T:
+        if key not in self.inputs:
+            self.inputs[key] = load()
+        else:
+            logger.info("Reusing loaded input %s", key)
+        return self.inputs[key]
@@ -5,21 +5,29 @@ from abc import ABC, abstractmethod
 
 from datetime import datetime, timedelta
 import logging
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, List
 
 if TYPE_CHECKING:
+    from pytrainsim.infrastructure import InfrastructureElement
     from pytrainsim.resources.train import Train
 
 logger = logging.getLogger(__name__)
 
 
 class Task(ABC):
+    __slots__ = ()
+
     task_id: str
 
     def log_task_event(self, timestamp: datetime, event: str):
         if logger.isEnabledFor(logging.DEBUG):
-            log_message = f"Time {timestamp.strftime('%Y-%m-%d %H:%M:%S')}: Train {self.train.train_name}, Task: {self}, Event: {event}"
-            logger.debug(log_message)
+            logger.debug(
+                "Time %s: Train %s, Task: %s, Event: %s",
+                timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                self.train.train_name,
+                self,
+                event,
+            )
 
     @abstractmethod
     def complete(self, simulation_time: datetime):
@@ -46,6 +54,10 @@ class Task(ABC):
     def release_infra(self, simulation_time: datetime) -> bool:
         pass
 
+    def infra_elements(self) -> List[InfrastructureElement]:
+        """Returns the infrastructure elements occupied while the task runs."""
+        return []
+
     @abstractmethod
     def register_infra_free_callback(self, callback: Callable[[], None]):
         pass
@@ -41,6 +41,14 @@ def mock_mb_drive_task(mock_track_entry, mock_track_section, mock_train) -> MBDr
     return MBDriveTask(mock_track_entry, mock_track_section, mock_train)
 
 
+def test_task_id(mock_track_entry, mock_mb_drive_task):
+    assert mock_mb_drive_task.task_id == "arrival_id_0"
+
+    # the arrival id is taken from the entry on creation
+    mock_track_entry.arrival_id = "other"
+    assert mock_mb_drive_task.task_id == "arrival_id_0"
+
+
 def test_no_capacity(mock_track_section, mock_mb_drive_task):
     mock_track_section.has_capacity.return_value = False
 
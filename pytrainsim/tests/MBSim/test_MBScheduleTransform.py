@@ -8,6 +8,7 @@ from pytrainsim.OCPSim.endTask import EndTask
 from pytrainsim.OCPSim.startTask import StartTask
 from pytrainsim.OCPSim.stopTask import StopTask
 from pytrainsim.infrastructure import OCP, Network
+from pytrainsim.lazyTaskList import LazyTaskList
 from pytrainsim.schedule import OCPEntry, Schedule, TrackEntry
 
 
@@ -128,3 +129,69 @@ def test_concat_drive_tasks(network: Network[MBTrack], train: MBTrain):
     assert train.tasklist[3].next_MBDriveTask == train.tasklist[4]
     assert train.tasklist[4].next_MBDriveTask == train.tasklist[5]
     assert train.tasklist[5].next_MBDriveTask is None
+
+
+def test_lazy_tasklist(network: Network[MBTrack], train: MBTrain):
+    schedule = Schedule()
+    ocpentry1 = OCPEntry("OCP1", datetime(2025, 1, 1, 9), timedelta(minutes=5), "stop1")
+    trackentry = TrackEntry(
+        "OCP1", "OCP3", datetime(2025, 1, 1, 9, 5), "1", timedelta(minutes=5)
+    )
+    ocpentry2 = OCPEntry(
+        "OCP3", datetime(2025, 1, 1, 9, 10), timedelta(minutes=5), "stop2"
+    )
+
+    schedule.head = ocpentry1
+    ocpentry1.next_entry = trackentry
+    trackentry.next_entry = ocpentry2
+    schedule.tail = ocpentry2
+
+    MBScheduleTransformer.assign_to_train(schedule, train, network, lazy=True)
+    tasklist = train.tasklist
+    assert isinstance(tasklist, LazyTaskList)
+    assert len(tasklist) == 8
+    assert tasklist.materialized() == 0
+
+    assert [type(task) for task in tasklist] == [
+        StartTask,
+        StopTask,
+        MBDriveTask,
+        MBDriveTask,
+        MBDriveTask,
+        MBDriveTask,
+        StopTask,
+        EndTask,
+    ]
+    assert [task.task_id for task in tasklist][2:6] == ["1_0_0", "1_0_1", "1_0", "1_1"]
+
+    # next tasks resolve to the tasks of the list
+    assert tasklist[2].next_MBDriveTask is tasklist[3]
+    assert tasklist[4].next_MBDriveTask is tasklist[5]
+    assert tasklist[5].next_MBDriveTask is None
+
+    for _ in range(3):
+        train.advance()
+    assert tasklist.materialized() == 5
+
+
+def test_lazy_tasklist_resolves_next_on_demand(
+    network: Network[MBTrack], train: MBTrain
+):
+    schedule = Schedule()
+    ocpentry1 = OCPEntry("OCP1", datetime(2025, 1, 1, 9), timedelta(minutes=5), "stop1")
+    trackentry = TrackEntry(
+        "OCP1", "OCP3", datetime(2025, 1, 1, 9, 5), "1", timedelta(minutes=5)
+    )
+    schedule.head = ocpentry1
+    ocpentry1.next_entry = trackentry
+    schedule.tail = trackentry
+
+    MBScheduleTransformer.assign_to_train(schedule, train, network, lazy=True)
+    tasklist = train.tasklist
+    assert isinstance(tasklist, LazyTaskList)
+
+    first_drive = tasklist[2]
+    assert tasklist.materialized() == 1
+    next_drive = first_drive.next_MBDriveTask
+    assert tasklist.materialized() == 2
+    assert next_drive is tasklist[3]
@@ -18,7 +18,7 @@ def test_single_track_single_train():
     network.add_tracks([track1])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -58,7 +58,7 @@ def test_single_track_single_train_early_arrival():
     network.add_tracks([track])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -96,7 +96,7 @@ def test_two_track_single_train():
     network.add_tracks([track1, track2])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -137,7 +137,7 @@ def test_two_track_slower_speed_single_train():
     network.add_tracks([track1, track2])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -188,7 +188,7 @@ def test_two_track_faster_speed_single_train():
     network.add_tracks([track1, track2])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -238,7 +238,7 @@ def test_single_track_two_trains():
     network.add_tracks([track])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -310,7 +310,7 @@ def test_single_track_two_train_no_block():
     network.add_tracks([track])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -382,7 +382,7 @@ def test_single_track_two_trains_late_block():
     network.add_tracks([track])
 
     delay = Mock(PrimaryDelayInjector)
-    delay.inject_delay.return_value = timedelta(0)
+    delay.inject_delay.return_value = 0
 
     sim = Simulation(delay, network)
 
@@ -481,3 +481,41 @@ def generate_schedule(
     schedule.tail = last_ocp_entry
 
     return schedule
+
+
+def run_two_trains_two_tracks(lazy: bool) -> List[MBTrain]:
+    network = Network()
+    ocps = [OCP("OCP1"), OCP("OCP2"), OCP("OCP3")]
+    network.add_ocps(ocps)
+    track1 = MBTrack(500, ocps[0], ocps[1], 1, 50, 12)
+    track2 = MBTrack(500, ocps[1], ocps[2], 1, 50, 8)
+    network.add_tracks([track1, track2])
+
+    delay = Mock(PrimaryDelayInjector)
+    delay.inject_delay.return_value = 0
+
+    sim = Simulation(delay, network)
+
+    start_datetime = datetime(2024, 1, 1, 12, 0, 0)
+    trains = []
+    for i, acceleration in enumerate([1, 2]):
+        train = MBTrain(f"Train{i}", "category", acceleration, -1, 1)
+        schedule = generate_schedule(
+            ocps[0], [track1, track2], ocps[2], start_datetime + timedelta(seconds=5 * i)
+        )
+        MBScheduleTransformer.assign_to_train(schedule, train, network, lazy)
+        sim.schedule_train(train)
+        trains.append(train)
+
+    sim.run()
+    return trains
+
+
+def test_lazy_tasklist_matches_eager():
+    eager = run_two_trains_two_tracks(lazy=False)
+    lazy = run_two_trains_two_tracks(lazy=True)
+
+    for eager_train, lazy_train in zip(eager, lazy):
+        assert lazy_train.traversal_logs == eager_train.traversal_logs
+        # only the current task is held after the train has finished
+        assert lazy_train.tasklist.materialized() == 1
@@ -0,0 +1,57 @@
+import pickle
+from unittest.mock import Mock
+
+import pytest
+
+from pytrainsim.delay.delayFactory import DelayFactory
+from pytrainsim.delay.delayLog import DelayLogWriter, read_delay_log
+from pytrainsim.delay.primaryDelay import SaveablePrimaryDelayInjector
+
+pytest.importorskip("pyarrow")
+
+
+class FixedDelayInjector(SaveablePrimaryDelayInjector):
+    def _draw_delay(self, task):
+        return 30.0
+
+
+def test_writer_flushes_in_chunks(tmp_path):
+    path = str(tmp_path / "delay.parquet")
+    writer = DelayLogWriter(path, chunk_size=2)
+    for i in range(5):
+        writer.append(f"task_{i % 2}", i)
+    writer.close()
+
+    import pyarrow.parquet as pq
+
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+    df = read_delay_log(path)
+    assert df["task_id"].tolist() == ["task_1", "task_0"]
+    assert df["delay_seconds"].tolist() == [3, 4]
+
+
+def test_append_after_close_raises(tmp_path):
+    writer = DelayLogWriter(str(tmp_path / "delay.parquet"))
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.append("task", 1)
+
+
+def test_streamed_log_replay(tmp_path):
+    path = str(tmp_path / "delay.parquet")
+    injector = FixedDelayInjector(log=True, log_file=path)
+    task = Mock()
+    task.task_id = "task_1"
+    injector.inject_delay(task)
+    injector.save_injected_delay(path)
+
+    replay = DelayFactory.create_delay({"type": "df", "path": path})
+    assert replay.inject_delay(task) == 30
+
+
+def test_writer_cannot_be_pickled(tmp_path):
+    writer = DelayLogWriter(str(tmp_path / "delay.parquet"))
+    with pytest.raises(ValueError):
+        pickle.dumps(writer)
+    writer.close()
@@ -0,0 +1,108 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pytrainsim.delay.empiricalDelay import (
+    AliasSampler,
+    EmpiricalPrimaryDelayInjector,
+)
+from pytrainsim.OCPSim.stopTask import StopTask
+from pytrainsim.OCPSim.driveTask import DriveTask
+
+
+def make_task(task_class, category: str):
+    task = Mock(spec=task_class)
+    task.task_id = "task_1"
+    task.train.train_category = category
+    return task
+
+
+def test_alias_sampler_matches_weights():
+    sampler = AliasSampler(
+        np.array([1, 2, 7]),
+        np.array([0, 60, 120]),
+        np.array([0, 60, 120]),
+        block_size=1000,
+        rng=np.random.default_rng(0),
+    )
+    samples = np.array([sampler.sample() for _ in range(30000)])
+
+    assert set(np.unique(samples)) == {0, 60, 120}
+    assert np.mean(samples == 0) == pytest.approx(0.1, abs=0.01)
+    assert np.mean(samples == 60) == pytest.approx(0.2, abs=0.01)
+    assert np.mean(samples == 120) == pytest.approx(0.7, abs=0.01)
+
+
+def test_alias_sampler_state_continues_draws():
+    sampler = AliasSampler(
+        np.array([1, 1]),
+        np.array([0, 60]),
+        np.array([60, 120]),
+        block_size=4,
+        rng=np.random.default_rng(0),
+    )
+    sampler.sample()
+    state = sampler.get_state()
+    expected = [sampler.sample() for _ in range(10)]
+
+    sampler.sample()
+    sampler.set_state(state)
+    assert [sampler.sample() for _ in range(10)] == expected
+
+
+def test_alias_sampler_invalid_weights():
+    with pytest.raises(ValueError):
+        AliasSampler(np.array([0, 0]), np.array([0, 1]), np.array([0, 1]))
+
+
+def test_seed_makes_probability_gate_reproducible():
+    df = pd.DataFrame({"delay_seconds": [60, 120], "weight": [1, 1]})
+
+    def draws():
+        injector = EmpiricalPrimaryDelayInjector.from_df(df, seed=0, probability=0.5)
+        return [injector.inject_delay(make_task(StopTask, "REX")) for _ in range(100)]
+
+    first = draws()
+    assert 0 < first.count(0.0) < 100
+    assert draws() == first
+
+
+def test_quantile_table_interpolates():
+    df = pd.DataFrame({"quantile": [0.0, 0.5, 1.0], "delay_seconds": [0, 10, 100]})
+    injector = EmpiricalPrimaryDelayInjector.from_df(df, seed=0)
+    samples = [
+        injector.inject_delay(make_task(StopTask, "REX"))
+        for _ in range(10000)
+    ]
+
+    assert min(samples) >= 0
+    assert max(samples) <= 100
+    assert np.median(samples) == pytest.approx(10, abs=1)
+
+
+def test_most_specific_group_is_used():
+    df = pd.DataFrame(
+        {
+            "category": ["REX", "REX", None],
+            "task_type": ["StopTask", None, None],
+            "delay_seconds": [60, 120, 180],
+            "weight": [1, 1, 1],
+        }
+    )
+    injector = EmpiricalPrimaryDelayInjector.from_df(df, seed=0)
+
+    assert injector.inject_delay(make_task(StopTask, "REX")) == 60
+    assert injector.inject_delay(make_task(DriveTask, "REX")) == 120
+    assert injector.inject_delay(make_task(StopTask, "IC")) == 180
+
+
+def test_unmatched_group_is_not_delayed():
+    df = pd.DataFrame(
+        {"category": ["REX"], "delay_seconds": [60], "weight": [1]},
+    )
+    injector = EmpiricalPrimaryDelayInjector.from_df(df, seed=0, log=True)
+
+    assert injector.inject_delay(make_task(StopTask, "IC")) == 0
+    assert injector.injected_delay == {}
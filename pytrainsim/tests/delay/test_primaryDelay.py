@@ -0,0 +1,33 @@
+from unittest.mock import Mock
+
+import pytest
+
+from pytrainsim.delay.primaryDelay import SaveablePrimaryDelayInjector
+
+
+class FixedDelayInjector(SaveablePrimaryDelayInjector):
+    def __init__(self, delay: float, **kwargs):
+        self.delay = delay
+        super().__init__(**kwargs)
+
+    def _draw_delay(self, task):
+        return self.delay
+
+
+@pytest.mark.parametrize("delay", [0.5, 90000.25])
+def test_logs_fractional_and_multi_day_delays(delay: float):
+    injector = FixedDelayInjector(delay, log=True)
+    task = Mock()
+    task.task_id = "task_1"
+
+    assert injector.inject_delay(task) == delay
+    assert injector.injected_delay == {"task_1": delay}
+
+
+def test_zero_delay_not_logged():
+    injector = FixedDelayInjector(0.0, log=True)
+    task = Mock()
+    task.task_id = "task_1"
+
+    assert injector.inject_delay(task) == 0
+    assert injector.injected_delay == {}
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+import random
+
+import numpy as np
+import pytest
+
+from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
+from pytrainsim.checkpoint import capture_state, export_state, import_state
+from pytrainsim.delay.normalDelay import NormalPrimaryDelayInjector
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.resources.train import Train
+from pytrainsim.schedule import OCPEntry, ScheduleBuilder, TrackEntry
+from pytrainsim.simulation import Simulation
+
+start_datetime = datetime(2024, 1, 1, 6, 0)
+
+
+def build_simulation(names=("Train1", "Train2", "Train3")) -> Simulation:
+    network = Network[Track]()
+    ocps = [OCP("OCP1"), OCP("OCP2")]
+    network.add_ocps(ocps)
+    network.add_tracks([Track(1000, ocps[0], ocps[1], 1)])
+
+    sim = Simulation(NormalPrimaryDelayInjector(2, 1, 1.0), network)
+
+    # Train1 and Train2 want to use the single track at the same time and
+    # Train3 continues both of them
+    trains = []
+    for i, name in enumerate(names):
+        schedule = (
+            ScheduleBuilder()
+            .add_ocp(OCPEntry("OCP1", start_datetime, timedelta(0), f"{name}_s1"))
+            .add_track(
+                TrackEntry(
+                    "OCP1",
+                    "OCP2",
+                    start_datetime + timedelta(minutes=5),
+                    f"{name}_d1",
+                    timedelta(minutes=5),
+                )
+            )
+            .add_ocp(
+                OCPEntry(
+                    "OCP2",
+                    start_datetime + timedelta(minutes=5),
+                    timedelta(0),
+                    f"{name}_s2",
+                )
+            )
+            .build()
+        )
+        train = Train(name, "category", trains[:2] if i == 2 else [])
+        ScheduleTransformer.assign_to_train(schedule, train, network)
+        sim.schedule_train(train)
+        trains.append(train)
+
+    return sim
+
+
+def simulation_results(sim: Simulation):
+    track = sim.network.get_track_by_name("OCP1_OCP2")
+    assert track is not None
+    return (
+        {train.train_name: train.traversal_logs for train in sim.trains},
+        track.reservation_recorder.get_reservation_logs(),
+        sim.reschedules,
+    )
+
+
+def test_import_continues_like_uninterrupted_run():
+    random.seed(0)
+    np.random.seed(0)
+    sim = build_simulation()
+    sim.run()
+    expected = simulation_results(sim)
+
+    random.seed(0)
+    np.random.seed(0)
+    sim = build_simulation()
+    # Train1 is on the track, Train2 waits for it and Train3 for both
+    sim.run(until=start_datetime + timedelta(minutes=2))
+    assert capture_state(sim)["nth_callbacks"]
+    state = export_state(sim)
+
+    random.random()
+    np.random.random()
+    restored = build_simulation()
+    import_state(restored, state)
+    restored.run()
+
+    assert simulation_results(restored) == expected
+
+
+def test_import_requires_same_trains():
+    sim = build_simulation()
+    sim.run(until=start_datetime + timedelta(minutes=2))
+    state = export_state(sim)
+
+    with pytest.raises(ValueError):
+        import_state(build_simulation(("Train1", "Train2")), state)
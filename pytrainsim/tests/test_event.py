@@ -12,7 +12,8 @@ date = datetime.now()
 def simulation():
     simulation = Mock()
     simulation.current_time = date
-    simulation.delay_injector.inject_delay.return_value = timedelta(0)
+    simulation.reschedules = 0
+    simulation.delay_injector.inject_delay.return_value = 0
     return simulation
 
 
@@ -172,6 +173,7 @@ def test_infra_release_schedules_attempt_end_correctly(
 
     # Verify that an AttemptEnd event is scheduled after the infrastructure becomes free
     simulation.schedule_event.assert_called_once()
+    assert simulation.reschedules == 1
     event = simulation.schedule_event.call_args[0][0]
     assert event.time == date + timedelta(minutes=3)
     assert event.task == ready_task
@@ -186,7 +188,7 @@ def test_attempt_end_execute_with_delay(simulation: Simulation, ready_task: Task
     next_task.duration.return_value = timedelta(minutes=3)
 
     # Set up a delay
-    simulation.delay_injector.inject_delay.return_value = timedelta(minutes=2)
+    simulation.delay_injector.inject_delay.return_value = 120
 
     attempt_end_event = AttemptEnd(simulation, date, ready_task)
     attempt_end_event.execute()
@@ -212,7 +214,7 @@ def test_attempt_end_execute_with_delay_after_current_time(
     next_task.duration.return_value = timedelta(minutes=3)
 
     # Set up a delay
-    simulation.delay_injector.inject_delay.return_value = timedelta(minutes=2)
+    simulation.delay_injector.inject_delay.return_value = 120
 
     attempt_end_event = AttemptEnd(simulation, date + timedelta(minutes=3), ready_task)
     attempt_end_event.execute()
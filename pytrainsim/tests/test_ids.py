@@ -0,0 +1,72 @@
+from pytrainsim.MBSim.trackSection import MBTrack, TrackSection
+from pytrainsim.ids import IdRegistry, derived_id, infrastructure_ids
+from pytrainsim.infrastructure import OCP
+from pytrainsim.sweep import SharedInputs
+
+
+def test_intern_returns_same_id_for_same_name():
+    registry = IdRegistry()
+    a = registry.intern("A")
+    b = registry.intern("B")
+    assert a != b
+    assert registry.intern("A") == a
+    assert registry.name(b) == "B"
+
+
+def test_new_id_is_anonymous():
+    registry = IdRegistry()
+    registry.intern("A")
+    uid = registry.new_id()
+    assert uid == 1
+    assert registry.name(uid) is None
+    assert len(registry) == 2
+
+
+def test_infrastructure_uids():
+    a, b = OCP("A"), OCP("B")
+    track = MBTrack(100, a, b, 1, 50, 40)
+    assert OCP("A").uid == a.uid
+    assert hash(track) == track.uid
+
+    first, second = track.track_sections
+    assert first.uid != second.uid
+    assert second.name == "A_B_1"
+
+
+def test_track_sections_are_not_registered():
+    a, b = OCP("A"), OCP("B")
+    track = MBTrack(100, a, b, 1, 50, 40)
+    registered = len(infrastructure_ids)
+    uids = [section.uid for section in track.track_sections]
+
+    track.split(25)
+    assert len(infrastructure_ids) == registered
+    # splitting again keeps the ids of existing indices
+    assert [section.uid for section in track.track_sections][:2] == uids
+    assert infrastructure_ids.get("A_B_0") is None
+
+
+def test_derived_ids_are_unique():
+    uids = {derived_id(parent, idx) for parent in range(50) for idx in range(50)}
+    assert len(uids) == 50 * 50
+    assert max(uids) < -1
+    # -1 hashes like -2
+    assert len({hash(uid) for uid in uids}) == 50 * 50
+
+
+def test_track_section_name_is_derived():
+    a, b = OCP("A"), OCP("B")
+    track = MBTrack(100, a, b, 1, 50, 40)
+    section = track.track_sections[1]
+
+    assert section.name == "A_B_1"
+    assert not hasattr(section, "__dict__")
+    assert "name" not in TrackSection.__slots__
+
+
+def test_shared_inputs_reset_ids():
+    infrastructure_ids.intern("A")
+    SharedInputs()
+
+    assert len(infrastructure_ids) == 0
+    assert OCP("B").uid == 0
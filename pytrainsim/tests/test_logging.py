@@ -0,0 +1,34 @@
+import logging
+
+from pytrainsim import logging as sim_logging
+
+
+def test_each_call_logs_to_its_own_file(tmp_path, monkeypatch):
+    root_logger = logging.getLogger()
+    # pytest adds its own handlers to the root logger
+    monkeypatch.setattr(root_logger, "handlers", [])
+    try:
+        for name in ["first", "second"]:
+            sim_logging.setup_logging(str(tmp_path / f"{name}.txt"))
+            logging.getLogger(__name__).info("running %s", name)
+        assert len(root_logger.handlers) == 1
+    finally:
+        for handler in root_logger.handlers:
+            handler.close()
+        sim_logging._handlers.clear()
+
+    first = (tmp_path / "first.txt").read_text()
+    second = (tmp_path / "second.txt").read_text()
+    assert "running first" in first and "running second" not in first
+    assert "running second" in second
+
+
+def test_foreign_configuration_is_kept(tmp_path, monkeypatch):
+    root_logger = logging.getLogger()
+    handler = logging.NullHandler()
+    monkeypatch.setattr(root_logger, "handlers", [handler])
+
+    sim_logging.setup_logging(str(tmp_path / "log.txt"))
+
+    assert root_logger.handlers == [handler]
+    assert not (tmp_path / "log.txt").exists()
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.parallelSchedule import build_schedules, find_paths
+from pytrainsim.resources.train import Train
+from pytrainsim.schedule import ScheduleBuilder
+
+
+@pytest.fixture
+def network():
+    # the schedules skip OCP B, so A -> C needs a path search
+    network = Network[Track]()
+    ocps = [OCP("A"), OCP("B"), OCP("C")]
+    network.add_ocps(ocps)
+    network.add_tracks([Track(100, ocps[0], ocps[1], 1), Track(100, ocps[1], ocps[2], 1)])
+    return network
+
+
+@pytest.fixture
+def df():
+    rows = []
+    for trainpart_id, start in [("T1", "2023-01-01 12:00"), ("T2", "2023-01-01 12:30")]:
+        rows += [
+            [trainpart_id, f"{trainpart_id}_a0", f"{trainpart_id}_s0", "A", start, start, 0.0, None],
+            [trainpart_id, f"{trainpart_id}_a1", f"{trainpart_id}_s1", "C", start, start, 0.0, 600.0],
+        ]
+    df = pd.DataFrame(
+        rows,
+        columns=[
+            "trainpart_id",
+            "arrival_id",
+            "stop_id",
+            "db640_code",
+            "scheduled_arrival",
+            "scheduled_departure",
+            "stop_duration",
+            "run_duration",
+        ],
+    )
+    df["scheduled_arrival"] = pd.to_datetime(df["scheduled_arrival"])
+    df["scheduled_departure"] = pd.to_datetime(df["scheduled_departure"])
+    return df
+
+
+def test_find_paths(df, network):
+    schedule = ScheduleBuilder().from_df(df[df["trainpart_id"] == "T1"]).build()
+    assert find_paths(schedule, network) == {("A", "C"): ["A_B", "B_C"]}
+
+
+def test_parallel_matches_serial(df, network):
+    results = list(build_schedules(df, ["T2", "T1"], network, workers=2))
+    assert [result[0] for result in results] == ["T2", "T1"]
+
+    for trainpart_id, schedule, paths, error in results:
+        assert error is None
+        expected = ScheduleBuilder().from_df(df[df["trainpart_id"] == trainpart_id])
+        assert schedule.entries() == expected.build().entries()
+
+        train = Train(trainpart_id, "IC")
+        ScheduleTransformer.assign_to_train(schedule, train, network, paths=paths)
+        drive_task = train.tasklist[2]
+        assert drive_task.tracks == [network.tracks["A_B"], network.tracks["B_C"]]
@@ -0,0 +1,63 @@
+import csv
+import time
+
+from pytrainsim import profiling
+from pytrainsim.profiling import PhaseProfiler, ResourceSampler
+
+
+def test_phases_are_recorded_and_accumulated():
+    profiler = PhaseProfiler()
+    with profiler.phase("load"):
+        time.sleep(0.01)
+    with profiler.phase("load"):
+        time.sleep(0.01)
+    with profiler.phase("run"):
+        sum(range(1000))
+
+    stats = profiler.stats()
+    assert list(stats) == ["load", "run"]
+    assert stats["load"]["wall_seconds"] >= 0.02
+    assert stats["load"]["cpu_seconds"] < stats["load"]["wall_seconds"]
+    assert stats["run"]["peak_rss_mb"] > 0
+    assert "peak_traced_mb" not in stats["run"]
+    assert profiler.current is None
+
+
+def test_trace_memory():
+    profiler = PhaseProfiler(trace_memory=True)
+    with profiler.phase("allocate"):
+        data = [0] * 1_000_000
+    del data
+    with profiler.phase("idle"):
+        pass
+    profiler.close()
+
+    stats = profiler.stats()
+    assert stats["allocate"]["peak_traced_mb"] > 7
+    assert stats["idle"]["peak_traced_mb"] < 1
+
+
+def test_resource_sampler(tmp_path):
+    profiler = PhaseProfiler()
+    path = tmp_path / "resources.csv"
+    sampler = ResourceSampler(str(path), 0.01, profiler)
+    sampler.start()
+    with profiler.phase("run"):
+        time.sleep(0.05)
+    sampler.stop()
+
+    with open(path) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) >= 2
+    assert "run" in {row["phase"] for row in rows}
+    assert float(rows[-1]["rss_mb"]) > 0
+
+
+def test_without_resource_module(monkeypatch):
+    monkeypatch.setattr(profiling, "resource", None)
+    profiler = PhaseProfiler()
+    with profiler.phase("run"):
+        pass
+
+    assert profiling.peak_rss_mb() is None
+    assert profiler.stats()["run"]["peak_rss_mb"] is None
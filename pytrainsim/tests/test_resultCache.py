@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from pytrainsim.resultCache import (
+    ResultCache,
+    cache_key,
+    cache_key_inputs,
+    unseeded_random_delay,
+)
+
+
+@pytest.fixture
+def config(tmp_path):
+    schedule = tmp_path / "train_schedule.csv"
+    schedule.write_text("trainpart_id\n1\n")
+    return {
+        "general": {"name": "a", "simulation_type": "fb"},
+        "paths": {"train_schedule": str(schedule)},
+        "delay": {"type": "normal", "mean": 0, "std": 0},
+        "cache": {"enabled": True},
+    }
+
+
+def test_key_ignores_name_and_cache_section(config):
+    key = cache_key(cache_key_inputs(config, "commit"))
+
+    config["general"]["name"] = "b"
+    config["cache"]["dir"] = "elsewhere"
+    assert cache_key(cache_key_inputs(config, "commit")) == key
+
+
+def test_key_changes_with_config_inputs_and_code(config):
+    key = cache_key(cache_key_inputs(config, "commit"))
+    assert cache_key(cache_key_inputs(config, "other")) != key
+
+    config["delay"]["std"] = 1
+    changed_config = cache_key(cache_key_inputs(config, "commit"))
+    assert changed_config != key
+
+    with open(config["paths"]["train_schedule"], "a") as f:
+        f.write("2\n")
+    assert cache_key(cache_key_inputs(config, "commit")) != changed_config
+
+
+def test_store_and_restore(tmp_path, config):
+    result_folder = tmp_path / "run1"
+    result_folder.mkdir()
+    (result_folder / "results.csv").write_text("result")
+    (result_folder / "log.txt").write_text("log")
+
+    cache = ResultCache(str(tmp_path / "cache"))
+    inputs = cache_key_inputs(config, "commit")
+    key = cache_key(inputs)
+    assert cache.get(key) is None
+
+    cache.store(key, inputs, str(result_folder), exclude=["log.txt"])
+    assert cache.get(key) is not None
+
+    new_folder = tmp_path / "run2"
+    new_folder.mkdir()
+    (new_folder / "log.txt").write_text("new log")
+    assert cache.restore(key, str(new_folder)) == ["results.csv"]
+    assert (new_folder / "results.csv").read_text() == "result"
+    assert (new_folder / "log.txt").read_text() == "new log"
+    assert not os.path.exists(new_folder / "cache_key.json")
+
+    # restored files are copies
+    (new_folder / "results.csv").write_text("changed")
+    (result_folder / "results.csv").write_text("changed")
+    restored = tmp_path / "run3"
+    restored.mkdir()
+    cache.restore(key, str(restored))
+    assert (restored / "results.csv").read_text() == "result"
+
+
+@pytest.mark.parametrize(
+    "delay, unseeded",
+    [
+        ({"type": "normal", "mean": 0, "std": 0, "probability": 0}, False),
+        ({"type": "normal", "mean": 1, "std": 0, "probability": 1}, False),
+        ({"type": "normal", "mean": 1, "std": 0, "probability": 0.5}, True),
+        ({"type": "normal", "mean": 1, "std": 1, "probability": 1}, True),
+        ({"type": "pareto", "probability": 0.1}, True),
+        ({"type": "empirical", "path": "delays.csv"}, True),
+        ({"type": "empirical", "path": "delays.csv", "seed": 1}, False),
+        ({"type": "df", "path": "delays.csv"}, False),
+        (
+            {
+                "type": "ensemble",
+                "injector_p": {"type": "empirical", "path": "p.csv", "seed": 1},
+                "injector_f": {"type": "pareto", "probability": 0.1},
+            },
+            True,
+        ),
+    ],
+)
+def test_unseeded_random_delay(delay, unseeded):
+    assert unseeded_random_delay(delay) == unseeded
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from pytrainsim.resultWriter import (
+    TRACK_RESERVATION_COLUMNS,
+    CSVResultWriter,
+    create_result_writer,
+    read_results,
+)
+
+
+def reservations(trainpart_id: str, n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "trainpart_id": [trainpart_id] * n,
+            "start_time": [datetime(2024, 1, 1, 12, i) for i in range(n)],
+            "end_time": [datetime(2024, 1, 1, 12, i + 1) for i in range(n)],
+            "track": [f"A_B{i % 2}" for i in range(n)],
+        }
+    )
+
+
+def test_csv_writer_appends(tmp_path):
+    path = str(tmp_path / "track_reservations.csv")
+    writer = CSVResultWriter(path)
+    writer.write(reservations("T1", 2))
+    writer.write(pd.DataFrame())
+    writer.write(reservations("T2", 3))
+    writer.close()
+
+    df = read_results(path)
+    assert len(df) == 5
+    assert df["start_time"].dtype == "datetime64[us]"
+
+
+def test_parquet_writer_types_and_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "track_reservations.parquet")
+    writer = create_result_writer(
+        str(tmp_path), "track_reservations", TRACK_RESERVATION_COLUMNS, "parquet"
+    )
+    writer.row_group_size = 4  # type: ignore[attr-defined]
+    writer.write(reservations("T1", 3))
+    end_times = reservations("T2", 3)
+    end_times["end_time"] = None
+    writer.write(end_times)
+    writer.write(reservations("T3", 1))
+    writer.close()
+
+    schema = pq.read_schema(path)
+    assert str(schema.field("trainpart_id").type).startswith("dictionary")
+    assert str(schema.field("start_time").type) == "timestamp[us]"
+    assert pq.ParquetFile(path).num_row_groups == 2
+
+    df = read_results(path)
+    assert len(df) == 7
+    assert df["end_time"].isna().sum() == 3
+    assert df["track"].dtype == "category"
+
+
+def test_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        create_result_writer(str(tmp_path), "results", {}, "xlsx")
+
+
+@pytest.mark.parametrize("output_format", ["csv", "parquet"])
+def test_empty_results_are_written(tmp_path, output_format):
+    if output_format == "parquet":
+        pytest.importorskip("pyarrow")
+    writer = create_result_writer(
+        str(tmp_path), "track_reservations", TRACK_RESERVATION_COLUMNS, output_format
+    )
+    writer.write(pd.DataFrame())
+    writer.close()
+
+    df = read_results(str(tmp_path / f"track_reservations.{output_format}"))
+    assert df.empty
+    assert list(df.columns) == list(TRACK_RESERVATION_COLUMNS)
+
+
+def test_csv_header_of_empty_dataframe(tmp_path):
+    path = str(tmp_path / "results.csv")
+    writer = CSVResultWriter(path, ["a", "b", "c"])
+    writer.write(pd.DataFrame(columns=["a", "b"]))
+    writer.close()
+
+    assert list(pd.read_csv(path).columns) == ["a", "b"]
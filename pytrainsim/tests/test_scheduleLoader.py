@@ -0,0 +1,94 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pytrainsim.schedule import OCPEntry, ScheduleBuilder
+from pytrainsim.scheduleLoader import load_schedule, read_schedule_csv
+
+
+@pytest.fixture
+def schedule_csv(tmp_path):
+    df = pd.DataFrame(
+        {
+            "trainpart_id": ["2", "2", "10", "10"],
+            "arrival_id": ["a2_0", "a2_1", "a10_0", "a10_1"],
+            "stop_id": ["s2_0", "s2_1", "s10_0", "s10_1"],
+            "db640_code": ["A", "B", "B", "C"],
+            "scheduled_arrival": [
+                "2023-01-01 12:00:00",
+                "2023-01-01 12:10:00",
+                "2023-01-01 13:00:00",
+                "2023-01-01 13:10:00",
+            ],
+            "scheduled_departure": [
+                "2023-01-01 12:01:00",
+                "2023-01-01 12:10:00",
+                "2023-01-01 13:01:00",
+                "2023-01-01 13:10:00",
+            ],
+            "stop_duration": [60, 0, 60, 0],
+            "run_duration": [None, 540, None, 540],
+        }
+    )
+    path = str(tmp_path / "train_schedule.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_dtypes_across_chunks(schedule_csv):
+    df = read_schedule_csv(schedule_csv, chunk_size=2)
+
+    assert df["trainpart_id"].dtype == "category"
+    assert list(df["db640_code"].cat.categories) == ["A", "B", "C"]
+    assert list(df["db640_code"]) == ["A", "B", "B", "C"]
+    assert df["run_duration"].dtype == "float32"
+    assert df["scheduled_arrival"].dtype == "datetime64[ns]"
+
+
+def test_schedule_from_typed_df(schedule_csv):
+    df = read_schedule_csv(schedule_csv)
+    rows = df.groupby("trainpart_id", observed=True).get_group("10")
+    schedule = ScheduleBuilder().from_df(rows).build()
+
+    assert isinstance(schedule.head, OCPEntry)
+    assert schedule.head.ocp_name == "B"
+    assert [entry.completion_time.minute for entry in schedule.entries()] == [1, 10]
+
+
+def test_blank_stop_falls_back_to_times(schedule_csv):
+    df = pd.read_csv(schedule_csv)
+    # B has no stop flag and departs when it arrives, C is flagged
+    df["stop"] = [True, None, False, True]
+    df.to_csv(schedule_csv, index=False)
+
+    df = read_schedule_csv(schedule_csv)
+    assert df["stop"].isna().sum() == 1
+
+    rows = df.groupby("trainpart_id", observed=True)
+    first = ScheduleBuilder().from_df(rows.get_group("2")).build()
+    second = ScheduleBuilder().from_df(rows.get_group("10")).build()
+
+    assert [type(entry).__name__ for entry in first.entries()] == [
+        "OCPEntry",
+        "TrackEntry",
+    ]
+    assert isinstance(second.tail, OCPEntry)
+    assert second.tail.ocp_name == "C"
+
+
+def test_cache(schedule_csv):
+    pytest.importorskip("pyarrow")
+    df = load_schedule(schedule_csv, cache=True)
+    assert os.path.exists(schedule_csv + ".parquet")
+
+    cached = load_schedule(schedule_csv, cache=True)
+    pd.testing.assert_frame_equal(df, cached)
+
+    # a newer CSV replaces the cache
+    changed = pd.read_csv(schedule_csv)
+    changed.loc[0, "db640_code"] = "D"
+    changed.to_csv(schedule_csv, index=False)
+    mtime = os.path.getmtime(schedule_csv + ".parquet") + 1
+    os.utime(schedule_csv, (mtime, mtime))
+    assert load_schedule(schedule_csv, cache=True)["db640_code"][0] == "D"
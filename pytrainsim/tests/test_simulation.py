@@ -0,0 +1,214 @@
+from datetime import datetime, timedelta
+import random
+from typing import Optional
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from pytrainsim.MBSim.MBScheduleTransformer import MBScheduleTransformer
+from pytrainsim.MBSim.MBTrain import MBTrain
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
+from pytrainsim.delay.normalDelay import NormalPrimaryDelayInjector
+from pytrainsim.delay.primaryDelay import PrimaryDelayInjector
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.resources.train import Train
+from pytrainsim.schedule import OCPEntry, ScheduleBuilder, TrackEntry
+from pytrainsim.simulation import Simulation
+from pytrainsim.trace import ObserverGroup, SimulationObserver
+
+start_datetime = datetime(2024, 1, 1, 6, 0)
+
+
+def build_simulation(
+    profile: bool, delay: Optional[PrimaryDelayInjector] = None
+) -> Simulation:
+    network = Network[Track]()
+    ocps = [OCP("OCP1"), OCP("OCP2")]
+    network.add_ocps(ocps)
+    network.add_tracks([Track(1000, ocps[0], ocps[1], 1)])
+
+    if delay is None:
+        delay = Mock(PrimaryDelayInjector)
+        delay.inject_delay.return_value = 0
+
+    sim = Simulation(delay, network, profile=profile)
+
+    # both trains want to use the single track at the same time
+    for name in ["Train1", "Train2"]:
+        schedule = (
+            ScheduleBuilder()
+            .add_ocp(OCPEntry("OCP1", start_datetime, timedelta(0), f"{name}_s1"))
+            .add_track(
+                TrackEntry(
+                    "OCP1",
+                    "OCP2",
+                    start_datetime + timedelta(minutes=5),
+                    f"{name}_d1",
+                    timedelta(minutes=5),
+                )
+            )
+            .add_ocp(
+                OCPEntry(
+                    "OCP2",
+                    start_datetime + timedelta(minutes=5),
+                    timedelta(0),
+                    f"{name}_s2",
+                )
+            )
+            .build()
+        )
+        train = Train(name, "category")
+        ScheduleTransformer.assign_to_train(schedule, train, network)
+        sim.schedule_train(train)
+
+    return sim
+
+
+@pytest.mark.parametrize("profile", [True, False])
+def test_reschedules_counted(profile: bool):
+    sim = build_simulation(profile)
+    sim.run()
+
+    assert sim.stats()["reschedules"] == 1
+
+
+def test_profile_stats():
+    sim = build_simulation(True)
+    sim.run()
+    stats = sim.stats()
+
+    assert stats["event_counts"]["StartEvent"] == 2
+    # start, stop, drive, stop and end task per train, one blocked attempt
+    assert stats["event_counts"]["AttemptEnd"] == 11
+    assert stats["events_processed"] == 13
+    assert stats["max_queue_length"] == 2
+    assert set(stats["event_wall_seconds"]) == {"StartEvent", "AttemptEnd"}
+
+
+def test_profile_stats_accumulate_across_runs():
+    sim = build_simulation(True)
+    sim.run(until=start_datetime + timedelta(minutes=3))
+    first = sim.stats()["events_processed"]
+    sim.run()
+    stats = sim.stats()
+
+    assert 0 < first < 13
+    assert stats["events_processed"] == 13
+    assert stats["event_counts"]["AttemptEnd"] == 11
+    assert stats["event_counts"]["StartEvent"] == 2
+
+
+def test_profile_disabled_has_no_event_stats():
+    sim = build_simulation(False)
+    sim.run()
+
+    assert "event_counts" not in sim.stats()
+
+
+def test_observer_receives_task_events():
+    sim = build_simulation(False)
+    observer = Mock(SimulationObserver)
+    sim.add_observer(observer)
+    sim.run()
+
+    # five tasks per train are started and completed, the second train waits
+    # once for the track
+    assert observer.task_started.call_count == 10
+    assert observer.task_completed.call_count == 10
+    observer.task_blocked.assert_called_once()
+
+    _, task, blocked_task = observer.task_blocked.call_args[0]
+    assert task.train.train_name == "Train2"
+    assert blocked_task.task_id == "Train2_d1"
+
+
+def test_add_observer_groups_observers():
+    sim = build_simulation(False)
+    first, second = Mock(SimulationObserver), Mock(SimulationObserver)
+    sim.add_observer(first)
+    sim.add_observer(second)
+    sim.run()
+
+    assert isinstance(sim.observer, ObserverGroup)
+    assert first.task_started.call_count == second.task_started.call_count == 10
+
+
+def traversal_logs(sim: Simulation):
+    return {train.train_name: train.traversal_logs for train in sim.trains}
+
+
+@pytest.mark.parametrize("profile", [True, False])
+def test_snapshot_continues_like_uninterrupted_run(profile: bool):
+    random.seed(0)
+    np.random.seed(0)
+    sim = build_simulation(profile, NormalPrimaryDelayInjector(2, 1, 1.0))
+    sim.run()
+    expected = traversal_logs(sim)
+
+    random.seed(0)
+    np.random.seed(0)
+    sim = build_simulation(profile, NormalPrimaryDelayInjector(2, 1, 1.0))
+    # Train1 is on the track and Train2 waits for it
+    sim.run(until=start_datetime + timedelta(minutes=2))
+    assert sim.event_queue
+    snapshot = sim.snapshot()
+
+    # the random generators are restored with the simulation
+    random.random()
+    np.random.random()
+    restored = Simulation.restore(snapshot)
+    restored.run()
+
+    assert traversal_logs(restored) == expected
+    assert restored.reschedules == 1
+
+
+def build_long_mb_simulation(n: int, lazy: bool) -> Simulation:
+    network = Network[MBTrack]()
+    ocps = [OCP(f"OCP{i}") for i in range(n + 1)]
+    network.add_ocps(ocps)
+    network.add_tracks(
+        [MBTrack(1000, start, end, 1, 500, 40) for start, end in zip(ocps, ocps[1:])]
+    )
+    sim = Simulation(NormalPrimaryDelayInjector(0, 0, 0), network)
+
+    builder = ScheduleBuilder().add_ocp(
+        OCPEntry("OCP0", start_datetime, timedelta(0), "s0")
+    )
+    for i in range(1, n + 1):
+        arrival = start_datetime + timedelta(minutes=i)
+        builder.add_track(
+            TrackEntry(f"OCP{i - 1}", f"OCP{i}", arrival, f"d{i}", timedelta(minutes=1))
+        )
+        builder.add_ocp(OCPEntry(f"OCP{i}", arrival, timedelta(0), f"s{i}"))
+    train = MBTrain("Train1", "category", 1, -1, 1)
+    MBScheduleTransformer.assign_to_train(builder.build(), train, network, lazy)
+    sim.schedule_train(train)
+    return sim
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_snapshot_of_long_route(lazy: bool):
+    # schedule entries, drive tasks and tracks are linked along the route
+    n = 1000
+    sim = build_long_mb_simulation(n, lazy)
+    sim.run()
+    expected = traversal_logs(sim)
+
+    sim = build_long_mb_simulation(n, lazy)
+    sim.run(until=start_datetime + timedelta(minutes=n // 2))
+    restored = Simulation.restore(sim.snapshot())
+    restored.run()
+
+    assert traversal_logs(restored) == expected
+    assert len(restored.network.get_ocp("OCP0").outgoing_tracks) == 1
+
+
+def test_snapshot_of_admitting_simulation_fails():
+    sim = build_simulation(False)
+    sim.on_train_finished = lambda train: None
+
+    with pytest.raises(ValueError):
+        sim.snapshot()
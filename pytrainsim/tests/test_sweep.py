@@ -0,0 +1,151 @@
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.infrastructure import OCP
+from pytrainsim.sweep import (
+    SharedInputs,
+    estimate_cost,
+    expand_grid,
+    load_manifest,
+    run_sweep,
+)
+
+
+def write_config(folder, name, simulation_type, trains):
+    meta = folder / f"{name}_meta.json"
+    meta.write_text(json.dumps({str(i): {} for i in range(trains)}))
+    path = folder / f"{name}.toml"
+    path.write_text(
+        f'[general]\nname = "{name}"\nsimulation_type = "{simulation_type}"\n'
+        f'[paths]\ntrain_meta_data = "{meta}"\n'
+        "[mb]\nsection_length = 500\n"
+    )
+    return str(path)
+
+
+def test_estimate_cost(tmp_path):
+    fb = write_config(tmp_path, "fb", "fb", 10)
+    mb = write_config(tmp_path, "mb", "mb", 10)
+    larger = write_config(tmp_path, "larger", "fb", 20)
+
+    assert estimate_cost(mb) > estimate_cost(fb)
+    assert estimate_cost(larger) == 2 * estimate_cost(fb)
+
+
+def record(config_file):
+    folder = os.path.dirname(config_file)
+    name = os.path.basename(config_file)
+    with open(os.path.join(folder, "order.txt"), "a") as f:
+        f.write(name + "\n")
+    if name.startswith("fail"):
+        raise ValueError("failed")
+    if name.startswith("slow"):
+        time.sleep(10)
+
+
+def test_longest_first_and_resume(tmp_path):
+    configs = [
+        write_config(tmp_path, name, "fb", trains)
+        for name, trains in [("small", 1), ("large", 100), ("medium", 10)]
+    ]
+    manifest_path = str(tmp_path / "manifest.json")
+
+    manifest = run_sweep(configs, record, 1, manifest_path=manifest_path)
+    order = (tmp_path / "order.txt").read_text().split()
+    assert order == ["large.toml", "medium.toml", "small.toml"]
+    assert all(entry["status"] == "done" for entry in manifest.values())
+    assert load_manifest(manifest_path) == manifest
+
+    # done experiments are skipped
+    run_sweep(configs, record, 1, manifest_path=manifest_path)
+    assert (tmp_path / "order.txt").read_text().split() == order
+
+
+def test_retries_and_timeout(tmp_path):
+    failing = write_config(tmp_path, "fail", "fb", 1)
+    slow = write_config(tmp_path, "slow", "fb", 1)
+
+    manifest = run_sweep([failing, slow], record, 2, timeout=0.5, retries=1)
+
+    assert manifest[failing]["status"] == "failed"
+    assert manifest[failing]["attempts"] == 2
+    assert manifest[failing]["error"] == "ValueError: failed"
+    assert "in record" in manifest[failing]["traceback"]
+    assert manifest[slow]["status"] == "failed"
+    assert "timed out" in manifest[slow]["error"]
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        run_sweep([], record, 0)
+
+
+def test_expand_grid():
+    config = {
+        "general": {"name": "grid", "simulation_type": "mb"},
+        "mb": {"section_length": 500},
+        "sweep": {
+            "mb.section_length": [128, 256],
+            "delay.probability": [0, 0.1, 0.2],
+        },
+    }
+    configs = expand_grid(config)
+
+    assert len(configs) == 6
+    assert (
+        configs[1]["general"]["name"]
+        == "grid-mb.section_length=128-delay.probability=0.1"
+    )
+    assert configs[1]["mb"]["section_length"] == 128
+    assert configs[1]["delay"]["probability"] == 0.1
+    assert all("sweep" not in expanded for expanded in configs)
+    assert config["mb"]["section_length"] == 500
+
+    assert expand_grid({"general": {"name": "single"}}) == [
+        {"general": {"name": "single"}}
+    ]
+    with pytest.raises(ValueError):
+        expand_grid({"general": {"name": "grid"}, "sweep": {"mb.section_length": 1}})
+
+
+def test_shared_inputs_load_once():
+    inputs = SharedInputs()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return object()
+
+    assert inputs.get("a", load) is inputs.get("a", load)
+    assert len(loads) == 1
+
+
+def test_split_track_sections():
+    track = MBTrack(1000, OCP("A"), OCP("B"), 1, 500, 40)
+    assert len(track.track_sections) == 2
+
+    track.split(300)
+    assert track.section_length == 300
+    assert len(track.track_sections) == 4
+    assert [section.idx for section in track.track_sections] == [0, 1, 2, 3]
+    assert sum(section.length for section in track.track_sections) == 1000
+
+
+def test_without_fork(tmp_path, monkeypatch):
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    monkeypatch.setattr(
+        multiprocessing, "get_context", lambda method=None: get_context("spawn")
+    )
+    failing = write_config(tmp_path, "fail", "fb", 1)
+    small = write_config(tmp_path, "small", "fb", 1)
+
+    manifest = run_sweep([failing, small], record, 2)
+
+    assert manifest[small]["status"] == "done"
+    assert manifest[failing]["error"] == "ValueError: failed"
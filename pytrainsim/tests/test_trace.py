@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from pytrainsim.MBSim.MBScheduleTransformer import MBScheduleTransformer
+from pytrainsim.MBSim.MBTrain import MBTrain
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.delay.primaryDelay import PrimaryDelayInjector
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.schedule import OCPEntry, ScheduleBuilder, TrackEntry
+from pytrainsim.simulation import Simulation
+from pytrainsim.trace import (
+    BinaryTraceWriter,
+    element_occupancy,
+    read_trace,
+    trace_to_df,
+    train_timelines,
+)
+
+start_datetime = datetime(2024, 1, 1, 6, 0)
+
+
+def create_task(train_name: str, task_id: str, elements: Optional[List] = None):
+    task = Mock()
+    task.train.train_name = train_name
+    task.task_id = task_id
+    task.infra_elements.return_value = elements or []
+    return task
+
+
+@pytest.fixture
+def track():
+    return Track(1000, OCP("OCP1"), OCP("OCP2"), 1, record_reservations=False)
+
+
+@pytest.fixture
+def trace_path(tmp_path, track: Track):
+    path = str(tmp_path / "trace.bin")
+    start1 = create_task("Train1", "Train1_s1")
+    drive1 = create_task("Train1", "Train1_d1", [track])
+    drive2 = create_task("Train2", "Train2_d1", [track])
+    t = start_datetime
+
+    # a small chunk size forces intermediate flushes
+    writer = BinaryTraceWriter(path, chunk_size=2)
+    writer.task_started(t, start1)
+    writer.task_completed(t, start1)
+    track.reserve("Train1", t)
+    writer.infra_reserved(t, "Train1", track)
+    writer.task_started(t, drive1)
+    writer.task_blocked(t, drive2, drive2)
+    t += timedelta(minutes=5)
+    track.release("Train1", t)
+    writer.infra_released(t, "Train1", track)
+    writer.task_completed(t, drive1)
+    track.reserve("Train2", t)
+    writer.infra_reserved(t, "Train2", track)
+    writer.task_started(t, drive2)
+    t += timedelta(minutes=5)
+    track.release("Train2", t)
+    writer.infra_released(t, "Train2", track)
+    writer.task_completed(t, drive2)
+    writer.close()
+    return path
+
+
+def test_read_trace(trace_path: str):
+    records, names = read_trace(trace_path)
+
+    assert len(records) == 7
+    assert [names["events"][e] for e in records["event"]] == [
+        "started",
+        "completed",
+        "started",
+        "blocked",
+        "completed",
+        "started",
+        "completed",
+    ]
+    assert names["trains"] == ["Train1", "Train2"]
+    assert names["elements"] == ["OCP1_OCP2"]
+    assert list(records["element"]) == [-1, -1, 0, 0, 0, 0, 0]
+    # Train2 is blocked by Train1 on the track
+    assert list(records["blocked_by"]) == [-1, -1, -1, 0, -1, -1, -1]
+
+    times = records["time"].astype("datetime64[us]")
+    assert times[0].item() == start_datetime
+    assert times[6] - times[0] == timedelta(minutes=10)
+
+
+def test_trace_to_df(trace_path: str):
+    trace = trace_to_df(trace_path)
+
+    blocked = trace[trace["event"] == "blocked"].iloc[0]
+    assert blocked["train"] == "Train2"
+    assert blocked["element"] == "OCP1_OCP2"
+    assert blocked["blocked_by"] == "Train1"
+    assert trace["element"].isna().sum() == 2
+
+
+def test_train_timelines(trace_path: str):
+    timelines = train_timelines(trace_to_df(trace_path))
+
+    assert list(timelines["task"]) == ["Train1_s1", "Train1_d1", "Train2_d1"]
+    assert list(timelines["blocked"]) == [0, 0, 1]
+    row = timelines.iloc[2]
+    assert row["start_time"] == pd.Timestamp(start_datetime + timedelta(minutes=5))
+    assert row["end_time"] == pd.Timestamp(start_datetime + timedelta(minutes=10))
+
+
+def test_element_occupancy(trace_path: str):
+    occupancy = element_occupancy(trace_to_df(trace_path))
+
+    assert list(occupancy["element"]) == ["OCP1_OCP2", "OCP1_OCP2"]
+    assert list(occupancy["train"]) == ["Train1", "Train2"]
+    assert (occupancy["end_time"] - occupancy["start_time"]).tolist() == [
+        pd.Timedelta(minutes=5),
+        pd.Timedelta(minutes=5),
+    ]
+
+
+def test_read_trace_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a trace")
+
+    with pytest.raises(ValueError):
+        read_trace(str(path))
+
+
+def test_blocked_by_section_reserved_ahead(tmp_path):
+    network = Network()
+    ocps = [OCP("A"), OCP("B"), OCP("C")]
+    network.add_ocps(ocps)
+    network.add_tracks(
+        [
+            MBTrack(500, ocps[0], ocps[1], 1, 50, 12),
+            MBTrack(500, ocps[1], ocps[2], 1, 50, 12),
+        ]
+    )
+    delay = Mock(PrimaryDelayInjector)
+    delay.inject_delay.return_value = 0
+    sim = Simulation(delay, network)
+    path = str(tmp_path / "trace.bin")
+    writer = BinaryTraceWriter(path)
+    sim.add_observer(writer)
+
+    # Train2 starts at B while Train1 approaches B and has reserved the first
+    # section of B_C ahead, but not yet entered it
+    for name, ocp_names, offset in [("Train1", "ABC", 0), ("Train2", "BC", 45)]:
+        start = start_datetime + timedelta(seconds=offset)
+        builder = ScheduleBuilder().add_ocp(
+            OCPEntry(ocp_names[0], start, timedelta(0), f"{name}_s0")
+        )
+        for i, (ocp_from, ocp_to) in enumerate(zip(ocp_names, ocp_names[1:])):
+            builder.add_track(
+                TrackEntry(ocp_from, ocp_to, start, f"{name}_d{i}", timedelta(0))
+            )
+        builder.add_ocp(OCPEntry(ocp_names[-1], start, timedelta(0), f"{name}_s1"))
+        train = MBTrain(name, "category", 1, -2, 1)
+        MBScheduleTransformer.assign_to_train(builder.build(), train, network)
+        sim.schedule_train(train)
+    sim.run()
+    writer.close()
+
+    trace = trace_to_df(path)
+    blocked = trace[trace["event"] == "blocked"].iloc[0]
+    assert blocked["train"] == "Train2"
+    assert blocked["element"] == "B_C_0"
+    assert blocked["blocked_by"] == "Train1"
+
+    entered = trace[
+        (trace["event"] == "started")
+        & (trace["train"] == "Train1")
+        & (trace["element"] == "B_C_0")
+    ]
+    assert entered["time"].iloc[0] > blocked["time"]
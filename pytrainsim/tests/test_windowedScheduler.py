@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from unittest.mock import Mock
+
+import pandas as pd
+
+from pytrainsim.OCPSim.scheduleTransformer import ScheduleTransformer
+from pytrainsim.delay.primaryDelay import PrimaryDelayInjector
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.resources.train import Train
+from pytrainsim.resultWriter import ResultWriter
+from pytrainsim.schedule import OCPEntry, Schedule, ScheduleBuilder, TrackEntry
+from pytrainsim.simulation import Simulation
+from pytrainsim.windowedScheduler import WindowedScheduler
+
+start_datetime = datetime(2024, 1, 1, 6, 0)
+
+
+class ListResultWriter(ResultWriter):
+    def __init__(self):
+        self.dfs: List[pd.DataFrame] = []
+        self.closed = False
+
+    def write(self, df: pd.DataFrame):
+        self.dfs.append(df)
+
+    def close(self):
+        self.closed = True
+
+
+def build_network() -> Network[Track]:
+    network = Network[Track]()
+    ocps = [OCP("OCP1"), OCP("OCP2")]
+    network.add_ocps(ocps)
+    network.add_tracks([Track(1000, ocps[0], ocps[1], 1)])
+    return network
+
+
+def build_schedule(name: str, start: datetime) -> Schedule:
+    return (
+        ScheduleBuilder()
+        .add_ocp(OCPEntry("OCP1", start, timedelta(0), f"{name}_s1"))
+        .add_track(
+            TrackEntry(
+                "OCP1",
+                "OCP2",
+                start + timedelta(minutes=5),
+                f"{name}_d1",
+                timedelta(minutes=5),
+            )
+        )
+        .add_ocp(
+            OCPEntry("OCP2", start + timedelta(minutes=5), timedelta(0), f"{name}_s2")
+        )
+        .build()
+    )
+
+
+def run_windowed(
+    start_times: Dict[str, datetime],
+    previous_trainparts: Dict[str, List[str]] = {},
+    window: timedelta = timedelta(minutes=1),
+):
+    network = build_network()
+    delay = Mock(PrimaryDelayInjector)
+    delay.inject_delay.return_value = 0
+    sim = Simulation(delay, network)
+
+    def build_train(name: str) -> Optional[Train]:
+        train = Train(name, "category")
+        ScheduleTransformer.assign_to_train(
+            build_schedule(name, start_times[name]), train, network
+        )
+        return train
+
+    writer = ListResultWriter()
+    scheduler = WindowedScheduler(
+        sim, build_train, start_times, previous_trainparts, window, writer
+    )
+    scheduler.schedule()
+    sim.run()
+    scheduler.close()
+    return scheduler, writer, sim
+
+
+def test_trains_are_admitted_and_retired():
+    start_times = {
+        f"Train{i}": start_datetime + timedelta(minutes=10 * i) for i in range(3)
+    }
+    scheduler, writer, sim = run_windowed(start_times)
+
+    assert scheduler.admitted == 3
+    # trains do not overlap, so only one is active at a time
+    assert scheduler.max_active == 1
+    assert scheduler.active == {}
+    assert sim.trains == []
+    assert writer.closed
+
+    results = pd.concat(writer.dfs)
+    assert list(results["trainpart_id"].unique()) == ["Train0", "Train1", "Train2"]
+    arrivals = results[results["OCP"] == "OCP2"]["simulated_arrival"]
+    assert list(arrivals) == [
+        start_datetime + timedelta(minutes=5 + 10 * i) for i in range(3)
+    ]
+
+
+def test_previous_trainparts_are_respected():
+    # Train1 is scheduled to start before Train0 but has to wait for it
+    start_times = {
+        "Train0": start_datetime,
+        "Train1": start_datetime - timedelta(minutes=2),
+    }
+    scheduler, writer, _ = run_windowed(start_times, {"Train1": ["Train0"]})
+
+    assert scheduler.admitted == 2
+    results = pd.concat(writer.dfs).set_index(["trainpart_id", "OCP"])
+    assert results.loc[("Train0", "OCP2"), "simulated_arrival"] == (
+        start_datetime + timedelta(minutes=5)
+    )
+    assert results.loc[("Train1", "OCP1"), "simulated_departure"] == (
+        start_datetime + timedelta(minutes=5)
+    )
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.infrastructure import OCP, Network
+from pytrainsim.viz.blockingtimes import (
+    _get_segment_map,
+    mb_blocking_viz,
+    ocp_blocking_viz,
+)
+
+
+@pytest.fixture
+def network():
+    network = Network[MBTrack]()
+    ocps = [OCP("A"), OCP("B"), OCP("C")]
+    network.add_ocps(ocps)
+    network.add_tracks(
+        [
+            MBTrack(1000, ocps[0], ocps[1], 1, 500, 40),
+            MBTrack(1500, ocps[1], ocps[2], 1, 500, 40),
+        ]
+    )
+    return network
+
+
+START = datetime(2024, 1, 1, 6, 0)
+
+
+@pytest.fixture
+def mb_reservations():
+    rows = []
+    for i, trainpart_id in enumerate(["T1", "T2"]):
+        t = START + timedelta(minutes=10 * i)
+        for track, sections in [("A_B", 2), ("B_C", 3)]:
+            for section in range(sections):
+                rows.append(
+                    {
+                        "trainpart_id": trainpart_id,
+                        "track": track,
+                        "section": section,
+                        "start_time": t,
+                        "end_time": t + timedelta(minutes=2),
+                    }
+                )
+                t += timedelta(minutes=1)
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def fb_reservations():
+    return pd.DataFrame(
+        {
+            "trainpart_id": ["T1", "T1", "T2"],
+            # A_C bypasses B and is drawn on A_B and B_C
+            "track": ["A_B", "B_C", "A_C"],
+            "start_time": [START, START + timedelta(minutes=5), START],
+            "end_time": [
+                START + timedelta(minutes=5),
+                START + timedelta(minutes=10),
+                START + timedelta(minutes=8),
+            ],
+        }
+    )
+
+
+def boxes(fig):
+    """Returns the boxes of all filled traces as sorted (x0, x1, start, end)."""
+    result = []
+    for trace in fig.data:
+        if trace.fill != "toself":
+            continue
+        xs = np.asarray(trace.x, dtype=float)
+        ys = pd.to_datetime(pd.Series(list(trace.y)))
+        box_x, box_y = [], []
+        for x, y in [*zip(xs, ys), (np.nan, pd.NaT)]:
+            if not np.isnan(x):
+                box_x.append(x)
+                box_y.append(y)
+                continue
+            if box_x:
+                result.append((box_x[0], box_x[2], box_y[0], box_y[1]))
+            box_x, box_y = [], []
+    return sorted(result)
+
+
+def test_mb_train_traces_match_box_traces(network, mb_reservations):
+    trains = mb_blocking_viz(mb_reservations, network, "A", "C")
+    per_box = mb_blocking_viz(
+        mb_reservations, network, "A", "C", {"render_mode": "boxes"}
+    )
+
+    assert len(trains.data) == 2
+    assert len(per_box.data) == len(mb_reservations)
+    assert boxes(trains) == boxes(per_box)
+    assert boxes(trains)[0] == (
+        0.0,
+        20.0,
+        pd.Timestamp(START),
+        pd.Timestamp(START + timedelta(minutes=2)),
+    )
+
+
+def test_plotting_options_are_passed_through(network, mb_reservations):
+    fig = mb_blocking_viz(
+        mb_reservations,
+        network,
+        "A",
+        "C",
+        {"render_mode": "boxes", "show_legend": True, "show_hover": True},
+    )
+
+    legend = [trace for trace in fig.data if trace.showlegend]
+    assert [trace.name for trace in legend] == ["Train T1", "Train T2"]
+    # one box and one hover trace per box
+    assert len(fig.data) == 2 * len(mb_reservations) + 2
+
+    with pytest.raises(ValueError):
+        mb_blocking_viz(mb_reservations, network, "A", "C", {"render_mode": "x"})
+
+
+def test_fb_train_traces_match_box_traces(network, fb_reservations):
+    trains = ocp_blocking_viz(fb_reservations, network, "A", "C")
+    per_box = ocp_blocking_viz(
+        fb_reservations, network, "A", "C", {"render_mode": "boxes"}
+    )
+
+    # the render mode is passed through to mb_blocking_viz
+    assert len(trains.data) == 2
+    assert len(per_box.data) == 10
+    assert boxes(trains) == boxes(per_box)
+    # T1 and T2 are drawn on all 2 + 3 sections of A_B and B_C
+    assert len(boxes(trains)) == 10
+    t2_end = pd.Timestamp(START + timedelta(minutes=8))
+    t2 = [box for box in boxes(trains) if box[3] == t2_end]
+    assert [box[0] for box in t2] == [0.0, 20.0, 40.0, 60.0, 80.0]
+
+
+def test_get_segment_map():
+    segment_map = _get_segment_map(["A_C", "A_B", "C_A", "X_Y"], ["A", "B", "C"])
+
+    assert segment_map == {
+        "A_C": ["A_B", "B_C"],
+        "A_B": ["A_B"],
+        "C_A": ["C_A"],
+        "X_Y": ["X_Y"],
+    }
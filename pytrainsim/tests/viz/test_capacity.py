@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from pytrainsim.infrastructure import OCP, Network, Track
+from pytrainsim.viz.capacity import analyse_corridors, corridor_blocking_times
+
+
+@pytest.fixture
+def network():
+    network = Network[Track]()
+    ocps = [OCP("A"), OCP("B"), OCP("C")]
+    network.add_ocps(ocps)
+    network.add_tracks(
+        [
+            Track(1000, ocps[0], ocps[1], 1),
+            Track(1000, ocps[1], ocps[2], 1),
+            Track(1000, ocps[1], ocps[0], 1),
+        ]
+    )
+    return network
+
+
+@pytest.fixture
+def track_reservations():
+    start = datetime(2024, 1, 1, 6, 0)
+    rows = []
+    for i, trainpart_id in enumerate(["T1", "T2"]):
+        t = start + timedelta(hours=i)
+        for track in ["A_B", "B_C"]:
+            rows.append(
+                {
+                    "trainpart_id": trainpart_id,
+                    "start_time": t,
+                    "end_time": t + timedelta(minutes=5),
+                    "track": track,
+                }
+            )
+            t += timedelta(minutes=5)
+    # T3 only uses A_B and is not part of the A-C corridor
+    rows.append(
+        {
+            "trainpart_id": "T3",
+            "start_time": start + timedelta(hours=2),
+            "end_time": start + timedelta(hours=2, minutes=5),
+            "track": "A_B",
+        }
+    )
+    return pd.DataFrame(rows)
+
+
+def test_corridor_blocking_times_only_complete_trainparts(track_reservations):
+    blocking_times = corridor_blocking_times(track_reservations, ["A_B", "B_C"])
+
+    assert [bt["trainpart_id"].iloc[0] for bt in blocking_times] == ["T1", "T2"]
+    assert blocking_times[0]["track"].tolist() == ["A_B", "B_C"]
+
+
+def test_analyse_corridors(network, track_reservations):
+    report = analyse_corridors(
+        track_reservations, network, [("A", "C"), ("A", "B"), ("B", "A")], 1
+    )
+
+    assert report["trainparts"].tolist() == [2, 3, 0]
+    # T1, T2 and the duplicated T2 enter A_B every 5 minutes
+    assert report["occupancy_time"].iloc[0] == timedelta(minutes=15)
+    assert report["utilisation"].iloc[0] == pytest.approx(15 / 70)
+    assert pd.isna(report["occupancy_time"].iloc[2])
+
+
+def test_analyse_corridors_parallel(network, track_reservations):
+    serial = analyse_corridors(track_reservations, network, [("A", "C"), ("A", "B")], 1)
+    parallel = analyse_corridors(
+        track_reservations, network, [("A", "C"), ("A", "B")], 2
+    )
+
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_analyse_corridors_unroutable(network, track_reservations, caplog):
+    # C has no outgoing tracks and X is not in the network
+    report = analyse_corridors(
+        track_reservations, network, [("A", "C"), ("C", "A"), ("A", "X")], 2
+    )
+
+    assert report["trainparts"].tolist() == [2, 0, 0]
+    assert report["occupancy_time"].iloc[0] == timedelta(minutes=15)
+    assert report[["occupancy_time", "utilisation"]].iloc[1:].isna().all().all()
+    assert "C-A" in caplog.text and "A-X" in caplog.text
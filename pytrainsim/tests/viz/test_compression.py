@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from pytrainsim.viz.compression import (
+    compress_timetable,
+    insert_trainpart_into_blocked_slots,
+)
+
+
+def blocking_time(trainpart_id: str, start: datetime, durations, tracks):
+    rows = []
+    for track, duration in zip(tracks, durations):
+        end = start + timedelta(minutes=duration)
+        rows.append(
+            {
+                "trainpart_id": trainpart_id,
+                "track": track,
+                "start_time": start,
+                "end_time": end,
+            }
+        )
+        start = end
+    return pd.DataFrame(rows)
+
+
+def test_insert_keeps_slots_sorted_by_end():
+    start = datetime(2024, 1, 1, 6, 0)
+    slots = {"A_B": [(start, start + timedelta(minutes=10))]}
+    trainpart = pd.DataFrame(
+        {
+            "track_id": ["A_B"],
+            "start_time": [start],
+            "end_time": [start + timedelta(minutes=5)],
+        }
+    )
+
+    insert_trainpart_into_blocked_slots(slots, trainpart)
+
+    assert [end for _, end in slots["A_B"]] == [
+        start + timedelta(minutes=5),
+        start + timedelta(minutes=10),
+    ]
+
+
+def test_compress_single_track():
+    start = datetime(2024, 1, 1, 6, 0)
+    blocking_times = [
+        blocking_time("T1", start, [5], ["A_B"]),
+        blocking_time("T2", start + timedelta(hours=1), [4], ["A_B"]),
+    ]
+
+    occupancy_time, compressed = compress_timetable(blocking_times, [1], {})
+
+    # T2 follows T1 directly, the duplicated T2 follows T2
+    assert compressed[1]["start_time"].iloc[0] == start + timedelta(minutes=5)
+    assert compressed[2]["start_time"].iloc[0] == start + timedelta(minutes=9)
+    assert occupancy_time == timedelta(minutes=13)
+
+
+def test_compress_respects_capacity():
+    start = datetime(2024, 1, 1, 6, 0)
+    tracks = ["A_B", "B_C"]
+    blocking_times = [
+        blocking_time("T1", start, [5, 10], tracks),
+        blocking_time("T2", start + timedelta(hours=1), [5, 10], tracks),
+    ]
+
+    occupancy_time, compressed = compress_timetable(blocking_times, [1, 2], {})
+
+    # B_C has capacity 2, so only A_B constrains T2
+    assert compressed[1]["start_time"].iloc[0] == start + timedelta(minutes=5)
+    # the duplicated T2 is constrained by both trains on B_C
+    assert compressed[2]["start_time"].iloc[0] == start + timedelta(minutes=10)
+    assert occupancy_time == timedelta(minutes=15)
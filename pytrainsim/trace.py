@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import argparse
+import json
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pytrainsim.infrastructure import InfrastructureElement
+from pytrainsim.task import Task
+
+
+class SimulationObserver(ABC):
+    """
+    Receives task events from the simulation engine. Observers are only
+    invoked if one is attached to the simulation, so a run without observers
+    does not pay for logging or tracing.
+    """
+
+    @abstractmethod
+    def task_started(self, time: datetime, task: Task):
+        pass
+
+    @abstractmethod
+    def task_completed(self, time: datetime, task: Task):
+        pass
+
+    @abstractmethod
+    def task_blocked(self, time: datetime, task: Task, blocked_task: Task):
+        """
+        Called if `task` cannot proceed because the infrastructure of
+        `blocked_task` is not available (the task itself for a blocked start,
+        the next task for a blocked completion).
+        """
+        pass
+
+    def infra_reserved(
+        self, time: datetime, trainpart_id: str, element: InfrastructureElement
+    ):
+        """
+        Called when a train reserves an element, including the sections a
+        moving block train reserves ahead of the task it runs.
+        """
+        pass
+
+    def infra_released(
+        self, time: datetime, trainpart_id: str, element: InfrastructureElement
+    ):
+        pass
+
+    def close(self):
+        pass
+
+
+class ObserverGroup(SimulationObserver):
+    def __init__(self, observers: List[SimulationObserver]):
+        self.observers = observers
+
+    def task_started(self, time: datetime, task: Task):
+        for observer in self.observers:
+            observer.task_started(time, task)
+
+    def task_completed(self, time: datetime, task: Task):
+        for observer in self.observers:
+            observer.task_completed(time, task)
+
+    def task_blocked(self, time: datetime, task: Task, blocked_task: Task):
+        for observer in self.observers:
+            observer.task_blocked(time, task, blocked_task)
+
+    def infra_reserved(
+        self, time: datetime, trainpart_id: str, element: InfrastructureElement
+    ):
+        for observer in self.observers:
+            observer.infra_reserved(time, trainpart_id, element)
+
+    def infra_released(
+        self, time: datetime, trainpart_id: str, element: InfrastructureElement
+    ):
+        for observer in self.observers:
+            observer.infra_released(time, trainpart_id, element)
+
+    def close(self):
+        for observer in self.observers:
+            observer.close()
+
+
+class TaskEventLogger(SimulationObserver):
+    """Writes task events as text to the `pytrainsim.task` logger."""
+
+    def task_started(self, time: datetime, task: Task):
+        task.log_task_event(time, "Started")
+
+    def task_completed(self, time: datetime, task: Task):
+        task.log_task_event(time, "Completed")
+
+    def task_blocked(self, time: datetime, task: Task, blocked_task: Task):
+        task.log_task_event(time, f"Blocked: Infra for {blocked_task} not available")
+
+
+TRACE_MAGIC = b"PTSTRC01"
+TRACE_EVENTS = ["started", "completed", "blocked"]
+TRACE_RECORD = np.dtype(
+    [
+        ("event", "u1"),
+        ("time", "<i8"),
+        ("train", "<i4"),
+        ("task", "<i4"),
+        ("element", "<i4"),
+        ("blocked_by", "<i4"),
+    ]
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class BinaryTraceWriter(SimulationObserver):
+    """
+    Writes task events as fixed-size binary records.
+
+    Each record holds the event type, the time as int64 microseconds since
+    1970-01-01 and int32 indices of the train, the task, the infrastructure
+    element and, for blocked events, the train occupying the element. Names
+    are stored once in tables appended as a JSON footer when the trace is
+    closed; missing values are -1.
+
+    Started and completed events are written once per element the task
+    occupies. Records are buffered and written every `chunk_size` records.
+
+    The occupants of each element are tracked from the reservations, so
+    sections a moving block train reserves ahead count as occupied. If an
+    element with a capacity above one blocks a train, `blocked_by` is the
+    occupant that reserved it first.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 65536):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = open(path, "wb")
+        self._file.write(TRACE_MAGIC)
+
+        self._buffer = np.empty(chunk_size, dtype=TRACE_RECORD)
+        self._n = 0
+
+        self._train_ids: Dict[str, int] = {}
+        self._task_ids: Dict[str, int] = {}
+        # element uid -> index, names in order of the indices
+        self._element_ids: Dict[int, int] = {}
+        self._element_names: List[str] = []
+        # trains holding a reservation of an element, in order of reservation
+        self._occupants: Dict[int, List[int]] = {}
+
+    @staticmethod
+    def _intern(ids: Dict[str, int], name: str) -> int:
+        idx = ids.get(name)
+        if idx is None:
+            idx = len(ids)
+            ids[name] = idx
+        return idx
+
+    def _record(
+        self,
+        event: int,
+        time: datetime,
+        train: int,
+        task: int,
+        element: int = -1,
+        blocked_by: int = -1,
+    ):
+        self._buffer[self._n] = (
+            event,
+            (time - _EPOCH) // _MICROSECOND,
+            train,
+            task,
+            element,
+            blocked_by,
+        )
+        self._n += 1
+        if self._n == self.chunk_size:
+            self.flush()
+
+    def _element_index(self, element: InfrastructureElement) -> int:
+        idx = self._element_ids.get(element.uid)
+        if idx is None:
+            idx = len(self._element_names)
+            self._element_ids[element.uid] = idx
+            self._element_names.append(element.name)
+        return idx
+
+    def _task_indices(self, task: Task) -> Tuple[int, int]:
+        return (
+            self._intern(self._train_ids, task.train.train_name),
+            self._intern(self._task_ids, task.task_id),
+        )
+
+    def task_started(self, time: datetime, task: Task):
+        train, task_idx = self._task_indices(task)
+        elements = task.infra_elements()
+        if not elements:
+            self._record(0, time, train, task_idx)
+        for element in elements:
+            self._record(0, time, train, task_idx, self._element_index(element))
+
+    def task_completed(self, time: datetime, task: Task):
+        train, task_idx = self._task_indices(task)
+        elements = task.infra_elements()
+        if not elements:
+            self._record(1, time, train, task_idx)
+        for element in elements:
+            self._record(1, time, train, task_idx, self._element_index(element))
+
+    def task_blocked(self, time: datetime, task: Task, blocked_task: Task):
+        train, task_idx = self._task_indices(task)
+        element = _unavailable_element(blocked_task)
+        if element is None:
+            self._record(2, time, train, task_idx)
+            return
+
+        element_idx = self._element_index(element)
+        occupants = self._occupants.get(element_idx)
+        blocked_by = occupants[0] if occupants else -1
+        self._record(2, time, train, task_idx, element_idx, blocked_by)
+
+    def infra_reserved(
+        self, time: datetime, trainpart_id: str, element: InfrastructureElement
+    ):
+        train = self._intern(self._train_ids, trainpart_id)
+        occupants = self._occupants.setdefault(self._element_index(element), [])
+        occupants.append(train)
+
+    def infra_released(
+        self, time: datetime, trainpart_id: str, element: InfrastructureElement
+    ):
+        train = self._intern(self._train_ids, trainpart_id)
+        occupants = self._occupants.get(self._element_index(element), [])
+        if train in occupants:
+            occupants.remove(train)
+
+    def flush(self):
+        self._file.write(self._buffer[: self._n].tobytes())
+        self._n = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        footer = json.dumps(
+            {
+                "events": TRACE_EVENTS,
+                "trains": list(self._train_ids),
+                "tasks": list(self._task_ids),
+                "elements": self._element_names,
+            }
+        ).encode("utf-8")
+        self._file.write(footer)
+        self._file.write(struct.pack("<Q", len(footer)))
+        self._file.close()
+
+
+def _unavailable_element(task: Task) -> Optional[InfrastructureElement]:
+    for element in task.infra_elements():
+        if not element.has_capacity():
+            return element
+    return None
+
+
+def read_trace(path: str) -> Tuple[np.ndarray, Dict[str, List[str]]]:
+    """
+    Reads a trace written by BinaryTraceWriter.
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, List[str]]]: The records and the name
+        tables (`events`, `trains`, `tasks`, `elements`) their indices refer
+        to.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if data[: len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(f"{path} is not a trace file")
+
+    (footer_length,) = struct.unpack("<Q", data[-8:])
+    footer_start = len(data) - 8 - footer_length
+    names = json.loads(data[footer_start:-8].decode("utf-8"))
+    records = np.frombuffer(
+        data,
+        dtype=TRACE_RECORD,
+        count=(footer_start - len(TRACE_MAGIC)) // TRACE_RECORD.itemsize,
+        offset=len(TRACE_MAGIC),
+    )
+    return records, names
+
+
+def trace_to_df(path: str) -> pd.DataFrame:
+    """
+    Reads a trace into a DataFrame with categorical `event`, `train`, `task`,
+    `element` and `blocked_by` columns and a datetime `time` column.
+    """
+    records, names = read_trace(path)
+    columns = {
+        "event": "events",
+        "train": "trains",
+        "task": "tasks",
+        "element": "elements",
+        "blocked_by": "trains",
+    }
+    df = pd.DataFrame(
+        {"time": pd.to_datetime(records["time"].astype("datetime64[us]"))}
+    )
+    for column, table in columns.items():
+        df[column] = pd.Categorical.from_codes(records[column], names[table])
+    return df[["event", "time", "train", "task", "element", "blocked_by"]]
+
+
+def _task_times(trace: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    times = {}
+    for event, column in [("started", "start_time"), ("completed", "end_time")]:
+        events = trace[trace["event"] == event]
+        times[column] = events.groupby(keys, observed=True)["time"].first()
+    return pd.DataFrame(times).reset_index()
+
+
+def train_timelines(trace: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reconstructs the tasks of each train from a trace.
+
+    Returns:
+        pd.DataFrame: One row per train and task with the start and end time
+        and the number of times the task was blocked, ordered by train and
+        start time.
+    """
+    timelines = _task_times(trace, ["train", "task"])
+
+    blocked = trace[trace["event"] == "blocked"]
+    blocked_count = blocked.groupby(["train", "task"], observed=True).size()
+    timelines = timelines.merge(
+        blocked_count.rename("blocked").reset_index(),
+        on=["train", "task"],
+        how="left",
+    )
+    timelines["blocked"] = timelines["blocked"].fillna(0).astype(int)
+
+    return timelines.sort_values(["train", "start_time"], kind="stable").reset_index(
+        drop=True
+    )
+
+
+def element_occupancy(trace: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reconstructs the occupation of each infrastructure element from a trace.
+
+    Returns:
+        pd.DataFrame: One row per element and task occupying it with the train
+        and the start and end time, ordered by element and start time.
+    """
+    occupancy = _task_times(
+        trace[trace["element"].notna()], ["element", "train", "task"]
+    )
+    return occupancy.sort_values(
+        ["element", "start_time"], kind="stable"
+    ).reset_index(drop=True)
+
+
+def _write(df: pd.DataFrame, path: str):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reconstruct train timelines and element occupancy from a trace."
+    )
+    parser.add_argument("trace", type=str, help="Path to the trace file")
+    parser.add_argument(
+        "--timelines", type=str, help="Output file for the train timelines"
+    )
+    parser.add_argument(
+        "--occupancy", type=str, help="Output file for the element occupancy"
+    )
+    parser.add_argument(
+        "--events", type=str, help="Output file for the decoded events"
+    )
+    args = parser.parse_args()
+
+    trace = trace_to_df(args.trace)
+    if args.events:
+        _write(trace, args.events)
+    if args.timelines:
+        _write(train_timelines(trace), args.timelines)
+    if args.occupancy:
+        _write(element_occupancy(trace), args.occupancy)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from typing import Dict, List, Tuple, cast
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
@@ -30,6 +31,127 @@ def _get_tracks_on_path(
     return ocps_on_path, ordered_tracks
 
 
+def _add_box_traces(
+    fig: go.Figure,
+    df_boxes: pd.DataFrame,
+    trainpart_id_to_color: Dict[str, str],
+    show_hover: bool,
+):
+    """Adds one trace per reservation box (and one per hover line)."""
+    for _, row in df_boxes.iterrows():
+        x0 = row["x0"]
+        x1 = row["x1"]
+
+        hovertext = f"Train ID: {row['trainpart_id']}<br>Track: {row['track']}<br>Section Index: {row['section']}<br>Start: {row['start_time']}<br>End: {row['end_time']}"
+
+        # Add the box
+        fig.add_trace(
+            go.Scatter(
+                y=[
+                    row["start_time"],
+                    row["end_time"],
+                    row["end_time"],
+                    row["start_time"],
+                ],
+                x=[x0, x0, x1, x1],
+                fill="toself",
+                mode="lines",
+                fillcolor=trainpart_id_to_color[row["trainpart_id"]],
+                opacity=0.7,
+                line=dict(color=trainpart_id_to_color[row["trainpart_id"]], width=0),
+                showlegend=False,
+                hoverinfo="skip",
+            )
+        )
+
+        if show_hover:
+            # Add a central line for hover text
+            x_center = (x0 + x1) / 2
+            half_dy = (row["end_time"] - row["start_time"]) / 2
+            fig.add_trace(
+                go.Scatter(
+                    y=[row["start_time"] + half_dy],
+                    x=[x_center],
+                    mode="lines",
+                    line=dict(
+                        color=trainpart_id_to_color[row["trainpart_id"]],
+                        width=4,
+                        dash="dash",
+                    ),
+                    showlegend=False,
+                    hoverinfo="text",
+                    hovertext=hovertext,
+                )
+            )
+
+
+def _add_train_traces(
+    fig: go.Figure,
+    df_boxes: pd.DataFrame,
+    trainpart_id_to_color: Dict[str, str],
+    show_hover: bool,
+):
+    """
+    Adds one trace per train containing all of its reservation boxes as
+    polygons separated by gaps (plus one hover trace per train).
+    """
+    for trainpart_id, df_train in df_boxes.groupby("trainpart_id", sort=False):
+        color = trainpart_id_to_color[trainpart_id]
+        n = len(df_train)
+
+        x0 = df_train["x0"].to_numpy(dtype=float)
+        x1 = df_train["x1"].to_numpy(dtype=float)
+        start = df_train["start_time"].to_numpy()
+        end = df_train["end_time"].to_numpy()
+        gap = np.full(n, np.datetime64("NaT"), dtype=start.dtype)
+
+        # each box is drawn as x0/start -> x0/end -> x1/end -> x1/start -> gap
+        xs = np.column_stack([x0, x0, x1, x1, np.full(n, np.nan)]).ravel()
+        ys = np.column_stack([start, end, end, start, gap]).ravel()
+
+        fig.add_trace(
+            go.Scatter(
+                x=xs,
+                y=ys,
+                fill="toself",
+                mode="lines",
+                fillcolor=color,
+                opacity=0.7,
+                line=dict(color=color, width=0),
+                showlegend=False,
+                hoverinfo="skip",
+            )
+        )
+
+        if show_hover:
+            hovertext = (
+                "Train ID: "
+                + df_train["trainpart_id"].astype(str)
+                + "<br>Track: "
+                + df_train["track"].astype(str)
+                + "<br>Section Index: "
+                + df_train["section"].astype(str)
+                + "<br>Start: "
+                + df_train["start_time"].astype(str)
+                + "<br>End: "
+                + df_train["end_time"].astype(str)
+            )
+            centers = df_train["start_time"] + (
+                df_train["end_time"] - df_train["start_time"]
+            ) / 2
+            fig.add_trace(
+                go.Scatter(
+                    x=(x0 + x1) / 2,
+                    y=centers.to_numpy(),
+                    mode="markers",
+                    marker=dict(color=color, opacity=0),
+                    showlegend=False,
+                    hoverinfo="text",
+                    hovertext=hovertext.to_list(),
+                )
+            )
+
+
 def mb_blocking_viz(
     df_mb_sim: pd.DataFrame,
     network: Network[MBTrack],
@@ -37,6 +159,18 @@ def mb_blocking_viz(
     end_ocp: str,
     plotting_options: Dict = {},
 ):
+    """
+    Plots the blocking time diagram of the track sections between start_ocp
+    and end_ocp.
+
+    plotting_options:
+        show_hover (bool): show reservation details on hover
+        show_legend (bool): show a legend entry per train
+        rangeslider (bool): show a rangeslider on the x-axis
+        render_mode (str): "trains" (default) draws all boxes of a train as a
+            single trace; "boxes" draws one trace per reservation box, which is
+            considerably slower for large diagrams
+    """
     df_mb_sim = df_mb_sim.copy()
 
     df_mb_sim["start_time"] = pd.to_datetime(df_mb_sim["start_time"])
@@ -65,63 +199,34 @@ def mb_blocking_viz(
     # Aggregate data
     sections_per_track = df_mb_sim.groupby("track")["section"].max().to_dict()
 
-    # Iterate over each track in order
-
+    # Positioning of the track sections
+    track_base_positions = {}
     track_base_position = 0
     for track in ordered_tracks:
-        df_track = df_mb_sim[df_mb_sim["track"] == track]
-
-        for _, row in df_track.iterrows():
-            x0 = track_base_position + (row["section"] - 1) * distance_between_points
-            x1 = track_base_position + row["section"] * distance_between_points
-
-            hovertext = f"Train ID: {row['trainpart_id']}<br>Track: {row['track']}<br>Section Index: {row['section']}<br>Start: {row['start_time']}<br>End: {row['end_time']}"
-
-            # Add the box
-            fig.add_trace(
-                go.Scatter(
-                    y=[
-                        row["start_time"],
-                        row["end_time"],
-                        row["end_time"],
-                        row["start_time"],
-                    ],
-                    x=[x0, x0, x1, x1],
-                    fill="toself",
-                    mode="lines",
-                    fillcolor=trainpart_id_to_color[row["trainpart_id"]],
-                    opacity=0.7,
-                    line=dict(
-                        color=trainpart_id_to_color[row["trainpart_id"]], width=0
-                    ),
-                    showlegend=False,
-                    hoverinfo="skip",
-                )
-            )
-
-            if plotting_options.get("show_hover", False):
-                # Add a central line for hover text
-                x_center = (x0 + x1) / 2
-                half_dy = (row["end_time"] - row["start_time"]) / 2
-                fig.add_trace(
-                    go.Scatter(
-                        y=[row["start_time"] + half_dy],
-                        x=[x_center],
-                        mode="lines",
-                        line=dict(
-                            color=trainpart_id_to_color[row["trainpart_id"]],
-                            width=4,
-                            dash="dash",
-                        ),
-                        showlegend=False,
-                        hoverinfo="text",
-                        hovertext=hovertext,
-                    )
-                )
-
-        # Positioning of the track sections
+        track_base_positions[track] = track_base_position
         track_base_position += sections_per_track[track] * distance_between_points
 
+    df_boxes = df_mb_sim[df_mb_sim["track"].isin(track_base_positions)].copy()
+    df_boxes["x0"] = (
+        df_boxes["track"].map(track_base_positions)
+        + (df_boxes["section"] - 1) * distance_between_points
+    )
+    df_boxes["x1"] = df_boxes["x0"] + distance_between_points
+
+    show_hover = plotting_options.get("show_hover", False)
+    render_mode = plotting_options.get("render_mode", "trains")
+    if render_mode == "trains":
+        _add_train_traces(fig, df_boxes, trainpart_id_to_color, show_hover)
+    elif render_mode == "boxes":
+        # keep the drawing order of the tracks on the path
+        df_boxes["track_order"] = df_boxes["track"].map(
+            {track: i for i, track in enumerate(ordered_tracks)}
+        )
+        df_boxes = df_boxes.sort_values("track_order", kind="stable")
+        _add_box_traces(fig, df_boxes, trainpart_id_to_color, show_hover)
+    else:
+        raise ValueError(f"Invalid render mode: {render_mode}")
+
     if plotting_options.get("show_legend", False):
         # Add dummy traces for legend to appear
         for trainpart_id in trainpart_id_to_color.keys():
@@ -137,27 +242,12 @@ def mb_blocking_viz(
             )
 
     # Setting the y-axis with track points labeled appropriately
-    x_labels = []
-    x_positions = []
-
-    # Add labels for track points
-    for i, track in enumerate(ordered_tracks):
-        x_labels.append(track.split("_")[0])
-        x_positions.append(
-            sum(
-                sections_per_track[prev_track] * distance_between_points
-                for prev_track in ordered_tracks
-                if ordered_tracks.index(prev_track) < i
-            )
-        )
+    x_labels = [track.split("_")[0] for track in ordered_tracks]
+    x_positions = [track_base_positions[track] for track in ordered_tracks]
 
-        # Add label for last point of the last track
-        if i == len(ordered_tracks) - 1:
-            last_point = track.split("_")[1]
-            x_labels.append(last_point)
-            x_positions.append(
-                x_positions[-1] + sections_per_track[track] * distance_between_points
-            )
+    # Add label for last point of the last track
+    x_labels.append(ordered_tracks[-1].split("_")[1])
+    x_positions.append(track_base_position)
 
     fig.update_layout(
         xaxis=dict(
@@ -190,58 +280,61 @@ def mb_blocking_viz(
     return fig
 
 
-def ocp_blocking_viz(
-    df_ocp_sim: pd.DataFrame, network: Network[MBTrack], start_ocp: str, end_ocp: str
-):
-
-    # Function to split tracks into smaller segments
-    def split_track(track, ocps_on_path):
+def _get_segment_map(
+    tracks: List[str], ocps_on_path: List[str]
+) -> Dict[str, List[str]]:
+    """
+    Maps each track to the track segments on the path it spans. Tracks
+    connecting non-adjacent OCPs of the path are split into the tracks
+    between the OCPs they bypass; all other tracks map to themselves.
+    """
+    ocp_index = {ocp: i for i, ocp in enumerate(ocps_on_path)}
+    segment_map = {}
+    for track in tracks:
         start, end = track.split("_")
-        if start not in ocps_on_path or end not in ocps_on_path:
-            return [track]
-
-        start_index = ocps_on_path.index(start)
-        end_index = ocps_on_path.index(end)
+        start_index = ocp_index.get(start)
+        end_index = ocp_index.get(end)
 
-        if start_index >= end_index:
-            return [track]
+        if start_index is None or end_index is None or start_index >= end_index:
+            segment_map[track] = [track]
+        else:
+            segment_map[track] = [
+                f"{ocps_on_path[i]}_{ocps_on_path[i + 1]}"
+                for i in range(start_index, end_index)
+            ]
+    return segment_map
 
-        segments = []
-        for i in range(start_index, end_index):
-            segments.append(f"{ocps_on_path[i]}_{ocps_on_path[i+1]}")
-
-        return segments
-
-    df_ocp_sim = df_ocp_sim.copy()
 
+def ocp_blocking_viz(
+    df_ocp_sim: pd.DataFrame,
+    network: Network[MBTrack],
+    start_ocp: str,
+    end_ocp: str,
+    plotting_options: Dict = {},
+):
     ocps_on_path, ordered_tracks = _get_tracks_on_path(start_ocp, end_ocp, network)
 
-    # Apply the function to df_ocp_sim
-    expanded_rows: List[pd.Series] = []
-    for _, row in df_ocp_sim.iterrows():
-        segments = split_track(row["track"], ocps_on_path)
-        for segment in segments:
-            new_row = row.copy()
-            new_row["track"] = segment
-            expanded_rows.append(new_row)
+    # split tracks bypassing OCPs on the path into one row per segment
+    segment_map = _get_segment_map(df_ocp_sim["track"].unique(), ocps_on_path)
+    df_expanded = df_ocp_sim.assign(track=df_ocp_sim["track"].map(segment_map))
+    df_expanded = df_expanded.explode("track", ignore_index=True)
 
     sections_per_track = {
         track: len(network.get_track_by_name(track).track_sections)  # type: ignore
         for track in ordered_tracks
     }
 
-    expanded_rows_with_sections = []
-
-    for row in expanded_rows:
-        track = row["track"]
-        max_section = sections_per_track.get(track, 1)
-        for section in range(1, max_section + 1):
-            new_row = row.copy()
-            new_row["section"] = section
-            expanded_rows_with_sections.append(new_row)
-
-    df_ocp_sim_expanded_with_sections = pd.DataFrame(expanded_rows_with_sections)
+    # repeat each row once per section of its track
+    sections = (
+        df_expanded["track"].map(sections_per_track).fillna(1).astype(int).to_numpy()
+    )
+    df_expanded = df_expanded.loc[df_expanded.index.repeat(sections)]
+    df_expanded["section"] = df_expanded.groupby(level=0).cumcount() + 1
 
     return mb_blocking_viz(
-        df_ocp_sim_expanded_with_sections, network, start_ocp, end_ocp
+        df_expanded.reset_index(drop=True),
+        network,
+        start_ocp,
+        end_ocp,
+        plotting_options,
     )
@@ -0,0 +1,145 @@
+import logging
+from multiprocessing import Pool, cpu_count
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from pytrainsim.MBSim.trackSection import MBTrack
+from pytrainsim.infrastructure import Network
+from pytrainsim.resultWriter import read_results
+from pytrainsim.viz.blockingtimes import _get_tracks_on_path
+from pytrainsim.viz.compression import compress_timetable
+
+logger = logging.getLogger(__name__)
+
+
+def load_track_reservations(path: str) -> pd.DataFrame:
+    """Reads the track reservations of a run written as CSV or Parquet."""
+    df = read_results(path)
+    df["track"] = df["track"].astype(str)
+    return df
+
+
+def corridor_blocking_times(
+    track_reservations: pd.DataFrame, ordered_tracks: List[str]
+) -> List[pd.DataFrame]:
+    """
+    Extracts the blocking times of all trainparts that traverse every track
+    of the corridor, ordered by the time they enter the corridor.
+    """
+    df = track_reservations[track_reservations["track"].isin(ordered_tracks)]
+
+    tracks_per_trainpart = df.groupby("trainpart_id")["track"].nunique()
+    complete = tracks_per_trainpart.index[tracks_per_trainpart == len(ordered_tracks)]
+    df = df[df["trainpart_id"].isin(complete)]
+
+    df = df.sort_values(["trainpart_id", "start_time"], kind="stable")
+    blocking_times = [
+        group.reset_index(drop=True)
+        for _, group in df.groupby("trainpart_id", sort=False)
+    ]
+    blocking_times.sort(key=lambda bt: bt["start_time"].iloc[0])
+    return blocking_times
+
+
+def _analyse_corridor(
+    args: Tuple[str, str, pd.DataFrame, List[str], Dict[str, int]],
+) -> Dict:
+    start_ocp, end_ocp, track_reservations, ordered_tracks, capacities = args
+
+    result: Dict = {
+        "start_ocp": start_ocp,
+        "end_ocp": end_ocp,
+        "trainparts": 0,
+        "window_start": pd.NaT,
+        "window_end": pd.NaT,
+        "occupancy_time": pd.NaT,
+        "utilisation": float("nan"),
+    }
+
+    if not ordered_tracks:
+        return result
+
+    blocking_times = corridor_blocking_times(track_reservations, ordered_tracks)
+    if not blocking_times:
+        return result
+
+    trainparts = len(blocking_times)
+    window_start = min(bt["start_time"].min() for bt in blocking_times)
+    window_end = max(bt["end_time"].max() for bt in blocking_times)
+
+    capacity = [capacities[track] for track in blocking_times[0]["track"].unique()]
+    occupancy_time, _ = compress_timetable(blocking_times, capacity, {})
+
+    result["trainparts"] = trainparts
+    result["window_start"] = window_start
+    result["window_end"] = window_end
+    result["occupancy_time"] = occupancy_time
+    if window_end > window_start:
+        result["utilisation"] = occupancy_time / (window_end - window_start)
+    return result
+
+
+def analyse_corridors(
+    track_reservations: Union[str, pd.DataFrame],
+    network: Network[MBTrack],
+    corridors: List[Tuple[str, str]],
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Computes the compressed occupancy time (UIC 406) of each corridor.
+
+    Args:
+        track_reservations: track_reservations.csv of a run or its DataFrame.
+        network: The network the reservations were recorded on.
+        corridors: (start_ocp, end_ocp) pairs; only trainparts traversing the
+            whole corridor in this direction are considered.
+        max_workers: Number of worker processes; defaults to the CPU count.
+
+    Returns:
+        pd.DataFrame: One row per corridor with the number of trainparts, the
+        observed time window, the compressed occupancy time and the
+        utilisation (occupancy time / time window). Corridors without a path
+        have no trainparts and NaN values.
+    """
+    if isinstance(track_reservations, str):
+        track_reservations = load_track_reservations(track_reservations)
+    else:
+        track_reservations = track_reservations.copy()
+        for column in ["start_time", "end_time"]:
+            track_reservations[column] = pd.to_datetime(track_reservations[column])
+
+    # resolve paths in the parent process so workers only receive data frames
+    tasks = []
+    for start_ocp, end_ocp in corridors:
+        try:
+            _, ordered_tracks = _get_tracks_on_path(start_ocp, end_ocp, network)
+        except ValueError as e:
+            # an unroutable corridor gets an empty row instead of failing the batch
+            logger.warning("Skipping corridor %s-%s: %s", start_ocp, end_ocp, e)
+            ordered_tracks = []
+        corridor_reservations = track_reservations[
+            track_reservations["track"].isin(ordered_tracks)
+        ]
+        capacities = {}
+        for track in ordered_tracks:
+            capacity = network.get_track_by_name(track).capacity  # type: ignore
+            # unlimited capacity (-1) never constrains the compression
+            capacities[track] = (
+                capacity if capacity >= 0 else len(corridor_reservations) + 1
+            )
+        tasks.append(
+            (start_ocp, end_ocp, corridor_reservations, ordered_tracks, capacities)
+        )
+
+    if max_workers is None:
+        max_workers = cpu_count()
+    max_workers = max(1, min(max_workers, len(tasks)))
+
+    if max_workers == 1:
+        results = [_analyse_corridor(task) for task in tasks]
+    else:
+        with Pool(processes=max_workers) as pool:
+            results = pool.map(_analyse_corridor, tasks, chunksize=1)
+
+    return pd.DataFrame(results)
@@ -1,6 +1,9 @@
+from bisect import insort
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -51,20 +54,54 @@ def insert_trainpart_into_blocked_slots(
     trainpart: pd.DataFrame,
     offset: timedelta = timedelta(),
 ):
-    for idx, row in trainpart.iterrows():
-        track_id = row["track_id"]
-        start = row["start_time"] + offset
-        end = row["end_time"] + offset
+    """
+    Inserts the blocking times of a trainpart (shifted by offset) into the
+    blocked slots, keeping the slots of each track sorted by end time.
+    """
+    for track_id, start, end in zip(
+        trainpart["track_id"],
+        trainpart["start_time"] + offset,
+        trainpart["end_time"] + offset,
+    ):
+        insort(blocked_slots.setdefault(track_id, []), (start, end), key=_slot_end)
+    return blocked_slots
 
-        if track_id not in blocked_slots:
-            blocked_slots[track_id] = [(start, end)]
-        else:
-            blocked_slots[track_id].append((start, end))
 
-    # sort by end
-    for track_id in blocked_slots:
-        blocked_slots[track_id].sort(key=lambda x: x[1])
-    return blocked_slots
+def _slot_end(slot: Tuple[datetime, datetime]) -> datetime:
+    return slot[1]
+
+
+def _as_ns(column: pd.Series) -> np.ndarray:
+    return column.to_numpy(dtype="datetime64[ns]").view("int64")
+
+
+def _earliest_offset(
+    blocked_ends: Dict[str, List[int]],
+    blocking_time: pd.DataFrame,
+    capacity_dict: Dict[str, int],
+    start_time: int,
+) -> int:
+    """
+    Returns the smallest offset (in ns) by which the trainpart has to be
+    shifted so that no track exceeds its capacity.
+    """
+    starts = _as_ns(blocking_time["start_time"])
+    capacities = blocking_time["track"].map(capacity_dict).to_numpy()
+
+    # end time of #length - capacity is earliest possible start time
+    earliest_starts = np.array(
+        [
+            blocked_ends[track_id][-cap] if len(blocked_ends[track_id]) >= cap else -1
+            for track_id, cap in zip(blocking_time["track_id"], capacities)
+        ],
+        dtype="int64",
+    )
+    constrained = earliest_starts >= 0
+    if not constrained.any():
+        return start_time - starts.min()
+
+    earliest_starts = np.maximum(earliest_starts[constrained], start_time)
+    return int((earliest_starts - starts[constrained]).max())
 
 
 def compress_timetable(
@@ -89,39 +126,30 @@ def compress_timetable(
     # Duplicate Last Trainpart
     blocking_times.append(blocking_times[-1])
 
-    blocked_slots: Dict[str, List[Tuple[datetime, datetime]]] = {}
+    # sorted end times (in ns) of the blocked slots per track
+    blocked_ends: Dict[str, List[int]] = defaultdict(list)
 
     # Insert first trainpart into blocked_slots as starting point
-    blocked_slots = insert_trainpart_into_blocked_slots(
-        blocked_slots, blocking_times[0]
-    )
+    for track_id, end in zip(
+        blocking_times[0]["track_id"], _as_ns(blocking_times[0]["end_time"])
+    ):
+        insort(blocked_ends[track_id], int(end))
 
-    start_time = blocking_times[0]["start_time"].iloc[0]
+    start_time = int(_as_ns(blocking_times[0]["start_time"])[0])
 
     compressed_blocking_times = [blocking_times[0].copy()]
 
     for blocking_time in blocking_times[1:]:
-        max_offset = timedelta.min
-        for idx, row in blocking_time.iterrows():
-            track_id = row["track_id"]
-            track = row["track"]
-            start = row["start_time"]
-
-            blocked_slot = blocked_slots[track_id]
-
-            if len(blocked_slot) < capacity_dict[track]:
-                continue
-
-            # end time of #length - capacity is earliest possible start time
-            earliest_start = blocked_slot[-capacity_dict[track]][1]
-            earliest_start = max(earliest_start, start_time)
-            offset = earliest_start - start
-            max_offset = max(max_offset, offset)
-
-        blocked_slots = insert_trainpart_into_blocked_slots(
-            blocked_slots, blocking_time, max_offset
+        offset_ns = _earliest_offset(
+            blocked_ends, blocking_time, capacity_dict, start_time
         )
 
+        for track_id, end in zip(
+            blocking_time["track_id"], _as_ns(blocking_time["end_time"]) + offset_ns
+        ):
+            insort(blocked_ends[track_id], int(end))
+
+        max_offset = pd.Timedelta(offset_ns, unit="ns")
         compressed_blocking_time = blocking_time.copy()
         compressed_blocking_time["start_time"] += max_offset
         compressed_blocking_time["end_time"] += max_offset
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+from pytrainsim.resources.train import Train
+from pytrainsim.resultWriter import ResultWriter
+from pytrainsim.simulation import Simulation
+
+
+class WindowedScheduler:
+    """
+    Adds trains to the simulation `window` before their first scheduled event
+    instead of all at once, and retires them when they finish: their
+    traversal logs are written to the result writer and their tasks are
+    dropped. Memory is therefore proportional to the number of trains on the
+    network at the same time rather than to the whole timetable.
+
+    Args:
+        sim: The simulation to schedule the trains in.
+        build_train: Creates the train with its tasks assigned, or returns
+            None if the train cannot be scheduled.
+        start_times: Earliest scheduled time of each train.
+        previous_trainparts: Trainparts each train has to wait for.
+        window: How long before its start time a train is admitted.
+        result_writer: Receives the traversal logs of finished trains.
+    """
+
+    def __init__(
+        self,
+        sim: Simulation,
+        build_train: Callable[[str], Optional[Train]],
+        start_times: Dict[str, datetime],
+        previous_trainparts: Dict[str, List[str]],
+        window: timedelta,
+        result_writer: ResultWriter,
+    ):
+        self.sim = sim
+        self.build_train = build_train
+        self.start_times = start_times
+        self.previous_trainparts = previous_trainparts
+        self.window = window
+        self.result_writer = result_writer
+
+        self.active: Dict[str, Train] = {}
+        self._handled: Set[str] = set()
+        self.admitted = 0
+        self.max_active = 0
+
+        sim.on_train_finished = self.retire
+
+    def schedule(self):
+        """Schedules the admission of all trains."""
+        for trainpart_id, start_time in sorted(
+            self.start_times.items(), key=lambda item: item[1]
+        ):
+            self.sim.schedule_admission(
+                start_time - self.window,
+                lambda trainpart_id=trainpart_id: self.admit(trainpart_id),
+            )
+
+    def admit(self, trainpart_id: str):
+        if trainpart_id in self._handled:
+            return
+        self._handled.add(trainpart_id)
+
+        # previous trainparts normally start earlier and are already admitted
+        previous = []
+        for previous_id in self.previous_trainparts.get(trainpart_id, []):
+            if previous_id in self.start_times:
+                self.admit(previous_id)
+            if previous_id in self.active:
+                previous.append(self.active[previous_id])
+
+        train = self.build_train(trainpart_id)
+        if train is None:
+            return
+        train.previous_trainparts = previous
+
+        self.sim.schedule_train(train)
+        self.active[trainpart_id] = train
+        self.admitted += 1
+        self.max_active = max(self.max_active, len(self.active))
+
+    def retire(self, train: Train):
+        self.result_writer.write(train.traversal_logs_as_df())
+        train.tasklist = []
+        train.traversal_logs = []
+        del self.active[train.train_name]
+
+    def close(self):
+        """Writes the results of trains that did not finish."""
+        for train in list(self.active.values()):
+            self.result_writer.write(train.traversal_logs_as_df())
+        self.result_writer.close()